@@ -0,0 +1,5 @@
+#!/bin/bash
+
+# Run a benchmark module from src/benchmarks, for example:
+#   ./bench.sh text_to_textnodes
+cd src && python3 -m "benchmarks.$1" "${@:2}"
@@ -0,0 +1,38 @@
+"""
+Compares rewriting the base path of a whole rendered page with update_basepath
+against resolving href and src props while the page is rendered.
+
+Run from the repository root with ./bench.sh basepath
+"""
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from processors.basepath import update_basepath, basepath_resolver
+from benchmarks.timing import best_time, format_seconds, print_table
+
+BASE_PATH = "/static-site-generator/"
+BLOCK = "A paragraph with a [link](/blog/post) and an image ![alt](/images/a.png) and some `code`."
+BLOCK_COUNTS = [100, 1_000, 10_000, 50_000]
+
+def render_then_replace(html):
+    chunks = []
+    html.render_to(chunks.append)
+    return update_basepath(BASE_PATH, "".join(chunks))
+
+def render_with_resolver(html):
+    chunks = []
+    html.render_to(chunks.append, resolve_url=basepath_resolver(BASE_PATH))
+    return "".join(chunks)
+
+def main():
+    rows = []
+    for count in BLOCK_COUNTS:
+        html = markdown_to_html_node("\n\n".join([BLOCK] * count))
+        replaced = render_then_replace(html)
+        if replaced != render_with_resolver(html):
+            raise AssertionError("The two approaches rendered different HTML.")
+        replace_time = best_time(render_then_replace, html)
+        resolver_time = best_time(render_with_resolver, html)
+        rows.append([count, len(replaced), format_seconds(replace_time), format_seconds(resolver_time)])
+    print_table(["blocks", "bytes", "replace", "resolve_url"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Compares parsing corpus pages with and without a BlockCache. Each page is a
+corpus page plus the blocks real sites repeat on every page: a notice, a
+navigation list and a license footer.
+
+Run from the repository root with ./bench.sh block_cache [pages]
+"""
+import sys
+from markdown_to_html_nodes.block_cache import BlockCache
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from benchmarks.corpus import make_page
+from benchmarks.timing import best_time, format_seconds, print_table
+
+BOILERPLATE = [
+    "> **Note:** this page is part of the *archived* documentation.\n>\n> See [the current docs](/docs) instead.",
+    "- [Home](/)\n- [Blog](/blog)\n- [About](/about)\n- [Contact](/contact)",
+    "Licensed under [CC BY 4.0](/license). Built with `main.py` and **no** dependencies.",
+]
+
+def make_pages(pages):
+    """make_pages returns pages markdown pages, each a corpus page with the BOILERPLATE blocks around it."""
+    return ["\n\n".join([BOILERPLATE[0], make_page(i)] + BOILERPLATE[1:]) for i in range(pages)]
+
+def parse_all(markdowns, cache_size):
+    cache = BlockCache(cache_size) if cache_size else None
+    for markdown in markdowns:
+        markdown_to_html_node(markdown, "article", cache=cache)
+    return cache
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    markdowns = make_pages(pages)
+    cache = BlockCache()
+    for markdown in markdowns:
+        assert markdown_to_html_node(markdown, cache=cache) == markdown_to_html_node(markdown)
+
+    rows = []
+    for cache_size in [0, 64, 4096]:
+        seconds = best_time(parse_all, markdowns, cache_size, repeat=3)
+        cache = parse_all(markdowns, cache_size)
+        hit_rate = f"{cache.hits / (cache.hits + cache.misses):.0%}" if cache else "n/a"
+        rows.append([cache_size or "off", format_seconds(seconds), format_seconds(seconds / pages), hit_rate])
+    print(f"{pages} pages, {len(BOILERPLATE)} repeated blocks each\n")
+    print_table(["block cache", "total", "per page", "hit rate"], rows)
+
+if __name__ == "__main__":
+    main()
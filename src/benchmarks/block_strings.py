@@ -0,0 +1,58 @@
+"""
+Compares the original regex based block splitter with the streaming
+iter_text_block_strings and iter_block_strings, on a string and on an open
+file: time and peak memory allocated while splitting.
+
+Run from the repository root with ./bench.sh block_strings [pages per document]
+"""
+import os, re, sys, tempfile, tracemalloc
+from markdown_to_html_nodes.markdown_to_block_strings import iter_block_strings, iter_text_block_strings, markdown_to_block_strings
+from benchmarks.corpus import make_page
+from benchmarks.timing import best_time, format_seconds, print_table
+
+def regex_block_strings(markdown):
+    """regex_block_strings is markdown_to_block_strings as it was before iter_block_strings."""
+    stripped = markdown.strip('\n')
+    stripped = re.sub(r'\n\n+', r'\n\n', stripped)
+    return [block.strip() for block in stripped.split('\n\n')]
+
+def count_text_blocks(markdown):
+    """count_text_blocks streams the blocks of a string without keeping them, as a parser would."""
+    return sum(1 for _ in iter_text_block_strings(markdown))
+
+def count_file_blocks(path):
+    """count_file_blocks streams the blocks of the file at path without keeping them, as a parser would."""
+    with open(path, 'r') as f:
+        return sum(1 for _ in iter_block_strings(f))
+
+def peak_memory(func, *args):
+    """peak_memory returns the peak number of bytes allocated while func runs."""
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    markdown = "\n\n".join(make_page(i) for i in range(pages))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "index.md")
+        with open(path, 'w') as f:
+            f.write(markdown)
+        assert regex_block_strings(markdown) == markdown_to_block_strings(markdown)
+
+        rows = []
+        for name, func, arg in [
+            ("regex, string", regex_block_strings, markdown),
+            ("markdown_to_block_strings, string", markdown_to_block_strings, markdown),
+            ("iter_text_block_strings, string", count_text_blocks, markdown),
+            ("iter_block_strings, file", count_file_blocks, path),
+        ]:
+            rows.append([name, format_seconds(best_time(func, arg, repeat=3)), f"{peak_memory(func, arg) / 1e6:.1f} MB"])
+
+    print(f"{len(markdown) / 1e6:.1f} MB of markdown\n")
+    print_table(["splitter", "time", "peak memory"], rows)
+
+if __name__ == "__main__":
+    main()
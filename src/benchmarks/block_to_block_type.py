@@ -0,0 +1,83 @@
+"""
+Compares the original block_to_block_type, which compiled its patterns and
+tried each block type in turn on every call, with the dispatch table version,
+on a corpus with a realistic mix of block types.
+
+Run from the repository root with ./bench.sh block_to_block_type [pages]
+"""
+import re, sys
+from collections import Counter
+from markdown_to_html_nodes.block_to_block_type import BlockType, block_to_block_type
+from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings
+from benchmarks.corpus import make_page
+from benchmarks.timing import best_time, format_seconds, print_table
+
+def sequential_block_to_block_type(block_text):
+    """sequential_block_to_block_type is block_to_block_type as it was before the dispatch table."""
+    def is_unordered_list(lines):
+        return all(line.startswith("* ") for line in lines) or all(line.startswith("- ") for line in lines)
+
+    def is_quote(lines):
+        if lines == [">"]:
+            return False
+        for line in lines:
+            if not (line.startswith("> ") or line == ">"):
+                return False
+        else:
+            return True
+
+    def is_ordered_list(lines, i=0):
+        if i >= len(lines):
+            return True
+        if not lines[i].startswith(f"{i+1}. "):
+            return False
+        return is_ordered_list(lines, i+1)
+
+    lines = block_text.split("\n")
+    code_block_rx = re.compile(r'^```.+```$', re.DOTALL)
+    image_block_rx = r'^!\[([^\[\]]*)\]\(([^\(\)]*)\)$'
+    heading_rx = r'^#{1,6}\s+.+'
+
+    if re.match(heading_rx, block_text):
+        return BlockType.HEADING
+    elif re.match(code_block_rx, block_text):
+        return BlockType.CODE
+    elif is_quote(lines):
+        return BlockType.QUOTE
+    elif re.match(image_block_rx, block_text):
+        return BlockType.IMAGE
+    elif is_unordered_list(lines):
+        return BlockType.UNORDERED_LIST
+    elif is_ordered_list(lines):
+        return BlockType.ORDERED_LIST
+    else:
+        return BlockType.PARAGRAPH
+
+def make_blocks(pages):
+    """make_blocks returns the blocks of pages corpus pages, each with a few extra paragraphs and an ordered list."""
+    blocks = []
+    for i in range(pages):
+        blocks.extend(markdown_to_block_strings(make_page(i)))
+        blocks.extend(f"Paragraph {j} of page {i}, with a [link](/pages/{j}) and\nmore than one line." for j in range(3))
+        blocks.append("\n".join(f"{j}. step {j}" for j in range(1, 6)))
+    return blocks
+
+def classify_all(classify, blocks):
+    for block in blocks:
+        classify(block)
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    blocks = make_blocks(pages)
+    assert [block_to_block_type(b) for b in blocks] == [sequential_block_to_block_type(b) for b in blocks]
+
+    counts = Counter(block_to_block_type(b).value for b in blocks)
+    print(f"{len(blocks)} blocks: " + ", ".join(f"{count} {name}" for name, count in counts.most_common()) + "\n")
+    rows = []
+    for name, classify in [("sequential", sequential_block_to_block_type), ("dispatch table", block_to_block_type)]:
+        seconds = best_time(classify_all, classify, blocks)
+        rows.append([name, format_seconds(seconds), format_seconds(seconds / len(blocks))])
+    print_table(["block_to_block_type", "total", "per block"], rows)
+
+if __name__ == "__main__":
+    main()
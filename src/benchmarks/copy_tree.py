@@ -0,0 +1,79 @@
+"""
+Compares the original single threaded shutil.copy tree copy with copy_tree's
+thread pool, kernel copies and link strategies, on a tree of many small files
+and on a tree of a few large ones.
+
+Run from the repository root with ./bench.sh copy_tree [small files] [large files] [large file MB]
+"""
+import os, shutil, sys, tempfile, time
+from processors.copy_tree import CopyStats, copy_tree
+from benchmarks.timing import format_seconds, print_table
+
+def shutil_copy_tree(src, dest):
+    """shutil_copy_tree is the original copy_tree loop: one shutil.copy at a time, recursing on a single thread."""
+    os.makedirs(dest, exist_ok=True)
+    for f in os.listdir(src):
+        src_filepath = os.path.join(src, f)
+        if os.path.isfile(src_filepath):
+            shutil.copy(src_filepath, dest)
+        elif os.path.isdir(src_filepath):
+            shutil_copy_tree(src_filepath, os.path.join(dest, f))
+
+def write_tree(dirpath, files, size, files_per_dir=100):
+    """write_tree writes files random files of size bytes under dirpath and returns their total size."""
+    content = os.urandom(size)
+    for i in range(files):
+        subdir = os.path.join(dirpath, f"dir-{i // files_per_dir}")
+        os.makedirs(subdir, exist_ok=True)
+        with open(os.path.join(subdir, f"file-{i}.bin"), "wb") as f:
+            f.write(content)
+    return files * size
+
+def measure(copy, src, dest, files, size, repeat=3):
+    """measure returns the CopyStats of the fastest of repeat copies of src into a fresh dest."""
+    best = None
+    for _ in range(repeat):
+        shutil.rmtree(dest, ignore_errors=True)
+        start = time.perf_counter()
+        copy(src, dest)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return CopyStats(files, size, best)
+
+def main():
+    small_files = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    large_files = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    large_size = (int(sys.argv[3]) if len(sys.argv) > 3 else 64) * 1_000_000
+    trees = [
+        (f"{small_files} x 4 KB", small_files, 4_000),
+        (f"{large_files} x {large_size // 1_000_000} MB", large_files, large_size),
+    ]
+    implementations = [
+        ("shutil.copy", shutil_copy_tree),
+        ("copy_tree, 1 thread", lambda src, dest: copy_tree(src, dest, workers=1)),
+        ("copy_tree, 4 threads", lambda src, dest: copy_tree(src, dest, workers=4)),
+        ("copy_tree, default", copy_tree),
+        ("copy_tree, reflink", lambda src, dest: copy_tree(src, dest, strategy="reflink")),
+        ("copy_tree, hardlink", lambda src, dest: copy_tree(src, dest, strategy="hardlink")),
+        ("copy_tree, symlink", lambda src, dest: copy_tree(src, dest, strategy="symlink")),
+    ]
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for tree_name, files, size in trees:
+            src = os.path.join(tmp, "src")
+            dest = os.path.join(tmp, "dest")
+            total = write_tree(src, files, size)
+            for name, copy in implementations:
+                stats = measure(copy, src, dest, files, total)
+                rows.append([tree_name, name, format_seconds(stats.seconds),
+                             f"{stats.files_per_second():.0f}", f"{stats.megabytes_per_second():.1f}"])
+            shutil.rmtree(src)
+            shutil.rmtree(dest)
+
+    print(f"{os.cpu_count()} CPU cores\n")
+    print_table(["tree", "implementation", "time", "files/s", "MB/s"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import os, random
+
+def make_page(i):
+    """make_page returns a small markdown page with a typical mix of blocks."""
+    return "\n\n".join([
+        f"# Page {i}",
+        f"Some **bold** text, some *italic* text and a [link](/pages/{i}).",
+        "- first item\n- second `code` item\n- third item",
+        "> A quote\n>\n> -- somebody",
+        "```\nprint('hello')\n```",
+        f"![An image](/images/{i}.png)",
+    ])
+
+def write_corpus(dirpath, pages, pages_per_dir=100):
+    """write_corpus writes pages pages made by make_page under dirpath, as section-N/page-M/index.md files."""
+    for i in range(pages):
+        page_dir = os.path.join(dirpath, f"section-{i // pages_per_dir}", f"page-{i}")
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.md"), "w") as f:
+            f.write(make_page(i))
+
+# The relative weights of the block types in a random page (see
+# make_random_page). Every page also starts with an h1.
+BLOCK_MIX = {
+    "paragraph": 6,
+    "heading": 2,
+    "unordered_list": 2,
+    "ordered_list": 1,
+    "quote": 1,
+    "code": 1,
+    "image": 1,
+}
+
+WORDS = ("site static page build render markdown block node text list quote code image link "
+         "template content fast slow cache tree walk parse token write read file path").split()
+
+def random_words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def random_inline_text(rng, words, inline_density, images):
+    """
+    random_inline_text returns a line of words words. Each word is formatted with probability inline_density, as bold, italic or code text, a link or, if images is more than 0, an image referencing one of images image files.
+    """
+    styles = ["**{}**", "*{}*", "`{}`", "[{}](/pages/{})"] + (["![{}](/images/{}.png)"] if images else [])
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < inline_density:
+            word = rng.choice(styles).format(word, rng.randrange(max(images, 1)))
+        parts.append(word)
+    return " ".join(parts)
+
+def make_random_page(rng, blocks=20, block_mix=BLOCK_MIX, inline_density=0.2, list_length=(2, 8), images=100):
+    """
+    make_random_page returns a markdown page made from the random number generator rng: an h1 and then blocks blocks whose types are drawn with the weights in block_mix.
+
+    inline_density is the share of words with inline markup (see
+    random_inline_text), list items and quote lines are drawn from the
+    list_length range, and image blocks and inline images reference one of
+    images files, /images/0.png and so on.
+    """
+    line = lambda words: random_inline_text(rng, words, inline_density, images)
+    types = list(block_mix)
+    weights = [block_mix[block_type] for block_type in types]
+    page = [f"# {random_words(rng, 4).capitalize()}"]
+    for block_type in rng.choices(types, weights, k=blocks):
+        if block_type == "paragraph":
+            page.append("\n".join(line(rng.randint(8, 30)) for _ in range(rng.randint(1, 3))))
+        elif block_type == "heading":
+            page.append("#" * rng.randint(2, 6) + " " + line(rng.randint(2, 6)))
+        elif block_type == "unordered_list":
+            marker = rng.choice("*-")
+            page.append("\n".join(f"{marker} {line(rng.randint(2, 10))}" for _ in range(rng.randint(*list_length))))
+        elif block_type == "ordered_list":
+            page.append("\n".join(f"{i}. {line(rng.randint(2, 10))}" for i in range(1, rng.randint(*list_length) + 1)))
+        elif block_type == "quote":
+            # make_quote_node joins the lines without a space, so each line
+            # starts and ends with a plain word, and the quote starts and ends
+            # with text, with the odd empty line in between.
+            lines = [f"> {random_words(rng, 1)} {line(rng.randint(2, 10))} {random_words(rng, 1)}" for _ in range(rng.randint(*list_length))]
+            page.append("\n".join(lines[:1] + [">" if rng.random() < 0.2 else text for text in lines[1:-1]] + lines[1:][-1:]))
+        elif block_type == "code":
+            page.append("```\n" + "\n".join(f"{random_words(rng, 3)}({rng.randrange(100)})" for _ in range(rng.randint(1, 10))) + "\n```")
+        elif block_type == "image":
+            page.append(f"![{random_words(rng, 2)}](/images/{rng.randrange(max(images, 1))}.png)")
+    return "\n\n".join(page)
+
+def random_page_path(i, depth=2, fanout=10):
+    """random_page_path returns the path of the page numbered i, relative to the content directory, depth directories deep with fanout directories per level."""
+    dirs = []
+    n = i
+    for level in range(depth):
+        dirs.append(f"section-{level}-{n % fanout}")
+        n //= fanout
+    return os.path.join(*dirs, f"page-{i}", "index.md")
+
+def write_random_corpus(dirpath, pages, seed=0, depth=2, fanout=10, static_dirpath=None, **page_options):
+    """
+    write_random_corpus writes pages pages made by make_random_page under dirpath (see random_page_path), and returns their paths. The same seed always writes the same corpus. page_options are passed to make_random_page.
+
+    If static_dirpath is given, the image files the pages reference are
+    written there, in an images directory, along with an index.css.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(pages):
+        path = os.path.join(dirpath, random_page_path(i, depth, fanout))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(make_random_page(rng, **page_options))
+        paths.append(path)
+
+    if static_dirpath is not None:
+        os.makedirs(os.path.join(static_dirpath, "images"), exist_ok=True)
+        with open(os.path.join(static_dirpath, "index.css"), "w") as f:
+            f.write("body { margin: 0 auto; max-width: 40em; }\n")
+        for i in range(page_options.get("images", 100)):
+            with open(os.path.join(static_dirpath, "images", f"{i}.png"), "wb") as f:
+                f.write(rng.randbytes(rng.randint(1_000, 20_000)))
+    return paths
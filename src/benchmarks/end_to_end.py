@@ -0,0 +1,89 @@
+"""
+Builds a seeded random site (see write_random_corpus) with main.py, the way a
+user would, and prints the results as JSON so runs can be compared across
+commits: the time of a clean build, a no-op rebuild and a rebuild after one
+page changed, along with the per-stage times of benchmarks.stages on the same
+pages.
+
+Run from the repository root with ./bench.sh end_to_end [--pages N] [--seed N] [--jobs N] [--output PATH]
+"""
+import argparse, json, os, platform, shutil, subprocess, sys, tempfile, time
+from benchmarks.corpus import write_random_corpus
+from benchmarks.generate_pages import TEMPLATE
+from benchmarks.stages import measure_stages
+
+SRC_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Build a random site with main.py and print the timings as JSON.")
+    parser.add_argument("--pages", type=int, default=1_000, help="number of pages (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the corpus (default: 0)")
+    parser.add_argument("--jobs", type=int, default=1, help="processes used to generate pages (default: 1)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each build, of which the fastest is kept (default: 3)")
+    parser.add_argument("--output", help="write the JSON to this file instead of printing it")
+    return parser.parse_args()
+
+def run_main(site_dirpath, *args):
+    """run_main runs main.py in site_dirpath, with its output discarded, and returns how long it took in seconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, os.path.join(SRC_PATH, "main.py"), "/", "public", *args],
+                   cwd=site_dirpath, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+def git_commit():
+    """git_commit returns the commit the benchmark ran on, or None outside a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], cwd=SRC_PATH, capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+def main():
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_random_corpus(os.path.join(tmp, "content"), args.pages, args.seed, static_dirpath=os.path.join(tmp, "static"))
+        with open(os.path.join(tmp, "template.html"), "w") as f:
+            f.write(TEMPLATE)
+        markdowns = []
+        for path in paths:
+            with open(path) as f:
+                markdowns.append(f.read())
+
+        jobs = ["-j", str(args.jobs)]
+        builds = {
+            "clean": min(run_main(tmp, "--clean", *jobs) for _ in range(args.repeat)),
+            "no-op": min(run_main(tmp, *jobs) for _ in range(args.repeat)),
+        }
+        changed = []
+        for i in range(args.repeat):
+            with open(paths[i % len(paths)], "a") as f:
+                f.write(f"\n\nChanged {i}.")
+            changed.append(run_main(tmp, *jobs))
+        builds["one page changed"] = min(changed)
+        output_bytes = sum(os.path.getsize(os.path.join(root, name))
+                           for root, _, files in os.walk(os.path.join(tmp, "public")) for name in files)
+        stages = measure_stages(markdowns, args.repeat)
+
+    results = {
+        "benchmark": "end_to_end",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "pages": args.pages,
+        "seed": args.seed,
+        "jobs": args.jobs,
+        "markdown_bytes": sum(len(markdown.encode()) for markdown in markdowns),
+        "output_bytes": output_bytes,
+        "build_seconds": builds,
+        "stage_seconds": stages,
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measures full builds of a synthetic corpus into an empty output directory, as
+in a fresh CI checkout, without a fragment cache, with an empty one, and with
+a warm one, before and after a template change. Each build writes a fresh
+manifest, whose source hashes the fragment cache keys are made from.
+
+Run from the repository root with ./bench.sh fragment_cache [pages] [corpus pages per page]
+"""
+import contextlib, os, shutil, sys, tempfile, time
+from processors.fragment_cache import FragmentCache
+from processors.generate_page import generate_pages_recursively
+from benchmarks.corpus import make_page
+from benchmarks.generate_pages import TEMPLATE
+from benchmarks.timing import format_seconds, print_table
+
+def write_pages(content_dir, pages, parts):
+    """write_pages writes pages markdown files under content_dir, each made of parts corpus pages."""
+    for i in range(pages):
+        page_dir = os.path.join(content_dir, f"section-{i // 100}", f"page-{i}")
+        os.makedirs(page_dir, exist_ok=True)
+        with open(os.path.join(page_dir, "index.md"), "w") as f:
+            f.write("\n\n".join(make_page(i * parts + j) for j in range(parts)))
+
+def build(content_dir, template_path, dest_dir, fragments):
+    shutil.rmtree(dest_dir, ignore_errors=True)
+    manifest_path = dest_dir + "-manifest.json"
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate_pages_recursively(content_dir, template_path, dest_dir, jobs=1, manifest_path=manifest_path, fragments=fragments)
+    return time.perf_counter() - start
+
+def read_tree(dirpath):
+    tree = {}
+    for root, _, files in os.walk(dirpath):
+        for name in files:
+            with open(os.path.join(root, name)) as f:
+                tree[os.path.relpath(os.path.join(root, name), dirpath)] = f.read()
+    return tree
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    parts = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        template_path = os.path.join(tmp, "template.html")
+        dest_dir = os.path.join(tmp, "public")
+        fragments = FragmentCache(os.path.join(tmp, "cache", "fragments"))
+        write_pages(content_dir, pages, parts)
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+
+        rows = [["no fragment cache", format_seconds(build(content_dir, template_path, dest_dir, None))]]
+        expected = read_tree(dest_dir)
+        rows.append(["empty cache", format_seconds(build(content_dir, template_path, dest_dir, fragments))])
+        rows.append(["warm cache", format_seconds(build(content_dir, template_path, dest_dir, fragments))])
+        assert read_tree(dest_dir) == expected
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE.replace("<body>", "<body><header>New header</header>"))
+        rows.append(["warm cache, new template", format_seconds(build(content_dir, template_path, dest_dir, fragments))])
+        size = sum(size for _, size, _ in fragments.entries())
+
+    print(f"{pages} pages of {parts} corpus pages each, {size / 1e6:.1f} MB of cached fragments\n")
+    print_table(["build from scratch", "time"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Measures how generate_pages_recursively scales with the number of worker
+processes on a synthetic corpus.
+
+Run from the repository root with ./bench.sh generate_pages [pages]
+"""
+import contextlib, os, sys, tempfile, time
+from processors.generate_page import generate_pages_recursively
+from benchmarks.corpus import write_corpus
+from benchmarks.timing import format_seconds, print_table
+
+JOBS = [1, 2, 4, 8, 16]
+TEMPLATE = '<html><head><title>{{ Title }}</title><link href="/index.css" rel="stylesheet" /></head><body>{{ Content }}</body></html>'
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        template_path = os.path.join(tmp, "template.html")
+        write_corpus(content_dir, pages)
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+
+        rows = []
+        baseline = None
+        for jobs in JOBS:
+            dest_dir = os.path.join(tmp, f"public-{jobs}")
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                generate_pages_recursively(content_dir, template_path, dest_dir, base_path="/repo/", jobs=jobs)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            rows.append([jobs, format_seconds(elapsed), f"{pages / elapsed:.0f}", f"{baseline / elapsed:.1f}x"])
+
+    print(f"{pages} pages, {os.cpu_count()} CPU cores\n")
+    print_table(["jobs", "time", "pages/s", "speedup"], rows)
+
+if __name__ == "__main__":
+    main()
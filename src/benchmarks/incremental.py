@@ -0,0 +1,39 @@
+"""
+Measures a full build and a no-op incremental rebuild of a synthetic corpus.
+
+Run from the repository root with ./bench.sh incremental [pages]
+"""
+import contextlib, os, sys, tempfile, time
+from processors.generate_page import generate_pages_recursively
+from benchmarks.corpus import write_corpus
+from benchmarks.generate_pages import TEMPLATE
+from benchmarks.timing import format_seconds, print_table
+
+def build(content_dir, template_path, dest_dir, manifest_path):
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        generate_pages_recursively(content_dir, template_path, dest_dir, manifest_path=manifest_path)
+    return time.perf_counter() - start
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        template_path = os.path.join(tmp, "template.html")
+        dest_dir = os.path.join(tmp, "public")
+        manifest_path = os.path.join(tmp, "cache", "manifest.json")
+        write_corpus(content_dir, pages)
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+
+        rows = [["full", format_seconds(build(content_dir, template_path, dest_dir, manifest_path))]]
+        rows.append(["no-op", format_seconds(build(content_dir, template_path, dest_dir, manifest_path))])
+        with open(os.path.join(content_dir, "section-0", "page-0", "index.md"), "a") as f:
+            f.write("\n\nOne more paragraph.")
+        rows.append(["one page changed", format_seconds(build(content_dir, template_path, dest_dir, manifest_path))])
+
+    print(f"{pages} pages\n")
+    print_table(["build", "time"], rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Compares the ways a very large markdown source can be split into blocks and
+parsed into a page: reading it into a string, or streaming its lines as
+parse_page does. Each one runs in a fresh process, which reports its time to
+the first block, its total time and its peak RSS.
+
+The splitters run over a file of the given size. A parsed page's nodes take
+about 18 times the size of its markdown in memory, so the parsers run over a
+smaller file of parse_megabytes.
+
+Run from the repository root with ./bench.sh large_input [megabytes] [parse_megabytes]
+"""
+import multiprocessing, os, resource, sys, tempfile, time
+from markdown_to_html_nodes.markdown_to_block_strings import iter_block_strings, iter_text_block_strings
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from processors.generate_page import parse_page
+from benchmarks.corpus import make_page
+from benchmarks.timing import format_seconds, print_table
+
+def write_markdown(path, size):
+    """write_markdown writes corpus pages to the file at path until it holds at least size bytes, without building the whole text in memory."""
+    written = 0
+    i = 0
+    with open(path, 'w') as f:
+        while written < size:
+            chunk = "\n\n".join(make_page(j) for j in range(i, i + 1_000)) + "\n\n"
+            written += f.write(chunk)
+            i += 1_000
+
+def read_blocks(path):
+    with open(path, 'r') as f:
+        yield from iter_text_block_strings(f.read())
+
+def line_blocks(path):
+    with open(path, 'r') as f:
+        yield from iter_block_strings(f)
+
+def read_page(path):
+    with open(path, 'r') as f:
+        return markdown_to_html_node(f.read()).children
+
+def line_page(path):
+    return parse_page(path)[1].children
+
+def no_blocks(path):
+    yield from ()
+
+methods = {
+    "interpreter only": no_blocks,
+    "split: read(), string": read_blocks,
+    "split: iter_block_strings, file": line_blocks,
+}
+
+parsers = {
+    "parse: read(), markdown_to_html_node": read_page,
+    "parse: parse_page, file": line_page,
+}
+
+def measure(name, path, connection):
+    """measure splits or parses the file at path with the named method, counting the blocks, and sends its timings and peak RSS through connection. The parsers only return the blocks once the whole page is parsed, so no time to the first block is sent for them."""
+    start = time.perf_counter()
+    first_block = None
+    blocks = 0
+    for _ in (methods | parsers)[name](path):
+        if first_block is None:
+            first_block = time.perf_counter() - start
+        blocks += 1
+    total = time.perf_counter() - start
+    if name in parsers:
+        first_block = None
+    # ru_maxrss is in kilobytes on Linux.
+    connection.send((first_block, total, blocks, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024))
+
+def run(name, path):
+    """run calls measure in a freshly spawned process, so each method's peak RSS is its own."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=measure, args=(name, path, sender))
+    process.start()
+    result = receiver.recv()
+    process.join()
+    return result
+
+def measure_all(names, path):
+    """measure_all runs each of the named methods over the file at path and returns the rows of the table and the number of blocks."""
+    rows = []
+    counts = set()
+    for name in names:
+        first_block, total, blocks, peak_rss = run(name, path)
+        if blocks:
+            counts.add(blocks)
+        rows.append([name, format_seconds(first_block), format_seconds(total), f"{peak_rss / 1e6:.1f} MB"])
+    assert len(counts) == 1
+    return rows, counts.pop()
+
+def main():
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    parse_megabytes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    with tempfile.TemporaryDirectory() as tmp:
+        for names, size in [(methods, megabytes), (parsers, parse_megabytes)]:
+            path = os.path.join(tmp, f"{size}.md")
+            write_markdown(path, size * 1_000_000)
+            actual_size = os.path.getsize(path)
+            rows, blocks = measure_all(names, path)
+            os.remove(path)
+            print(f"{actual_size / 1e6:.1f} MB of markdown, {blocks} blocks\n")
+            print_table(["method", "first block", "all blocks", "peak RSS"], rows)
+            print()
+
+if __name__ == "__main__":
+    main()
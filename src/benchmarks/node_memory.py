@@ -0,0 +1,57 @@
+"""
+Reports bytes per node for the node classes, compared with the same classes
+carrying a per-instance __dict__, and the peak RSS of parsing a synthetic
+10k-page corpus.
+
+Run from the repository root with ./bench.sh node_memory [pages]
+"""
+import resource, sys, tracemalloc
+from nodes.textnode import TextNode, TextType
+from nodes.leafnode import LeafNode
+from nodes.parentnode import ParentNode
+from nodes.voidnode import VoidNode
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from benchmarks.timing import print_table
+from benchmarks.corpus import make_page
+
+NODE_COUNT = 100_000
+
+# Subclasses without __slots__ get a __dict__ again, like the nodes used to.
+class DictTextNode(TextNode): pass
+class DictLeafNode(LeafNode): pass
+class DictParentNode(ParentNode): pass
+class DictVoidNode(VoidNode): pass
+
+node_factories = [
+    ("TextNode", lambda cls, i: cls(f"text {i}", TextType.NORMAL), TextNode, DictTextNode),
+    ("LeafNode", lambda cls, i: cls("b", f"text {i}"), LeafNode, DictLeafNode),
+    ("ParentNode", lambda cls, i: cls("p", []), ParentNode, DictParentNode),
+    ("VoidNode", lambda cls, i: cls("br"), VoidNode, DictVoidNode),
+]
+
+def bytes_per_node(factory, cls):
+    """bytes_per_node returns the memory allocated per instance when NODE_COUNT instances are kept alive, excluding the list holding them."""
+    tracemalloc.start()
+    nodes = [None] * NODE_COUNT
+    before = tracemalloc.get_traced_memory()[0]
+    for i in range(NODE_COUNT):
+        nodes[i] = factory(cls, i)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / NODE_COUNT
+
+def main():
+    rows = []
+    for name, factory, slotted, with_dict in node_factories:
+        slotted_size = bytes_per_node(factory, slotted)
+        dict_size = bytes_per_node(factory, with_dict)
+        rows.append([name, f"{slotted_size:.0f}", f"{dict_size:.0f}"])
+    print_table(["node", "bytes (slots)", "bytes (__dict__)"], rows)
+
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    trees = [markdown_to_html_node(make_page(i)) for i in range(pages)]
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"\npeak RSS after parsing {len(trees)} pages: {peak_mb:.1f} MB")
+
+if __name__ == "__main__":
+    main()
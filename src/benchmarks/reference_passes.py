@@ -0,0 +1,155 @@
+"""
+The original text_to_textnodes and the split_nodes_by_* passes it ran, as
+they were before the scanner and the iterative splitters replaced them.
+They are frozen here, and don't share code with the modules they were
+replaced by, so that the differential tests in test_text_to_textnodes and
+the text_to_textnodes benchmark always compare against the original algorithm.
+"""
+import re
+from nodes.textnode import TextNode, TextType
+
+DELIMITERS = [
+    ("**", TextType.BOLD),
+    ("__", TextType.BOLD),
+    ("*", TextType.ITALIC),
+    ("_", TextType.ITALIC),
+    ("`", TextType.CODE)
+]
+
+def text_to_textnodes_by_passes(text):
+    """text_to_textnodes_by_passes is the original text_to_textnodes, which splits the whole list of nodes once per delimiter and then once each for images, links, and line breaks."""
+    if len(text) == 0:
+        raise Exception("Text nodes must not be empty")
+
+    nodes = [TextNode(text, TextType.NORMAL)]
+    for delimiter, text_type in DELIMITERS:
+        nodes = original_split_nodes_by_delimiter(nodes, delimiter, text_type)
+    nodes = original_split_nodes_by_image(nodes)
+    nodes = original_split_nodes_by_link(nodes)
+    return original_split_nodes_by_linebreak(nodes)
+
+def original_split_nodes_by_delimiter(old_nodes, delimiter, text_type, new_nodes=None):
+    result = []
+    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
+        return new_nodes
+    elif new_nodes:
+        result = new_nodes.copy()
+
+    current_node = old_nodes[0]
+    if not isinstance(current_node, TextNode) or not current_node.text or current_node.text_type != TextType.NORMAL:
+        result.append(current_node)
+    else:
+        result.extend(original_split_node(current_node, delimiter, text_type))
+    return original_split_nodes_by_delimiter(old_nodes[1:], delimiter, text_type, result)
+
+def original_split_node(text_node, delimiter, text_type):
+    if len(text_node.text) == 0:
+        return []
+
+    open_delimiter = False
+    result_nodes = []
+    curr_node = TextNode("", text_node.text_type)
+
+    i = 0
+    if text_node.text[:len(delimiter)] == delimiter:
+        i += len(delimiter)
+        open_delimiter = True
+        curr_node.text_type = text_type
+
+    while i < len(text_node.text):
+        char = text_node.text[i]
+        if text_node.text[i:i+len(delimiter)] == delimiter and not open_delimiter:
+            if curr_node.text:
+                result_nodes.append(curr_node)
+            curr_node = TextNode("", text_type)
+            i += len(delimiter) - 1
+            open_delimiter = True
+        elif text_node.text[i:i+len(delimiter)] == delimiter:
+            result_nodes.append(curr_node)
+            open_delimiter = False
+            curr_node = TextNode("", text_node.text_type)
+            i += len(delimiter) - 1
+        else:
+            curr_node.text += char
+        i += 1
+
+    if open_delimiter > 0:
+        raise Exception(f"Invalid markdown. No closing delimiter found, searching for \"{delimiter}\".")
+    if curr_node.text:
+        result_nodes.append(curr_node)
+    return result_nodes
+
+def original_split_nodes_by_image(old_nodes, new_nodes=None):
+    result = []
+    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
+        return new_nodes or []
+    elif new_nodes:
+        result = new_nodes.copy()
+
+    current_node = old_nodes[0]
+    if not isinstance(current_node, TextNode) or not current_node.text:
+        result.append(current_node)
+    else:
+        current_text = current_node.text
+        images = re.findall(r'!\[([^\[\]]*)\]\(([^\(\)]*)\)', current_text)
+        if len(images) == 0:
+            result.append(current_node)
+            return original_split_nodes_by_image(old_nodes[1:], result)
+        for image in images:
+            left, right = current_text.split(f"![{image[0]}]({image[1]})", 1)
+            if left != "":
+                result.append(TextNode(left, TextType.NORMAL))
+            result.append(TextNode(image[0], TextType.IMAGE, url=image[1]))
+            current_text = right
+        if current_text != "":
+            result.append(TextNode(right, TextType.NORMAL))
+    return original_split_nodes_by_image(old_nodes[1:], result)
+
+def original_split_nodes_by_link(old_nodes, new_nodes=None):
+    result = []
+    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
+        return new_nodes or []
+    elif new_nodes:
+        result = new_nodes.copy()
+
+    current_node = old_nodes[0]
+    if not isinstance(current_node, TextNode) or not current_node.text:
+        result.append(current_node)
+    else:
+        current_text = current_node.text
+        links = re.findall(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*?)(?:\s+\"([^\"]*)\")?\)", current_text)
+        if len(links) == 0:
+            result.append(current_node)
+            return original_split_nodes_by_link(old_nodes[1:], result)
+        for link in links:
+            left, right = current_text.split(f"[{link[0]}]({link[1]})", 1)
+            if left != "":
+                result.append(TextNode(left, TextType.NORMAL))
+            result.append(TextNode(link[0], TextType.LINK, url=link[1]))
+            current_text = right
+        if current_text != "":
+            result.append(TextNode(right, TextType.NORMAL))
+    return original_split_nodes_by_link(old_nodes[1:], result)
+
+def original_split_nodes_by_linebreak(old_nodes, new_nodes=None):
+    result = []
+    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
+        return new_nodes or []
+    elif new_nodes:
+        result = new_nodes.copy()
+
+    current_node = old_nodes[0]
+    if not isinstance(current_node, TextNode) or not current_node.text:
+        result.append(current_node)
+    else:
+        current_text = current_node.text
+        if not "\n" in current_text:
+            result.append(current_node)
+            return original_split_nodes_by_linebreak(old_nodes[1:], result)
+        left, right = current_text.split("\n", maxsplit=1)
+        if left != "":
+            result.append(TextNode(left, TextType.NORMAL))
+        result.append(TextNode("\n", TextType.LINEBREAK))
+        if right != "":
+            result.append(TextNode(right, TextType.NORMAL))
+    return original_split_nodes_by_linebreak(old_nodes[1:], result)
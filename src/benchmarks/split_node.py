@@ -0,0 +1,23 @@
+"""
+Measures split_node on paragraphs from 100 B to 1 MB.
+
+Run from the repository root with ./bench.sh split_node
+"""
+from markdown_to_html_nodes.split_nodes_by_delimiter import split_node
+from nodes.textnode import TextNode, TextType
+from benchmarks.timing import best_time, format_seconds, print_table
+
+UNIT = "Some text with a **bold** phrase. "
+PARAGRAPH_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+
+def main():
+    rows = []
+    for size in PARAGRAPH_SIZES:
+        node = TextNode(UNIT * (size // len(UNIT) + 1), TextType.NORMAL)
+        seconds = best_time(split_node, node, "**", TextType.BOLD)
+        megabytes = len(node.text) / 1e6
+        rows.append([len(node.text), format_seconds(seconds), f"{megabytes / seconds:.1f}"])
+    print_table(["bytes", "time", "MB/s"], rows)
+
+if __name__ == "__main__":
+    main()
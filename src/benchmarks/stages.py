@@ -0,0 +1,89 @@
+"""
+Measures each stage of turning markdown into pages, on a seeded random corpus
+(see make_random_page): splitting into blocks, classifying blocks, tokenizing
+inline text, parsing into nodes (all three together), rendering and writing.
+
+Run from the repository root with ./bench.sh stages [pages] [seed]
+"""
+import os, random, sys, tempfile
+from processors.basepath import basepath_resolver
+from markdown_to_html_nodes.block_to_block_type import BlockType, block_to_block_type
+from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from markdown_to_html_nodes.text_to_textnodes import text_to_textnodes
+from benchmarks.corpus import make_random_page
+from benchmarks.timing import best_time, format_seconds, print_table
+
+def inline_texts(block_type, text):
+    """inline_texts returns the strings the parser passes to text_to_textnodes for a block of the given type."""
+    lines = text.split("\n")
+    if block_type == BlockType.HEADING:
+        return [text.split(" ", maxsplit=1)[1]]
+    if block_type == BlockType.PARAGRAPH:
+        return [text]
+    if block_type in (BlockType.UNORDERED_LIST, BlockType.ORDERED_LIST):
+        return [line.split(" ", maxsplit=1)[1] for line in lines]
+    if block_type == BlockType.QUOTE:
+        return ["".join("\n" if len(line.strip()) == 1 else line.strip().split(" ", maxsplit=1)[1] for line in lines)]
+    return []
+
+def split_all(markdowns):
+    return [markdown_to_block_strings(markdown) for markdown in markdowns]
+
+def classify_all(blocks):
+    return [block_to_block_type(block) for block in blocks]
+
+def tokenize_all(texts):
+    for text in texts:
+        text_to_textnodes(text)
+
+def parse_all(markdowns):
+    return [markdown_to_html_node(markdown, "article") for markdown in markdowns]
+
+def render_all(trees, resolve_url):
+    pages = []
+    for tree in trees:
+        chunks = []
+        tree.render_to(chunks.append, resolve_url=resolve_url)
+        pages.append("".join(chunks))
+    return pages
+
+def write_all(pages, dirpath):
+    for i, html in enumerate(pages):
+        path = os.path.join(dirpath, f"section-{i // 100}", f"page-{i}", "index.html")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(html)
+
+def measure_stages(markdowns, repeat=3):
+    """measure_stages times each stage on the list of markdown pages and returns a dict mapping each stage's name to its best time in seconds."""
+    blocks = [block for page_blocks in split_all(markdowns) for block in page_blocks]
+    texts = [text for block, block_type in zip(blocks, classify_all(blocks)) for text in inline_texts(block_type, block)]
+    trees = parse_all(markdowns)
+    resolve_url = basepath_resolver("/repo/")
+    pages = render_all(trees, resolve_url)
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            "split": best_time(split_all, markdowns, repeat=repeat),
+            "classify": best_time(classify_all, blocks, repeat=repeat),
+            "tokenize": best_time(tokenize_all, texts, repeat=repeat),
+            "parse": best_time(parse_all, markdowns, repeat=repeat),
+            "render": best_time(render_all, trees, resolve_url, repeat=repeat),
+            "write": best_time(write_all, pages, tmp, repeat=repeat),
+        }
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+    markdowns = [make_random_page(rng) for _ in range(pages)]
+    size = sum(len(markdown.encode()) for markdown in markdowns)
+
+    rows = []
+    for stage, seconds in measure_stages(markdowns).items():
+        rows.append([stage, format_seconds(seconds), format_seconds(seconds / pages), f"{size / seconds / 1e6:.1f}"])
+    print(f"{pages} pages, seed {seed}, {size / 1e6:.1f} MB of markdown\n")
+    print_table(["stage", "total", "per page", "MB/s of markdown"], rows)
+
+if __name__ == "__main__":
+    main()
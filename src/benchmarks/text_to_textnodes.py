@@ -0,0 +1,36 @@
+"""
+Compares the single-pass text_to_textnodes scanner with the original sequence
+of split_nodes_by_* passes on paragraphs of increasing length.
+
+Run from the repository root with ./bench.sh text_to_textnodes
+"""
+from markdown_to_html_nodes.text_to_textnodes import text_to_textnodes
+from benchmarks.reference_passes import text_to_textnodes_by_passes
+from benchmarks.timing import best_time, format_seconds, print_table
+
+SENTENCE = "Some **bold** words, an *italic* one, `code` and a [link](https://example.com). "
+PARAGRAPH_LENGTHS = [100, 300, 1_000, 3_000, 10_000, 100_000]
+
+def make_paragraph(length):
+    """make_paragraph repeats SENTENCE until the paragraph is at least length characters long."""
+    return SENTENCE * (length // len(SENTENCE) + 1)
+
+def time_or_none(func, text):
+    """The recursive passes raise RecursionError on long paragraphs."""
+    try:
+        return best_time(func, text)
+    except RecursionError:
+        return None
+
+def main():
+    rows = []
+    for length in PARAGRAPH_LENGTHS:
+        text = make_paragraph(length)
+        passes = time_or_none(text_to_textnodes_by_passes, text)
+        scanner = best_time(text_to_textnodes, text)
+        speedup = f"{passes / scanner:.1f}x" if passes else "n/a"
+        rows.append([len(text), len(text_to_textnodes(text)), format_seconds(passes), format_seconds(scanner), speedup])
+    print_table(["chars", "nodes", "passes", "scanner", "speedup"], rows)
+
+if __name__ == "__main__":
+    main()
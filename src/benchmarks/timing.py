@@ -0,0 +1,31 @@
+import time
+
+def best_time(func, *args, repeat=5, **kwargs):
+    """
+    best_time calls func with the given arguments repeat times and returns the fastest run in seconds. If func raises, the exception is propagated.
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+def format_seconds(seconds):
+    """format_seconds returns a short human readable duration, or 'n/a' for None."""
+    if seconds is None:
+        return "n/a"
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def print_table(headers, rows):
+    """print_table prints rows (lists of values) as a left-aligned plain text table."""
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    for row in [headers, ["-" * width for width in widths]] + rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
@@ -0,0 +1,45 @@
+"""
+Compares the original listdir + isfile/isdir traversal of find_pages with the
+scandir based walk_tree, on a synthetic content tree.
+
+Run from the repository root with ./bench.sh walk_tree [pages]
+"""
+import os, re, sys, tempfile
+from processors.generate_page import find_pages
+from benchmarks.corpus import write_corpus
+from benchmarks.timing import best_time, format_seconds, print_table
+
+def listdir_find_pages(src_dirpath, dest_dirpath, tag="div"):
+    """listdir_find_pages is find_pages as it was before walk_tree: recursive, with stat calls for each entry."""
+    source_tree = sorted(os.listdir(src_dirpath))
+    if len(source_tree) == 0:
+        raise OSError(f"Source path must not be empty.")
+
+    pages = []
+    for f in source_tree:
+        src_path = os.path.join(src_dirpath, f)
+        dest_file = re.sub(r'.md$', ".html", f)
+        dest_path = os.path.join(dest_dirpath, dest_file)
+        if os.path.isfile(src_path):
+            pages.append((src_path, dest_path, tag))
+        elif os.path.isdir(src_path):
+            pages.extend(listdir_find_pages(src_path, dest_path))
+    return pages
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        dest_dir = os.path.join(tmp, "public")
+        write_corpus(content_dir, pages)
+        assert find_pages(content_dir, dest_dir) == listdir_find_pages(content_dir, dest_dir)
+        rows = [
+            ["listdir + isfile/isdir", format_seconds(best_time(listdir_find_pages, content_dir, dest_dir))],
+            ["walk_tree (scandir)", format_seconds(best_time(find_pages, content_dir, dest_dir))],
+        ]
+
+    print(f"{pages} pages\n")
+    print_table(["find_pages", "time"], rows)
+
+if __name__ == "__main__":
+    main()
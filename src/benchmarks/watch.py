@@ -0,0 +1,64 @@
+"""
+Measures watch mode's edit-to-output latency on a synthetic site: the time
+for one poll to notice an edited page, template or static file and rebuild
+what depends on it, and the cost of a poll that finds nothing.
+
+Run from the repository root with ./bench.sh watch [pages]
+"""
+import contextlib, os, sys, tempfile, time
+from processors.copy_tree import sync_tree
+from processors.generate_page import generate_pages_recursively
+from processors.watch import SiteWatcher
+from benchmarks.corpus import write_corpus
+from benchmarks.generate_pages import TEMPLATE
+from benchmarks.timing import format_seconds, print_table
+
+def timed_poll(watcher, edit=None):
+    """timed_poll applies edit, if given, and returns the time until a poll has rebuilt its outputs."""
+    if edit:
+        edit()
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        watcher.poll()
+    return time.perf_counter() - start
+
+def appender(path, text):
+    """appender returns a function that appends text to the file at path."""
+    def append():
+        with open(path, "a") as f:
+            f.write(text)
+    return append
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with tempfile.TemporaryDirectory() as tmp:
+        content_dir = os.path.join(tmp, "content")
+        static_dir = os.path.join(tmp, "static")
+        template_path = os.path.join(tmp, "template.html")
+        dest_dir = os.path.join(tmp, "public")
+        write_corpus(content_dir, pages)
+        os.makedirs(os.path.join(static_dir, "images"))
+        for i in range(100):
+            with open(os.path.join(static_dir, "images", f"image-{i}.svg"), "w") as f:
+                f.write("<svg/>")
+        with open(template_path, "w") as f:
+            f.write(TEMPLATE)
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            sync_tree(static_dir, dest_dir)
+            generate_pages_recursively(content_dir, template_path, dest_dir)
+
+        watcher = SiteWatcher(content_dir, static_dir, template_path, dest_dir)
+        rows = [
+            ["no change", format_seconds(min(timed_poll(watcher) for _ in range(5)))],
+            ["one page edited", format_seconds(timed_poll(
+                watcher, appender(os.path.join(content_dir, "section-0", "page-0", "index.md"), "\n\nMore.")))],
+            ["static file edited", format_seconds(timed_poll(
+                watcher, appender(os.path.join(static_dir, "images", "image-0.svg"), "\n")))],
+            ["template edited", format_seconds(timed_poll(watcher, appender(template_path, "\n")))],
+        ]
+
+    print(f"{pages} pages\n")
+    print_table(["poll", "time"], rows)
+
+if __name__ == "__main__":
+    main()
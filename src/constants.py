@@ -1,3 +1,4 @@
 STATIC_PATH = "./static"
 CONTENT_PATH = "./content"
-TEMPLATE_PATH = "./template.html"
\ No newline at end of file
+TEMPLATE_PATH = "./template.html"
+CACHE_PATH = "./.cache"
\ No newline at end of file
@@ -1,21 +1,137 @@
-import sys
-from processors.copy_tree import copy_tree
+import argparse, contextlib, cProfile, os, shutil
+from processors.copy_tree import sync_tree, COPY_STRATEGIES
 from processors.generate_page import generate_pages_recursively
-from constants import STATIC_PATH, TEMPLATE_PATH, CONTENT_PATH
+from processors.manifest import manifest_path_for
+from processors.fragment_cache import FragmentCache
+from processors.profiler import start_profiling, stop_profiling
+from processors.watch import SiteWatcher, watch
+from processors.dev_server import serve
+from constants import STATIC_PATH, TEMPLATE_PATH, CONTENT_PATH, CACHE_PATH
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the site from the content and static directories.")
+    parser.add_argument("base_path", nargs="?", default="/",
+                        help='the base path where the content will be served (default: "/")')
+    parser.add_argument("deploy_path", nargs="?", default="./public",
+                        help='the directory the site is written to (default: "./public")')
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="number of processes used to generate pages (default: one per CPU core)")
+    parser.add_argument("--copy-threads", type=int, default=None,
+                        help="number of threads used to copy static files (default: ThreadPoolExecutor's default)")
+    parser.add_argument("--copy-strategy", choices=list(COPY_STRATEGIES), default="copy",
+                        help="how static files are put in the deploy directory; links are only suitable for local previews (default: copy)")
+    parser.add_argument("--clean", action="store_true",
+                        help="clear the deploy directory and regenerate every page")
+    parser.add_argument("--checksum", action="store_true",
+                        help="compare static files by content hash instead of size and mtime")
+    parser.add_argument("--block-cache", type=int, default=0, metavar="BLOCKS",
+                        help="parse blocks through a cache of this many blocks per process, so blocks repeated across pages are parsed once (default: 0, no cache)")
+    parser.add_argument("--fragment-cache", action="store_true",
+                        help="keep the rendered content of each page in .cache/fragments, so pages whose source didn't change aren't parsed again, even after the template changes")
+    parser.add_argument("--fragment-cache-size", type=int, default=256, metavar="MB",
+                        help="the size the fragment cache is pruned to after each build (default: 256)")
+    parser.add_argument("--import-cache", metavar="TARBALL",
+                        help="before building, add the fragments in a tarball written by --export-cache to the fragment cache (implies --fragment-cache)")
+    parser.add_argument("--export-cache", metavar="TARBALL",
+                        help="after building, write the fragment cache to a tarball, for example to carry it to the next CI run (implies --fragment-cache)")
+    parser.add_argument("--profile", action="store_true",
+                        help="time each stage of the build, in every process, and print a table of the stages and the slowest pages")
+    parser.add_argument("--profile-top", type=int, default=10, metavar="N",
+                        help="the number of slowest pages --profile lists (default: 10)")
+    parser.add_argument("--profile-dump", metavar="PATH",
+                        help="write cProfile stats of the build to PATH, for pstats or snakeviz; only this process is profiled, so pages are generated in it unless -j is given")
+    parser.add_argument("--watch", action="store_true",
+                        help="after building, keep polling the content, static files and template and rebuild what changed")
+    parser.add_argument("--interval", type=float, default=0.05,
+                        help="seconds between polls in watch mode (default: 0.05)")
+    parser.add_argument("--serve", action="store_true",
+                        help="instead of building, serve the site, rendering pages on request and reloading them when their sources change")
+    parser.add_argument("--host", default="localhost",
+                        help='the host the server listens on (default: "localhost")')
+    parser.add_argument("--port", type=int, default=8888,
+                        help="the port the server listens on, or the first free one after it (default: 8888)")
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+
     # URL_BASE_PATH is the base path where the content will be served.
     # "/" in development, "/repo-name/" on GitHub Pages.
-    URL_BASE_PATH = sys.argv[1] or "/"
+    URL_BASE_PATH = args.base_path or "/"
 
     # DEPLOY_FROM_PATH is the file path where the served content will be stored.
-    # "/public" in development, "/docs" on GitHub Pages.
-    DEPLOY_FROM_PATH = sys.argv[2] or "/public"
+    # "./public" in development, "./docs" on GitHub Pages.
+    DEPLOY_FROM_PATH = args.deploy_path or "./public"
+
+    # The development server renders pages from the sources as they are
+    # requested, so nothing is written to the public directory.
+    if args.serve:
+        try:
+            serve(CONTENT_PATH, STATIC_PATH, TEMPLATE_PATH, "article", base_path=URL_BASE_PATH, host=args.host, port=args.port)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    # The build manifests record what was copied and generated last time, so
+    # that only changed files are copied and generated again.
+    pages_manifest_path = manifest_path_for(CACHE_PATH, DEPLOY_FROM_PATH, "pages")
+    static_manifest_path = manifest_path_for(CACHE_PATH, DEPLOY_FROM_PATH, "static")
+
+    # A clean build clears the public directory and forgets the manifests.
+    if args.clean:
+        for path in [pages_manifest_path, static_manifest_path]:
+            if os.path.exists(path):
+                os.remove(path)
+        shutil.rmtree(DEPLOY_FROM_PATH, ignore_errors=True)
 
-    # Clear ./public directory and copy everything from ./static to it.
-    copy_tree(STATIC_PATH, DEPLOY_FROM_PATH, clear_dest_tree=True)
+    # Profiling times each stage of the build and reports the totals once the
+    # build is done. The stages are only instrumented when it's on.
+    profiler = start_profiling() if args.profile else None
+    jobs = args.jobs
+    cprofile = None
+    if args.profile_dump:
+        jobs = jobs or 1
+        cprofile = cProfile.Profile()
+        cprofile.enable()
+
+    # The fragment cache maps each page's source to its rendered content, so a
+    # fresh checkout with an imported cache, or a new template, doesn't have
+    # to parse every page again.
+    fragments = None
+    if args.fragment_cache or args.import_cache or args.export_cache:
+        fragments = FragmentCache(os.path.join(CACHE_PATH, "fragments"), args.fragment_cache_size * 1024 * 1024)
+        if args.import_cache:
+            print(f"Imported {fragments.import_archive(args.import_cache)} cached fragments from {args.import_cache}.")
+
+    # Copy new and changed files from ./static to the public directory.
+    with profiler.stage("copy") if profiler else contextlib.nullcontext():
+        copy_stats = sync_tree(STATIC_PATH, DEPLOY_FROM_PATH, manifest_path=static_manifest_path, checksum=args.checksum, workers=args.copy_threads, strategy=args.copy_strategy)
+    if copy_stats.files:
+        print(f"Copied static files: {copy_stats}")
 
     # Generate HTML files from markdown files in the content directory and add
     # them to the public directory.
-    generate_pages_recursively(CONTENT_PATH, TEMPLATE_PATH, DEPLOY_FROM_PATH, "article", base_path=URL_BASE_PATH)
+    generate_pages_recursively(CONTENT_PATH, TEMPLATE_PATH, DEPLOY_FROM_PATH, "article", base_path=URL_BASE_PATH, jobs=jobs, manifest_path=pages_manifest_path,
+                               block_cache_size=args.block_cache, fragments=fragments)
+    if args.export_cache:
+        print(f"Exported {fragments.export_archive(args.export_cache)} cached fragments to {args.export_cache}.")
+
+    if cprofile is not None:
+        cprofile.disable()
+        cprofile.dump_stats(args.profile_dump)
+        print(f"Wrote cProfile stats to {args.profile_dump}.")
+    if profiler is not None:
+        stop_profiling()
+        print(profiler.report(args.profile_top))
+
+    # In watch mode, rebuild only what depends on each file that changes.
+    if args.watch:
+        watcher = SiteWatcher(CONTENT_PATH, STATIC_PATH, TEMPLATE_PATH, DEPLOY_FROM_PATH, "article",
+                              base_path=URL_BASE_PATH, jobs=args.jobs, strategy=args.copy_strategy, block_cache_size=args.block_cache,
+                              fragments=fragments)
+        print("Watching for changes. Press Ctrl+C to stop.")
+        try:
+            watch(watcher, args.interval)
+        except KeyboardInterrupt:
+            pass
 main()
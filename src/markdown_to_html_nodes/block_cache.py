@@ -0,0 +1,43 @@
+from collections import OrderedDict
+
+class BlockCache:
+    """
+    BlockCache is a bounded LRU cache of parsed blocks, mapping the text of a block string to its BlockType and HTML node. Sites repeat many blocks from page to page (notices, footers, navigation lists), and a cached block is copied instead of being parsed again. See parse_block.
+
+    Entries are keyed by the block's text, so they are looked up by its hash
+    and two blocks share an entry only if their texts are equal. When there
+    are more than maxsize entries, the least recently used one is dropped.
+
+    The cached nodes are never handed out: get and put copy them (see
+    HTMLNode.copy), so changing a page's tree can't change the cache.
+
+    hits and misses count the calls to get that found an entry and that didn't.
+    """
+    def __init__(self, maxsize=4096):
+        if maxsize < 1:
+            raise ValueError("The block cache must hold at least one block.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, text):
+        """get returns a (block_type, node) tuple for the block text, with a copy of the cached node, or None if the block isn't cached."""
+        entry = self._entries.get(text)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(text)
+        block_type, node = entry
+        return block_type, node.copy()
+
+    def put(self, text, block_type, node):
+        """put caches a copy of node, the HTML node of the block text, with its block_type."""
+        self._entries[text] = (block_type, node.copy())
+        self._entries.move_to_end(text)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
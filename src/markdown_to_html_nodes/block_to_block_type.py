@@ -28,52 +28,74 @@ def block_to_block_type(block_text):
     - Unordered list: each line starts with a * or each line starts with a -, followed by a space.
     - Ordered list: each line starts with a number followed by a "." character, followed by a space. The numbers must start at 1 and be sequential.
     - Images: an image block is a markdown image that is the only thing in a block. The format is ![alt text](path/to/image).
+
+    The block's first character decides which of these it can be, so at most
+    one check runs before falling back to a paragraph (see block_classifiers).
     """
-    
-    def is_unordered_list(lines):
-        return each_line_starts_with("* ", lines) or each_line_starts_with("- ", lines)
+    classify = block_classifiers.get(block_text[:1])
+    if classify:
+        block_type = classify(block_text)
+        if block_type:
+            return block_type
+    return BlockType.PARAGRAPH
 
-    def is_quote(lines):
-        """Each line in a quote must start with a '>'. This must be followed either by a space or a newline character."""
-        if lines == [">"]:
-            return False
-        for line in lines:
-            if not (line.startswith("> ") or line == ">"):
-                return False
-        else:
-            return True
-    
-    lines = block_text.split("\n")
-    code_block_rx = re.compile(r'^```.+```$', re.DOTALL)
-    image_block_rx = r'^!\[([^\[\]]*)\]\(([^\(\)]*)\)$'
-    heading_rx = r'^#{1,6}\s+.+'
-    
-    if re.match(heading_rx, block_text):
+heading_rx = re.compile(r'^#{1,6}\s+.+')
+code_block_rx = re.compile(r'^```.+```$', re.DOTALL)
+image_block_rx = re.compile(r'^!\[([^\[\]]*)\]\(([^\(\)]*)\)$')
+
+def classify_heading(block_text):
+    if heading_rx.match(block_text):
         return BlockType.HEADING
-    elif re.match(code_block_rx, block_text):
+
+def classify_code(block_text):
+    if code_block_rx.match(block_text):
         return BlockType.CODE
-    elif is_quote(lines):
+
+def classify_quote(block_text):
+    if is_quote(block_text.split("\n")):
         return BlockType.QUOTE
-    elif re.match(image_block_rx, block_text):
+
+def classify_image(block_text):
+    if image_block_rx.match(block_text):
         return BlockType.IMAGE
-    elif is_unordered_list(lines):
+
+def classify_unordered_list(block_text):
+    if is_unordered_list(block_text.split("\n")):
         return BlockType.UNORDERED_LIST
-    elif is_ordered_list(lines):
+
+def classify_ordered_list(block_text):
+    if is_ordered_list(block_text.split("\n")):
         return BlockType.ORDERED_LIST
+
+# block_classifiers maps the first character of a block to the function that
+# checks the only block type (other than a paragraph) that it can start. Each
+# function returns the block type, or None for a paragraph.
+block_classifiers = {
+    "#": classify_heading,
+    "`": classify_code,
+    ">": classify_quote,
+    "!": classify_image,
+    "*": classify_unordered_list,
+    "-": classify_unordered_list,
+    "1": classify_ordered_list,
+}
+
+def is_quote(lines):
+    """Each line in a quote must start with a '>'. This must be followed either by a space or a newline character."""
+    if lines == [">"]:
+        return False
+    for line in lines:
+        if not (line.startswith("> ") or line == ">"):
+            return False
     else:
-        return BlockType.PARAGRAPH
-    
+        return True
+
+def is_unordered_list(lines):
+    return each_line_starts_with("* ", lines) or each_line_starts_with("- ", lines)
+
 def each_line_starts_with(char, lines):
     return all(line.startswith(char) for line in lines)
 
-def is_ordered_list(lines, i=0):
-    # Return True if all lines are processed successfully
-    if i >= len(lines):
-        return True
-    
-    # Return False if the current line does start with the right number
-    if not lines[i].startswith(f"{i+1}. "):
-        return False
-        
-    # Check the next line
-    return is_ordered_list(lines, i+1)
\ No newline at end of file
+def is_ordered_list(lines):
+    """Return True if each line starts with its number, counting from 1, followed by ". "."""
+    return all(line.startswith(f"{i}. ") for i, line in enumerate(lines, 1))
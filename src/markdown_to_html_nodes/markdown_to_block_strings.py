@@ -1,20 +1,58 @@
-import re
-
 def markdown_to_block_strings(markdown):
     """
     markdown_to_blocks accepts a string of markdown and splits it into block strings, where blocks are separated by an empty line (i.e., by two newline characters).
 
-    Leading and trailing whitespace is stripped and multiple adjacent newlines are treated as one. 
+    Leading and trailing whitespace is stripped and multiple adjacent newlines are treated as one.
     If the string is empty, a ValueError is raised.
+
+    This is a wrapper that returns the blocks of iter_text_block_strings as a list.
+    """
+    return list(iter_text_block_strings(markdown))
+
+def iter_text_block_strings(markdown):
+    """
+    iter_text_block_strings yields the block strings of a string of markdown one at a time, as markdown_to_block_strings returns them. Each block is sliced from the string as it is found, so the string is never copied as a whole.
     """
     if len(markdown) == 0:
         raise ValueError("The markdown string can't be empty")
-    
-    # Strip markdown of trailing and leading whitespace and deduplicate newlines
-    stripped = markdown.strip('\n')
-    stripped = re.sub(r'\n\n+', r'\n\n', stripped)
-
-    # Split on newlines, strip each block, and return the list
-    blocks = stripped.split('\n\n')
-    stripped = map(lambda b: b.strip(), blocks)
-    return list(stripped)
+
+    end = len(markdown)
+    start = skip_newlines(markdown, 0)
+    while (separator := markdown.find("\n\n", start)) != -1:
+        yield markdown[start:separator].strip()
+        start = skip_newlines(markdown, separator)
+        if start == end:
+            return
+    yield markdown[start:].strip()
+
+def skip_newlines(text, start):
+    """skip_newlines returns the index of the first character at or after start that is not a newline."""
+    while start < len(text) and text[start] == "\n":
+        start += 1
+    return start
+
+def iter_block_strings(lines):
+    """
+    iter_block_strings accepts an iterable of lines of markdown, such as an open file, and yields its block strings as each one is completed, splitting them as markdown_to_block_strings does. Only the lines of the current block are held in memory.
+
+    Each line must end with its newline character, as lines read from a file do, except for the last one. If there are no lines at all, a ValueError is raised.
+    """
+    block_lines = []
+    has_lines = False
+    has_blocks = False
+    for line in lines:
+        has_lines = True
+        if line != "\n":
+            block_lines.append(line)
+        elif block_lines:
+            yield "".join(block_lines).strip()
+            block_lines = []
+            has_blocks = True
+
+    if block_lines:
+        yield "".join(block_lines).strip()
+    elif not has_lines:
+        raise ValueError("The markdown string can't be empty")
+    elif not has_blocks:
+        # Markdown made of newlines only is one empty block, as it always was.
+        yield ""
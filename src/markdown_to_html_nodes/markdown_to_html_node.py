@@ -2,26 +2,91 @@ from nodes.textnode import TextNode, TextType
 from nodes.parentnode import ParentNode
 from nodes.leafnode import LeafNode
 from nodes.voidnode import VoidNode
-from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings
+from markdown_to_html_nodes.markdown_to_block_strings import iter_block_strings, iter_text_block_strings
 from markdown_to_html_nodes.block_to_block_type import block_to_block_type, BlockType
 from markdown_to_html_nodes.text_to_textnodes import text_to_textnodes
 from markdown_to_html_nodes.text_to_markup import text_to_html, extract_markdown_images
 
 
-def markdown_to_html_node(markdown, parent_tag="div", parent_props=None):
-    """markdown_to_html_node parses the markdown string into blocks and inline elements, wraps them in the parent node, and returns that node."""
+class DocumentMetadata:
+    """
+    DocumentMetadata records facts about a markdown document as its blocks are parsed by block_strings_to_html_node, so they don't have to be found by splitting the markdown again:
+
+    - title: the text of the first h1, stripped, or None if there is none.
+    - outline: a list of (level, text) tuples, one for each heading in order.
+    - block_counts: a dict mapping each BlockType found to its number of blocks.
+    """
+    __slots__ = ("title", "outline", "block_counts")
+
+    def __init__(self):
+        self.title = None
+        self.outline = []
+        self.block_counts = {}
+
+    def add(self, block_type, text):
+        """add records a block of the given type, with the given text."""
+        self.block_counts[block_type] = self.block_counts.get(block_type, 0) + 1
+        if block_type == BlockType.HEADING:
+            left, right = text.split(" ", maxsplit=1)
+            self.outline.append((len(left), right.strip()))
+            if self.title is None and left == "#":
+                self.title = right.strip()
+
+    def __eq__(self, other):
+        if not isinstance(other, DocumentMetadata):
+            return NotImplemented
+        return (self.title, self.outline, self.block_counts) == (other.title, other.outline, other.block_counts)
+
+    def __repr__(self):
+        return f"DocumentMetadata({self.title!r}, {self.outline!r}, {self.block_counts!r})"
+
+def markdown_to_html_node(markdown, parent_tag="div", parent_props=None, metadata=None, cache=None):
+    """markdown_to_html_node parses the markdown string into blocks and inline elements, wraps them in the parent node, and returns that node. If a DocumentMetadata is given, it is filled in as the blocks are parsed, and if a BlockCache is given, blocks are parsed through it."""
+    return block_strings_to_html_node(iter_text_block_strings(markdown), parent_tag, parent_props, metadata, cache)
+
+def markdown_lines_to_html_node(lines, parent_tag="div", parent_props=None, metadata=None, cache=None):
+    """
+    markdown_lines_to_html_node works like markdown_to_html_node, but reads the markdown from an iterable of lines, such as an open file. Each block is parsed as soon as it is read (see iter_block_strings), so the whole source is never held in memory.
+    """
+    return block_strings_to_html_node(iter_block_strings(lines), parent_tag, parent_props, metadata, cache)
+
+def block_strings_to_html_node(block_strings, parent_tag="div", parent_props=None, metadata=None, cache=None):
+    """
+    block_strings_to_html_node parses each block string as it comes from the iterable, with parse_block, wraps the nodes in the parent node, and returns that node.
+
+    If metadata, a DocumentMetadata, is given, each block is also recorded in it.
+    """
     parent_node = ParentNode(parent_tag, children=[], props=parent_props)
 
-    block_strings = markdown_to_block_strings(markdown)
     for str in block_strings:
-        block_node = block_string_to_html_nodes(str)
+        block_type, block_node = parse_block(str, cache)
+        if metadata is not None:
+            metadata.add(block_type, str)
         parent_node.children.append(block_node)
 
     return parent_node
-        
+
+def parse_block(text, cache=None):
+    """
+    parse_block returns a (block_type, node) tuple for a block string: its BlockType and its HTML node. If a BlockCache is given, the block is taken from it if it's there, and added to it if it isn't.
+    """
+    if cache is not None:
+        cached = cache.get(text)
+        if cached is not None:
+            return cached
+
+    block_type = block_to_block_type(text)
+    block_node = make_block_node(block_type, text)
+    if cache is not None:
+        cache.put(text, block_type, block_node)
+    return block_type, block_node
+
 def block_string_to_html_nodes(text):
     """block_string_to_html_nodes accepts a string of markdown, parses it, and returns a list of the corresponding HTML nodes."""
-    block_type = block_to_block_type(text)
+    return make_block_node(block_to_block_type(text), text)
+
+def make_block_node(block_type, text):
+    """make_block_node returns the HTML node for a block of markdown text whose type, from block_to_block_type, is block_type."""
     match block_type:
         case BlockType.HEADING:   
             return make_heading_node(text)
@@ -30,22 +30,17 @@ def split_nodes_by_delimiter(old_nodes, delimiter, text_type, new_nodes=None):
     ```
 
     Nested delimiters are supported by sequential calls to the function.
-    """
-    result = []
-    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
-        return new_nodes
-    elif new_nodes:
-        result = new_nodes.copy()
-    
-    current_node = old_nodes[0]
 
-    # Add non-text nodes and text nodes with no value to the new list unchanged.
-    if skip_node(current_node):
-        result.append(current_node)
-    else:
-        split_nodes = split_node(current_node, delimiter, text_type)
-        result.extend(split_nodes)
-    return split_nodes_by_delimiter(old_nodes[1:], delimiter, text_type, result)
+    If new_nodes is supplied, the split nodes are appended to a copy of it.
+    """
+    result = list(new_nodes) if new_nodes else []
+    for node in old_nodes:
+        # Add non-text nodes and text nodes with no value to the new list unchanged.
+        if skip_node(node):
+            result.append(node)
+        else:
+            result.extend(split_node(node, delimiter, text_type))
+    return result
     
 
 def split_node(text_node, delimiter, text_type):
@@ -68,45 +63,24 @@ def split_node(text_node, delimiter, text_type):
     ]
     ```
     """
-    if len(text_node.text) == 0:
+    text = text_node.text
+    if len(text) == 0:
         return []
-    
-    open_delimiter = False
-    result_nodes = []
-    curr_node = TextNode("", text_node.text_type)
-
-    i = 0
-    if text_node.text[:len(delimiter)] == delimiter:
-        i += len(delimiter)
-        open_delimiter = True
-        curr_node.text_type = text_type
 
-    while i < len(text_node.text):
-        char = text_node.text[i]
-        # Opening delimiter found
-        if text_node.text[i:i+len(delimiter)] == delimiter and not open_delimiter:
-            # Add the current node to the results if it isn't empty
-            if curr_node.text:
-                result_nodes.append(curr_node)
-            # Initialize the new current node with the new text type
-            curr_node = TextNode("", text_type)
-            i += len(delimiter) - 1
-            open_delimiter = True
-        
-        # Closing delimiter found
-        elif text_node.text[i:i+len(delimiter)] == delimiter:
-            # Add the current node to the results if it isn't empty
-            result_nodes.append(curr_node)
-            # Reset open_delimiter and initialize the new current (normal) node
-            open_delimiter = False
-            curr_node = TextNode("", text_node.text_type)
-            i += len(delimiter) - 1
-        else:
-            curr_node.text += char
-        i += 1
+    # Jump from one delimiter to the next with str.find and emit the slices
+    # in between.
+    size = len(delimiter)
+    result_nodes = []
+    pos = 0
+    while (opening := text.find(delimiter, pos)) != -1:
+        closing = text.find(delimiter, opening + size)
+        if closing == -1:
+            raise Exception(f"Invalid markdown. No closing delimiter found, searching for \"{delimiter}\".")
+        if opening > pos:
+            result_nodes.append(TextNode(text[pos:opening], text_node.text_type))
+        result_nodes.append(TextNode(text[opening + size:closing], text_type))
+        pos = closing + size
 
-    if open_delimiter > 0:
-        raise Exception(f"Invalid markdown. No closing delimiter found, searching for \"{delimiter}\".")
-    if curr_node.text:
-        result_nodes.append(curr_node)
+    if pos < len(text):
+        result_nodes.append(TextNode(text[pos:], text_node.text_type))
     return result_nodes
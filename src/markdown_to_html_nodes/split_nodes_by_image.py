@@ -1,5 +1,5 @@
 from nodes.textnode import TextNode, TextType
-from markdown_to_html_nodes.text_to_markup import extract_markdown_images
+from markdown_to_html_nodes.text_to_markup import image_rx
 
 def split_nodes_by_image(old_nodes, new_nodes=None):
     """
@@ -21,44 +21,23 @@ def split_nodes_by_image(old_nodes, new_nodes=None):
         LeafNode("p", "text")
     ]
     ```
-    """
-    result = []
-    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
-        return new_nodes or []
-    elif new_nodes:
-        result = new_nodes.copy()
-    
-    current_node = old_nodes[0]
-    if not isinstance(current_node, TextNode) or not current_node.text:
-        result.append(current_node)
-    else:
-        current_text = current_node.text
-        images = extract_markdown_images(current_text)
-        if len(images) == 0:
-            result.append(current_node)
-            return split_nodes_by_image(old_nodes[1:], result)
-        for image in images:
-            left, right = split_text_on_image(current_text, image)
-            if left != "":
-                result.append(TextNode(left, TextType.NORMAL))
-            result.append(TextNode(image[0], TextType.IMAGE, url=image[1]))
-            current_text = right
-        if current_text != "":
-            result.append(TextNode(right, TextType.NORMAL))
-    return split_nodes_by_image(old_nodes[1:], result)
-
-def split_text_on_image(text, image):
-    """
-    split_text_on_image splits a string using a markdown image as a delimiter.
-    The maxsplits parameter is set to 1, so there are only two pieces: to the 
-    left of the image and to the right. These are returned in a tuple.
 
-    Parameters
-    
-    - text: a string of markdown
-    - image: a tuple of two strings. The first will be used as the markdown 
-             image's alt text, the second as its URL.
+    If new_nodes is supplied, the split nodes are appended to a copy of it.
     """
-    image_string = f"![{image[0]}]({image[1]})"
-    left, right = text.split(image_string, 1)
-    return (left, right)
\ No newline at end of file
+    result = list(new_nodes) if new_nodes else []
+    for node in old_nodes:
+        if not isinstance(node, TextNode) or not node.text:
+            result.append(node)
+            continue
+        text = node.text
+        pos = 0
+        for match in image_rx.finditer(text):
+            if match.start() > pos:
+                result.append(TextNode(text[pos:match.start()], TextType.NORMAL))
+            result.append(TextNode(match.group(1), TextType.IMAGE, url=match.group(2)))
+            pos = match.end()
+        if pos == 0:
+            result.append(node)
+        elif pos < len(text):
+            result.append(TextNode(text[pos:], TextType.NORMAL))
+    return result
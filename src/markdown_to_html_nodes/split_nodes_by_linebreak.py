@@ -19,25 +19,19 @@ def split_nodes_by_linebreak(old_nodes, new_nodes=None):
         TextNode("a line break", TextType.NORMAL)
     ]
     ```
+
+    Only the first newline of each text node is split. If new_nodes is
+    supplied, the split nodes are appended to a copy of it.
     """
-    result = []
-    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
-        return new_nodes or []
-    elif new_nodes:
-        result = new_nodes.copy()
-    
-    current_node = old_nodes[0]
-    if not isinstance(current_node, TextNode) or not current_node.text:
-        result.append(current_node)
-    else:
-        current_text = current_node.text
-        if not "\n" in current_text:
-            result.append(current_node)
-            return split_nodes_by_linebreak(old_nodes[1:], result)
-        left, right = current_text.split("\n", maxsplit=1)
+    result = list(new_nodes) if new_nodes else []
+    for node in old_nodes:
+        if not isinstance(node, TextNode) or not node.text or "\n" not in node.text:
+            result.append(node)
+            continue
+        left, right = node.text.split("\n", maxsplit=1)
         if left != "":
             result.append(TextNode(left, TextType.NORMAL))
         result.append(TextNode("\n", TextType.LINEBREAK))
         if right != "":
             result.append(TextNode(right, TextType.NORMAL))
-    return split_nodes_by_linebreak(old_nodes[1:], result)
\ No newline at end of file
+    return result
\ No newline at end of file
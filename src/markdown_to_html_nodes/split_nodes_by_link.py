@@ -1,5 +1,5 @@
 from nodes.textnode import TextNode, TextType
-from markdown_to_html_nodes.text_to_markup import extract_markdown_links
+from markdown_to_html_nodes.text_to_markup import link_rx
 
 def split_nodes_by_link(old_nodes, new_nodes=None):
     """
@@ -26,44 +26,23 @@ def split_nodes_by_link(old_nodes, new_nodes=None):
      - The extract_markdown_links function returns tuples with the link text, 
        URL, and the optional title field. split_nodes_by_link ignores the title.
     ```
-    """
-    result = []
-    if len(old_nodes) == 0 or (new_nodes != None and len(new_nodes) == 0):
-        return new_nodes or []
-    elif new_nodes:
-        result = new_nodes.copy()
-    
-    current_node = old_nodes[0]
-    if not isinstance(current_node, TextNode) or not current_node.text:
-        result.append(current_node)
-    else:
-        current_text = current_node.text
-        links = extract_markdown_links(current_text)
-        if len(links) == 0:
-            result.append(current_node)
-            return split_nodes_by_link(old_nodes[1:], result)
-        for link in links:
-            left, right = split_text_on_link(current_text, link)
-            if left != "":
-                result.append(TextNode(left, TextType.NORMAL))
-            result.append(TextNode(link[0], TextType.LINK, url=link[1]))
-            current_text = right
-        if current_text != "":
-            result.append(TextNode(right, TextType.NORMAL))
-    return split_nodes_by_link(old_nodes[1:], result)
-
-def split_text_on_link(text, link):
-    """
-    split_text_on_link splits a string using a markdown link as a delimiter.
-    The maxsplits parameter is set to 1, so there are only two pieces: to the 
-    left of the link and to the right. These are returned in a tuple.
-
-    Parameters
 
-    - text: a string of markdown
-    - link: a tuple of two strings. The first will be used as the link's text, 
-    the second as its URL
+    If new_nodes is supplied, the split nodes are appended to a copy of it.
     """
-    link_string = f"[{link[0]}]({link[1]})"
-    left, right = text.split(link_string, 1)
-    return (left, right)
\ No newline at end of file
+    result = list(new_nodes) if new_nodes else []
+    for node in old_nodes:
+        if not isinstance(node, TextNode) or not node.text:
+            result.append(node)
+            continue
+        text = node.text
+        pos = 0
+        for match in link_rx.finditer(text):
+            if match.start() > pos:
+                result.append(TextNode(text[pos:match.start()], TextType.NORMAL))
+            result.append(TextNode(match.group(1), TextType.LINK, url=match.group(2)))
+            pos = match.end()
+        if pos == 0:
+            result.append(node)
+        elif pos < len(text):
+            result.append(TextNode(text[pos:], TextType.NORMAL))
+    return result
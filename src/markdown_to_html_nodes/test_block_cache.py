@@ -0,0 +1,52 @@
+from test_utils import TestRunner
+from nodes.leafnode import LeafNode
+from nodes.parentnode import ParentNode
+from markdown_to_html_nodes.block_cache import BlockCache
+from markdown_to_html_nodes.block_to_block_type import BlockType
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node, parse_block
+
+class TestBlockCache(TestRunner):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("# Title"))
+        cache.put("# Title", BlockType.HEADING, LeafNode("h1", "Title"))
+        self.assertEqual(cache.get("# Title"), (BlockType.HEADING, LeafNode("h1", "Title")))
+        self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 1))
+
+    def test_least_recently_used_is_dropped(self):
+        cache = BlockCache(maxsize=2)
+        for text in ["a", "b"]:
+            cache.put(text, BlockType.PARAGRAPH, LeafNode("p", text))
+        cache.get("a")
+        cache.put("c", BlockType.PARAGRAPH, LeafNode("p", "c"))
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_cached_nodes_are_copied(self):
+        cache = BlockCache()
+        node = ParentNode("p", [LeafNode(None, "a "), LeafNode("a", "link", {"href": "/a"})])
+        cache.put("p", BlockType.PARAGRAPH, node)
+        node.children.append(LeafNode(None, "!"))
+        hit = cache.get("p")[1]
+        hit.children[1].props["href"] = "/b"
+        self.assertEqual(repr(cache.get("p")[1]), '<p>a <a href="/a">link</a></p>')
+
+    def test_bad_size(self):
+        self.assert_raises_exception(ValueError, "at least one block", BlockCache, 0)
+
+class TestParseBlock(TestRunner):
+    def test_parse_block(self):
+        cache = BlockCache()
+        self.assertEqual(parse_block("* a\n* b", cache), parse_block("* a\n* b"))
+        self.assertEqual(parse_block("* a\n* b", cache), parse_block("* a\n* b"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_markdown_with_cache(self):
+        cache = BlockCache()
+        footer = "Licensed under [MIT](/license)."
+        pages = [f"# Page {i}\n\nText **{i}**\n\n{footer}" for i in range(3)]
+        for markdown in pages:
+            self.assertEqual(markdown_to_html_node(markdown, cache=cache), markdown_to_html_node(markdown))
+        self.assertEqual((cache.hits, cache.misses), (2, 7))
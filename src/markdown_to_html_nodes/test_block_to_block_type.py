@@ -27,6 +27,7 @@ class TestBlockToBlockType(TestRunner):
     ordered_list_cases = [
         ("simple case", "1. first line\n2. second line"),
         ("only one entry", "1. first line"),
+        ("1,000 entries", "\n".join(f"{i}. item" for i in range(1, 1001))),
     ]
 
     unordered_list_cases = [
@@ -45,6 +46,11 @@ class TestBlockToBlockType(TestRunner):
         ("not a list - out of order", "1. foo\n3. bar"),
         ("not a list - mixed bullets", "* foo\n- bar"),
         ("not a list - missing space", "* foo\n*bar"),
+        ("empty block", ""),
+        ("not a list - starts at 2", "2. foo\n3. bar"),
+        ("not a list - 1,000 entries, last out of order", "\n".join(f"{i}. item" for i in range(1, 1000)) + "\n1. item"),
+        ("not a quote - only >", ">"),
+        ("not an image - text after", "![alt](/a.png) caption"),
     ]
 
     def test_cases(self):
@@ -61,6 +67,9 @@ class TestBlockToBlockType(TestRunner):
         run_test(self.unordered_list_cases, BlockType.UNORDERED_LIST)
         run_test(self.paragraph_cases, BlockType.PARAGRAPH)
 
+    def test_image(self):
+        self.assertEqual(block_to_block_type("![alt text](/images/a.png)"), BlockType.IMAGE)
+
 class TestEachLineStartsWith(TestRunner):
     cases = [
         {
@@ -111,6 +120,11 @@ class TestIsOrderedList(TestRunner):
             "lines": ["1. yes", "3. yes", "2. yes"],
             "expected": False
         },                                
+        {
+            "name": "10,000 lines",
+            "lines": [f"{i}. yes" for i in range(1, 10_001)],
+            "expected": True
+        },
         {
             "name": "gap in sequence",
             "lines": ["1. yes", "no", "2. yes"],
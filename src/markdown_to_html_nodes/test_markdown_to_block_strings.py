@@ -1,5 +1,14 @@
+import io, random, re
 from test_utils import TestRunner
-from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings
+from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings, iter_block_strings
+
+def regex_block_strings(markdown):
+    """regex_block_strings is the original markdown_to_block_strings, which copies the whole string at each step. It is the reference for the streaming version."""
+    if len(markdown) == 0:
+        raise ValueError("The markdown string can't be empty")
+    stripped = markdown.strip('\n')
+    stripped = re.sub(r'\n\n+', r'\n\n', stripped)
+    return [block.strip() for block in stripped.split('\n\n')]
 
 class TestMarkdownToBlockStrings(TestRunner):
     simple_cases = [
@@ -43,3 +52,34 @@ class TestMarkdownToBlockStrings(TestRunner):
 
     def test_empty_markdown(self):
         self.assert_raises_exception(ValueError, "The markdown string can't be empty", lambda: markdown_to_block_strings(""))
+
+    def test_matches_regex_version(self):
+        rng = random.Random(19)
+        pieces = ["\n", "\n", "\n\n", "a", "b c", " ", "\t", "\r", "# h\n", "* x\n"]
+        texts = [case["text"] for case in self.simple_cases] + ["\n", "\n\n\n", " ", "a\n\n \n\nb", "\r\n\r\n"]
+        texts += ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 12))) for _ in range(5000)]
+        for text in texts:
+            with self.subTest(repr(text)):
+                expected = regex_block_strings(text)
+                self.assertEqual(markdown_to_block_strings(text), expected)
+                self.assertEqual(list(iter_block_strings(io.StringIO(text, newline="\n"))), expected)
+
+class TestIterBlockStrings(TestRunner):
+    def test_file(self):
+        text = TestMarkdownToBlockStrings.simple_cases[1]["text"]
+        self.assertEqual(list(iter_block_strings(io.StringIO(text))), markdown_to_block_strings(text))
+
+    def test_matches_string_version(self):
+        for text in ["\n", "\n\n\n", " ", "a\n\n \n\nb", "a\r\n\r\nb\n\n", "\n\n# T\n\n\n\np\nq"]:
+            with self.subTest(repr(text)):
+                self.assertEqual(list(iter_block_strings(io.StringIO(text, newline="\n"))), markdown_to_block_strings(text))
+
+    def test_no_lines(self):
+        self.assert_raises_exception(ValueError, "The markdown string can't be empty", list, iter_block_strings([]))
+
+    def test_yields_blocks_as_they_complete(self):
+        def lines():
+            yield "# Title\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        self.assertEqual(next(iter_block_strings(lines())), "# Title")
@@ -2,7 +2,9 @@ from test_utils import TestRunner
 from nodes.leafnode import LeafNode
 from nodes.voidnode import VoidNode
 from nodes.parentnode import ParentNode
-from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node, block_string_to_html_nodes, make_heading_node, make_code_node, make_quote_node, make_list_node
+import io
+from markdown_to_html_nodes.block_to_block_type import BlockType
+from markdown_to_html_nodes.markdown_to_html_node import DocumentMetadata, markdown_to_html_node, markdown_lines_to_html_node, block_string_to_html_nodes, make_heading_node, make_code_node, make_quote_node, make_list_node
 
 class TestMarkdownToHTMLNode(TestRunner):
     cases = [
@@ -71,6 +73,11 @@ class TestMarkdownToHTMLNode(TestRunner):
                 self.assertEqual(repr(actual), repr(expected))
                 self.assertEqual(len(list(actual.children)), len(expected_children))
 
+    def test_lines(self):
+        for case in self.cases:
+            with self.subTest(case["name"]):
+                actual = markdown_lines_to_html_node(io.StringIO(case["text"]))
+                self.assertEqual(actual, markdown_to_html_node(case["text"]))
 
 class TestBlockStringToHTMLNodes(TestRunner):
     cases = [
@@ -209,6 +216,32 @@ class TestBlockStringToHTMLNodes(TestRunner):
                 actual = block_string_to_html_nodes(case["text"])
                 self.assertEqual(actual.tag, case["expected_tag"])
 
+class TestDocumentMetadata(TestRunner):
+    def test_metadata(self):
+        metadata = DocumentMetadata()
+        markdown = TestMarkdownToHTMLNode.cases[1]["text"] + "\n\n# Second h1\n\n###  Deep "
+        markdown_to_html_node(markdown, metadata=metadata)
+        self.assertEqual(metadata.title, "Musings on Unit Testing")
+        self.assertEqual(metadata.outline, [
+            (1, "Musings on Unit Testing"), (2, "Useful tips"), (2, "The kids like it too"),
+            (2, "Random code example"), (2, "Conclusion"), (1, "Second h1"), (3, "Deep"),
+        ])
+        self.assertEqual(metadata.block_counts, {
+            BlockType.HEADING: 7, BlockType.PARAGRAPH: 3, BlockType.ORDERED_LIST: 1,
+            BlockType.UNORDERED_LIST: 1, BlockType.CODE: 1, BlockType.QUOTE: 2,
+        })
+
+        lines_metadata = DocumentMetadata()
+        markdown_lines_to_html_node(io.StringIO(markdown), metadata=lines_metadata)
+        self.assertEqual(lines_metadata, metadata)
+
+    def test_no_title(self):
+        metadata = DocumentMetadata()
+        markdown_lines_to_html_node(io.StringIO("## Sub\n\n![a](/a.png)\n"), metadata=metadata)
+        self.assertIsNone(metadata.title)
+        self.assertEqual(metadata.outline, [(2, "Sub")])
+        self.assertEqual(metadata.block_counts, {BlockType.HEADING: 1, BlockType.IMAGE: 1})
+
 class TestMakeHeadingAndQuoteNodes(TestRunner):
     heading_cases = [
         { 
@@ -119,6 +119,17 @@ class TestSplitNode(TestRunner):
             split_node(node, "*", TextType.BOLD)
         self.assertTrue('Invalid markdown. No closing delimiter found, searching for "*".')
 
+    def test_paragraph_sizes(self):
+        """Paragraphs from 100 B to 1 MB are split in time proportional to their size."""
+        unit = "Some text with a **bold** phrase. "
+        for size in [100, 10_000, 1_000_000]:
+            with self.subTest(size):
+                count = size // len(unit) + 1
+                node = TextNode(unit * count, TextType.NORMAL)
+                actual = self.assert_runs_within(5, split_node, node, "**", TextType.BOLD)
+                self.assertEqual(len(actual), 2 * count + 1)
+                self.assertEqual(actual[1], TextNode("bold", TextType.BOLD))
+
     multiple_delimiters = [
         {
             "name": "three different delimiters",
@@ -242,3 +253,10 @@ class TestSplitNodeByDelimiter(TestRunner):
                 "*",
                 TextType.BOLD)
         self.assertTrue('Invalid markdown. No closing delimiter found, searching for "*".')
+
+    def test_many_nodes(self):
+        """100k nodes used to exceed the recursion limit."""
+        old_nodes = [TextNode("a `code`", TextType.NORMAL)] * 100_000
+        actual = self.assert_runs_within(10, split_nodes_by_delimiter, old_nodes, "`", TextType.CODE)
+        self.assertEqual(len(actual), 200_000)
+        self.assertEqual(actual[-1], TextNode("code", TextType.CODE))
\ No newline at end of file
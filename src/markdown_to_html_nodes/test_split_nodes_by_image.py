@@ -86,4 +86,11 @@ class TestSplitNode(TestRunner):
         for case in self.simple_cases:
             with self.subTest(case["name"]):
                 actual = split_nodes_by_image(case["old_nodes"])
-                self.assertEqual(actual, case["expected"])
\ No newline at end of file
+                self.assertEqual(actual, case["expected"])
+
+    def test_many_nodes(self):
+        """100k nodes used to exceed the recursion limit."""
+        old_nodes = [TextNode("a ![alt](image.png)", TextType.NORMAL)] * 100_000
+        actual = self.assert_runs_within(10, split_nodes_by_image, old_nodes)
+        self.assertEqual(len(actual), 200_000)
+        self.assertEqual(actual[-1], TextNode("alt", TextType.IMAGE, url="image.png"))
\ No newline at end of file
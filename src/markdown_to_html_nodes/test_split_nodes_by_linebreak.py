@@ -0,0 +1,68 @@
+from test_utils import TestRunner
+from markdown_to_html_nodes.split_nodes_by_linebreak import split_nodes_by_linebreak
+from nodes.textnode import TextNode, TextType
+from nodes.leafnode import LeafNode
+
+class TestSplitNodesByLinebreak(TestRunner):
+    simple_cases = [
+        {
+            "name": "simple case",
+            "old_nodes": [
+                LeafNode("p", "text"), TextNode("left\nright", TextType.NORMAL), LeafNode("p", "text")
+            ],
+            "expected": [
+                LeafNode("p", "text"),
+                TextNode("left", TextType.NORMAL),
+                TextNode("\n", TextType.LINEBREAK),
+                TextNode("right", TextType.NORMAL),
+                LeafNode("p", "text")
+            ],
+        },
+        {
+            "name": "only the first newline is split",
+            "old_nodes": [
+                TextNode("one\ntwo\nthree", TextType.NORMAL)
+            ],
+            "expected": [
+                TextNode("one", TextType.NORMAL),
+                TextNode("\n", TextType.LINEBREAK),
+                TextNode("two\nthree", TextType.NORMAL),
+            ],
+        },
+        {
+            "name": "lone newline",
+            "old_nodes": [
+                TextNode("\n", TextType.NORMAL)
+            ],
+            "expected": [
+                TextNode("\n", TextType.LINEBREAK),
+            ],
+        },
+        {
+            "name": "no newline",
+            "old_nodes": [
+                TextNode("no newline", TextType.BOLD)
+            ],
+            "expected": [
+                TextNode("no newline", TextType.BOLD),
+            ],
+        },
+        {
+            "name": "no nodes",
+            "old_nodes": [],
+            "expected": [],
+        }
+    ]
+
+    def test_simple_cases(self):
+        for case in self.simple_cases:
+            with self.subTest(case["name"]):
+                actual = split_nodes_by_linebreak(case["old_nodes"])
+                self.assertEqual(actual, case["expected"])
+
+    def test_many_nodes(self):
+        """100k nodes used to exceed the recursion limit."""
+        old_nodes = [TextNode("a\nb", TextType.NORMAL)] * 100_000
+        actual = self.assert_runs_within(10, split_nodes_by_linebreak, old_nodes)
+        self.assertEqual(len(actual), 300_000)
+        self.assertEqual(actual[-1], TextNode("b", TextType.NORMAL))
@@ -86,4 +86,19 @@ class TestSplitNode(TestRunner):
            for case in self.simple_cases:
             with self.subTest(case["name"]):
                 actual = split_nodes_by_link(case["old_nodes"])
-                self.assertEqual(actual, case["expected"])
\ No newline at end of file
+                self.assertEqual(actual, case["expected"])
+
+    def test_many_nodes(self):
+        """100k nodes used to exceed the recursion limit."""
+        old_nodes = [TextNode("a [link](https://example.com)", TextType.NORMAL)] * 100_000
+        actual = self.assert_runs_within(10, split_nodes_by_link, old_nodes)
+        self.assertEqual(len(actual), 200_000)
+        self.assertEqual(actual[-1], TextNode("link", TextType.LINK, url="https://example.com"))
+
+    def test_title_is_ignored(self):
+        actual = split_nodes_by_link([TextNode('a [link](https://example.com "title") b', TextType.NORMAL)])
+        self.assertEqual(actual, [
+            TextNode("a ", TextType.NORMAL),
+            TextNode("link", TextType.LINK, url="https://example.com"),
+            TextNode(" b", TextType.NORMAL),
+        ])
\ No newline at end of file
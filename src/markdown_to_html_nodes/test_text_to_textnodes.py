@@ -1,6 +1,13 @@
+import os, random
 from test_utils import TestRunner
 from markdown_to_html_nodes.text_to_textnodes import text_to_textnodes
+from markdown_to_html_nodes.markdown_to_block_strings import markdown_to_block_strings
+from markdown_to_html_nodes.text_to_markup import extract_markdown_links
+from markdown_to_html_nodes import test_text_to_markup, test_split_nodes_by_delimiter, test_split_nodes_by_image, test_split_nodes_by_link, test_markdown_to_html_node
 from nodes.textnode import TextNode, TextType
+from benchmarks.reference_passes import text_to_textnodes_by_passes
+
+CONTENT_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "content")
 
 class TestTextToTextNodes(TestRunner):
      simple_cases = [
@@ -54,4 +61,96 @@ class TestTextToTextNodes(TestRunner):
           with self.assertRaises(Exception) as context:
               text_to_textnodes("")
           self.assertTrue('Text must not be empty')
-    
+
+class TestTextToTextNodesMatchesPasses(TestRunner):
+     """Differential tests comparing the single-pass scanner with the original sequence of split_nodes_by_* passes (see text_to_textnodes_by_passes)."""
+     edge_cases = [
+          "***bold italic***",
+          "**bold *not italic* bold**",
+          "*italic **not bold** italic*",
+          "__bold__ and _italic_ and __ __",
+          "****",
+          "**``**`**`",
+          "snake_case_name",
+          "a_b",
+          "*a **b***",
+          "__a **b__ c**",
+          "one\ntwo\nthree",
+          "**bold\nbreak**",
+          "*Here is a [link](https://foo.bar)*",
+          "`![code](image.png)`",
+          "![multi\nline](image.png)",
+          "[link\ntext](https://foo.bar)",
+          "![](empty.png) and [](empty)",
+          "!![a](b)[c](d)",
+          "a![b] [c](d)",
+          "[x](y ![a)b](c)",
+          "![a*b](c) *x*",
+          "**![a*b](c)**",
+     ]
+
+     def corpus(self):
+          texts = [case["text"] for case in TestTextToTextNodes.simple_cases]
+          texts += self.edge_cases
+          for module in [test_split_nodes_by_delimiter, test_split_nodes_by_image, test_split_nodes_by_link, test_text_to_markup, test_markdown_to_html_node]:
+               for value in vars(module).values():
+                    if isinstance(value, type):
+                         for cases in vars(value).values():
+                              if isinstance(cases, list):
+                                   texts += case_texts(cases)
+          for dirpath, _, filenames in os.walk(CONTENT_PATH):
+               for filename in filenames:
+                    with open(os.path.join(dirpath, filename)) as file:
+                         texts += markdown_to_block_strings(file.read())
+          # The passes crash on links with titles, which the scanner ignores
+          # (see test_link_title_is_ignored).
+          return [text for text in texts if text and not has_link_title(text)]
+
+     def fuzz_corpus(self, count=2000):
+          rng = random.Random(1)
+          pieces = ["*a*", "**b**", "_c_", "__d__", "`e`", "*", "**", "_", "`", "\n", " ", "word", "![alt](x.png)", "[link](/y)", "[", "]", "(", ")", "!"]
+          return ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 12))) for _ in range(count)]
+
+     def assert_same_result(self, text):
+          try:
+               expected = text_to_textnodes_by_passes(text)
+          except Exception as e:
+               with self.assertRaises(type(e)) as context:
+                    text_to_textnodes(text)
+               self.assertEqual(str(context.exception), str(e))
+          else:
+               self.assertEqual(text_to_textnodes(text), expected)
+
+     def test_corpus(self):
+          for text in self.corpus():
+               with self.subTest(text):
+                    self.assert_same_result(text)
+
+     def test_fuzz_corpus(self):
+          for text in self.fuzz_corpus():
+               with self.subTest(text):
+                    self.assert_same_result(text)
+
+     def test_link_title_is_ignored(self):
+          actual = text_to_textnodes('See [here](https://foo.bar "Foo") now')
+          self.assertEqual(actual, [
+               TextNode("See ", TextType.NORMAL),
+               TextNode("here", TextType.LINK, url="https://foo.bar"),
+               TextNode(" now", TextType.NORMAL),
+          ])
+
+def has_link_title(text):
+     return any(title for _, _, title in extract_markdown_links(text))
+
+def case_texts(cases):
+     """case_texts collects the markdown strings used by a list of test cases."""
+     texts = []
+     for case in cases:
+          if not isinstance(case, dict):
+               continue
+          if isinstance(case.get("text"), str):
+               texts.append(case["text"])
+          for node in case.get("old_nodes", []) + [case.get("node")]:
+               if isinstance(node, TextNode):
+                    texts.append(node.text)
+     return texts
@@ -4,6 +4,9 @@ from nodes.leafnode import LeafNode
 from nodes.voidnode import VoidNode
 from nodes.textnode import TextType
 
+image_rx = re.compile(r'!\[([^\[\]]*)\]\(([^\(\)]*)\)')
+link_rx = re.compile(r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*?)(?:\s+\"([^\"]*)\")?\)")
+
 def text_to_html(text_node):
     """text_to_html converts TextNode into a LeafNode (child of HTMLNode)."""
     if not isinstance(text_node.text_type, TextType):
@@ -45,9 +48,7 @@ def extract_markdown_images(text):
     # returns [("", "")]
     ```
     """
-    image_regex = r'!\[([^\[\]]*)\]\(([^\(\)]*)\)'
-    matches = re.findall(image_regex, text)
-    return matches
+    return image_rx.findall(text)
 
 
 
@@ -71,6 +72,4 @@ def extract_markdown_links(text):
     # returns [("", "")]
     ```
     """
-    link_regex = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*?)(?:\s+\"([^\"]*)\")?\)"
-    matches = re.findall(link_regex, text)
-    return matches
\ No newline at end of file
+    return link_rx.findall(text)
\ No newline at end of file
@@ -1,8 +1,5 @@
 from nodes.textnode import TextNode, TextType
-from markdown_to_html_nodes.split_nodes_by_delimiter import split_nodes_by_delimiter
-from markdown_to_html_nodes.split_nodes_by_image import split_nodes_by_image
-from markdown_to_html_nodes.split_nodes_by_link import split_nodes_by_link
-from markdown_to_html_nodes.split_nodes_by_linebreak import split_nodes_by_linebreak
+from markdown_to_html_nodes.text_to_markup import image_rx, link_rx
 
 delimiters = [
     ("**", TextType.BOLD),
@@ -16,23 +13,96 @@ def text_to_textnodes(text):
     """
     text_to_textnodes takes a string of markdown text, splits it into separate text nodes (by delimiters, images, links, and line breaks), and returns a new list of text nodes.
 
+    The text is scanned once, from left to right. Each delimited segment is
+    split by images, links and line breaks as soon as it is found, so no
+    intermediate node lists are built. The result is the same as running the
+    original split_nodes_by_* passes one after another (see
+    text_to_textnodes_by_passes in benchmarks.reference_passes).
+
     If the text is empty an exception is raised.
     """
     if len(text) == 0:
         raise Exception("Text nodes must not be empty")
 
-    nodes = [TextNode(text, TextType.NORMAL)]
-    with_delimiters = split_nodes_by_delimiters(nodes, delimiters)
-    with_images = split_nodes_by_image(with_delimiters)
-    with_links = split_nodes_by_link(with_images)
-    with_linebreaks = split_nodes_by_linebreak(with_links)
-
-    return with_linebreaks
-
-def split_nodes_by_delimiters(nodes, delimiters):
-    """Recursively split nodes by all delimiters in the list of delimiter tuples. """
-    if len(delimiters) == 0:
-        return nodes
-    else:
-        split_nodes = split_nodes_by_delimiter(nodes, *delimiters[0])
-        return split_nodes_by_delimiters(split_nodes, delimiters[1:])
\ No newline at end of file
+    nodes = []
+    unclosed = []
+    for start, end, text_type in delimited_spans(text, 0, len(text), 0, unclosed):
+        # Once a delimiter is unclosed the nodes are discarded, but the scan
+        # continues so that the error names the same delimiter as the
+        # sequential passes would.
+        if not unclosed:
+            split_span_by_images(text[start:end], text_type, nodes)
+
+    if unclosed:
+        delimiter = delimiters[min(unclosed)][0]
+        raise Exception(f"Invalid markdown. No closing delimiter found, searching for \"{delimiter}\".")
+    return nodes
+
+def delimited_spans(text, start, end, level, unclosed):
+    """
+    delimited_spans yields (start, end, text_type) tuples covering text[start:end], using the delimiter at the given level of the delimiters list. Segments between pairs of delimiters are split by the next level, so that earlier delimiters take precedence, as they would with sequential passes.
+
+    Empty pairs of delimiters are yielded, empty normal segments are not. If a
+    delimiter is unclosed, its level is appended to unclosed and the rest of
+    the span is skipped.
+    """
+    if level == len(delimiters):
+        yield start, end, TextType.NORMAL
+        return
+
+    delimiter, text_type = delimiters[level]
+    size = len(delimiter)
+    pos = start
+    while (opening := text.find(delimiter, pos, end)) != -1:
+        closing = text.find(delimiter, opening + size, end)
+        if closing == -1:
+            unclosed.append(level)
+            return
+        if opening > pos:
+            yield from delimited_spans(text, pos, opening, level + 1, unclosed)
+        yield opening + size, closing, text_type
+        pos = closing + size
+    if pos < end:
+        yield from delimited_spans(text, pos, end, level + 1, unclosed)
+
+def split_span_by_images(text, text_type, nodes):
+    """
+    split_span_by_images appends the nodes for one delimited segment to nodes. Like split_nodes_by_image, a segment containing images loses its text type: the text around the images becomes normal text.
+    """
+    pos = 0
+    if "](" in text:
+        for match in image_rx.finditer(text):
+            if match.start() > pos:
+                split_span_by_links(text[pos:match.start()], TextType.NORMAL, nodes)
+            split_span_by_linebreak(match.group(1), TextType.IMAGE, match.group(2), nodes)
+            pos = match.end()
+    if pos == 0:
+        split_span_by_links(text, text_type, nodes)
+    elif pos < len(text):
+        split_span_by_links(text[pos:], TextType.NORMAL, nodes)
+
+def split_span_by_links(text, text_type, nodes):
+    """split_span_by_links works like split_span_by_images, but for links. Link titles are ignored."""
+    pos = 0
+    if "](" in text:
+        for match in link_rx.finditer(text):
+            if match.start() > pos:
+                split_span_by_linebreak(text[pos:match.start()], TextType.NORMAL, None, nodes)
+            split_span_by_linebreak(match.group(1), TextType.LINK, match.group(2), nodes)
+            pos = match.end()
+    if pos == 0:
+        split_span_by_linebreak(text, text_type, None, nodes)
+    elif pos < len(text):
+        split_span_by_linebreak(text[pos:], TextType.NORMAL, None, nodes)
+
+def split_span_by_linebreak(text, text_type, url, nodes):
+    """Like split_nodes_by_linebreak, only the first newline of the text is replaced by a LINEBREAK node."""
+    left, newline, right = text.partition("\n")
+    if not newline:
+        nodes.append(TextNode(text, text_type, url))
+        return
+    if left != "":
+        nodes.append(TextNode(left, TextType.NORMAL))
+    nodes.append(TextNode("\n", TextType.LINEBREAK))
+    if right != "":
+        nodes.append(TextNode(right, TextType.NORMAL))
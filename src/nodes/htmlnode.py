@@ -1,3 +1,5 @@
+from nodes.walk import walk
+
 class HTMLNode:
     """
     HTMLNode is the base class of representation of an HTML node. It is mostly
@@ -6,8 +8,13 @@ class HTMLNode:
     ParentNode - a node that has children
     LeafNode - a node that doesn't have children
     VoidNode - a self-closing LeafNode
+
+    Nodes use __slots__ instead of a per-instance __dict__, because a build can
+    hold millions of them. Subclasses must declare __slots__ too.
     """
+    __slots__ = ("tag", "value", "children", "props")
     _self_closing_tags = ["area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param", "source", "track", "wbr"]
+    _url_props = ["href", "src"]
 
     def __init__(self, tag=None, value=None, children=None, props=None):
         if tag in self._self_closing_tags and not self.is_void():
@@ -19,6 +26,28 @@ class HTMLNode:
         self.children = children
         self.props = props        
 
+    def copy(self):
+        """
+        copy returns a deep copy of the node: each node in the tree and each props dict are copied, while tags and values, which are strings, are shared. The copy is made with an explicit stack, so trees can be nested to any depth.
+        """
+        root = self._copy_node()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if isinstance(node.children, list):
+                node.children = [child._copy_node() if isinstance(child, HTMLNode) else child for child in node.children]
+                stack.extend(child for child in node.children if isinstance(child, HTMLNode))
+        return root
+
+    def _copy_node(self):
+        """_copy_node returns a copy of the node alone, sharing its children list. __init__ is skipped, as the node was already checked."""
+        node = object.__new__(type(self))
+        node.tag = self.tag
+        node.value = self.value
+        node.children = self.children
+        node.props = self.props.copy() if self.props is not None else None
+        return node
+
     def is_void(self):
         """is_void is only implemented by VoidNode."""
         pass
@@ -26,19 +55,24 @@ class HTMLNode:
     def to_html(self):
         raise Exception(NotImplementedError)
     
-    def props_to_html(self):
+    def props_to_html(self, resolve_url=None):
+        """
+        props_to_html returns the props as HTML attributes. If resolve_url is given, it is called with the value of each href and src prop and its result is used instead.
+        """
         if not self.props:
             return ""
         result = ""
         for name, val in self.props.items():
+            if resolve_url and name in self._url_props:
+                val = resolve_url(val)
             result += f' {name}="{val}"'
         return result
     
-    def _get_opening_tag(self):
+    def _get_opening_tag(self, resolve_url=None):
         if not self.tag:
             return self.value
         else:
-            return f"<{self.tag}{self.props_to_html()}>"
+            return f"<{self.tag}{self.props_to_html(resolve_url)}>"
     
     def _get_value(self, indent=None):
         if not self.value:
@@ -50,23 +84,62 @@ class HTMLNode:
     def _get_closing_tag(self):
         return f"</{self.tag}>"
 
-    def _get_children(self):
-        if not self.children:
-            return ""
-        result = ""
-        for child in self.children:
-            result += repr(child)
-        return result
+    def _write_start(self, write, resolve_url=None):
+        """_write_start writes everything that comes before the node's children."""
+        write(self._get_opening_tag(resolve_url))
+        value = self._get_value()
+        if value:
+            write(value)
+
+    def _write_end(self, write):
+        """_write_end writes everything that comes after the node's children."""
+        write(self._get_closing_tag())
+
+    def render_to(self, write, self_closing=False, resolve_url=None):
+        """
+        render_to passes the node's HTML to write in chunks, for example a file's write method or a list's append method. Joined together, the chunks are equal to repr(node).
+
+        If resolve_url is given, href and src props are passed through it as
+        they are rendered (see props_to_html).
+
+        The tree is traversed with walk, so it can be nested to any depth.
+        """
+        for node, entering in walk(self):
+            if entering:
+                node._write_start(write, resolve_url)
+            elif node is not self or not self_closing:
+                node._write_end(write)
 
     def __repr__(self, self_closing=False):
-        result = self._get_opening_tag()
-        result += self._get_value()
-        result += self._get_children()
-        if not self_closing:
-            result += self._get_closing_tag()
-        return result
+        chunks = []
+        self.render_to(chunks.append, self_closing=self_closing)
+        return "".join(chunks)
 
     def __eq__(self, other):
+        """
+        Nodes are equal if their tags, values, props and children are equal. Children are compared with an explicit stack instead of recursion, so trees can be nested to any depth.
+        """
         if not isinstance(other, HTMLNode):
             return False
-        return (self.tag == other.tag and self.value == other.value and self.props == other.props and self.children == other.children)
\ No newline at end of file
+        stack = [(self, other)]
+        while stack:
+            node, other_node = stack.pop()
+            if not (node.tag == other_node.tag and node.value == other_node.value and node.props == other_node.props):
+                return False
+            children, other_children = node.children, other_node.children
+            if not (isinstance(children, list) and isinstance(other_children, list)):
+                if children != other_children:
+                    return False
+                continue
+            if len(children) != len(other_children):
+                return False
+            for child, other_child in zip(children, other_children):
+                if child is other_child:
+                    continue
+                # Pairs of the same node type are compared here. Anything else
+                # goes through ==, so the type checks of the subclasses apply.
+                if type(child) is type(other_child) and isinstance(child, HTMLNode):
+                    stack.append((child, other_child))
+                elif child != other_child:
+                    return False
+        return True
\ No newline at end of file
@@ -12,6 +12,8 @@ class LeafNode(HTMLNode):
      - value is required but can be None.
      - tag is required but can be None.
     """
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, props=props)
 
@@ -36,6 +38,16 @@ class LeafNode(HTMLNode):
             return self.to_html()
         return super().__str__(left_justify)
     
+    def _write_start(self, write, resolve_url=None):
+        if not self.tag:
+            write(self.to_html())
+        else:
+            super()._write_start(write, resolve_url)
+
+    def _write_end(self, write):
+        if self.tag:
+            super()._write_end(write)
+
     def __repr__(self, self_closing=False):
         if not self.tag:
             return self.to_html()
@@ -16,6 +16,8 @@ class ParentNode(HTMLNode):
 
     (3) Non-self-closing tags also can have neither. For example: <div></div>.
     """
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, children=children, props=props)
 
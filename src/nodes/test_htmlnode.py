@@ -1,6 +1,9 @@
 import random
 from test_utils import TestRunner
 from nodes.htmlnode import HTMLNode
+from nodes.leafnode import LeafNode
+from nodes.parentnode import ParentNode
+from nodes.voidnode import VoidNode
 
 class TestHTMLNode(TestRunner):
     def setUp(self):
@@ -94,6 +97,17 @@ class TestHTMLNode(TestRunner):
                 node = HTMLNode(**case["node_params"])
                 self.assertEqual(node.props_to_html(), case["expected"])
 
+    def test_props_to_html_resolve_url(self):
+        node = HTMLNode("a", "link", props={"href": "/about", "class": "/not-a-url"})
+        resolve_url = lambda url: "/repo" + url
+        self.assertEqual(node.props_to_html(resolve_url), ' href="/repo/about" class="/not-a-url"')
+
+    def test_render_to_resolve_url(self):
+        node = ParentNode("p", [LeafNode("a", "link", props={"href": "/about"}), VoidNode("img", props={"src": "/a.png", "alt": "/alt"})])
+        chunks = []
+        node.render_to(chunks.append, resolve_url=lambda url: "/repo" + url)
+        self.assertEqual("".join(chunks), '<p><a href="/repo/about">link</a><img src="/repo/a.png" alt="/alt"></p>')
+
     def test_get_opening_tag(self):
         for case in self.opening_tag_cases:
             with self.subTest(case["name"]):
@@ -111,4 +125,37 @@ class TestHTMLNode(TestRunner):
         for case in self.repr_cases:
             with self.subTest(case["name"]):
                 node = case["setup"](self)
-                self.assertEqual(repr(node), case["expected_repr"])
\ No newline at end of file
+                self.assertEqual(repr(node), case["expected_repr"])
+
+    def test_nodes_have_no_instance_dict(self):
+        nodes = [
+            HTMLNode("p", "text"),
+            LeafNode("p", "text"),
+            ParentNode("div", [LeafNode("p", "text")]),
+            VoidNode("br"),
+        ]
+        for node in nodes:
+            with self.subTest(type(node).__name__):
+                self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_copy(self):
+        tree = ParentNode("div", [
+            LeafNode("p", "text"),
+            ParentNode("p", [LeafNode(None, "a "), LeafNode("a", "link", {"href": "/a"})]),
+            VoidNode("img", {"src": "/a.png", "alt": ""}),
+        ], {"class": "page"})
+        copy = tree.copy()
+        self.assertEqual(copy, tree)
+        self.assertEqual([type(child) for child in copy.children], [LeafNode, ParentNode, VoidNode])
+
+        copy.props["class"] = "changed"
+        copy.children[1].children.append(LeafNode(None, "!"))
+        copy.children[1].children[1].props["href"] = "/b"
+        copy.children[2].tag = "video"
+        self.assertEqual(repr(tree), '<div class="page"><p>text</p><p>a <a href="/a">link</a></p><img src="/a.png" alt=""></div>')
+
+    def test_copy_deep_tree(self):
+        tree = LeafNode("b", "deep")
+        for _ in range(10_000):
+            tree = ParentNode("i", [tree])
+        self.assertEqual(tree.copy(), tree)
@@ -162,9 +162,38 @@ class TestParentNode(TestRunner):
                 node = case["setup"](self)
                 self.assertEqual(node.to_html(), case["expected"])
 
+    def test_render_to(self):
+        """render_to writes the same HTML as to_html, in chunks"""
+        for case in self.html_rendering_cases:
+            with self.subTest(case["name"]):
+                node = case["setup"](self)
+                chunks = []
+                node.render_to(chunks.append)
+                self.assertGreater(len(chunks), 1)
+                self.assertEqual("".join(chunks), case["expected"])
+
     def test_eq(self):
          for case in self.not_equal_cases:
             with self.subTest(case["name"]):
                 node = self.equal_cases[0]["make_node"](self)
                 other = case["make_other"](self)
                 self.assertNotEqual(node, other)
+
+    def make_deep_tree(self, depth, leaf_text="Leaf"):
+        node = LeafNode("p", leaf_text)
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        return node
+
+    def test_deep_tree_to_html(self):
+        """Rendering doesn't recurse, so it isn't limited by the recursion limit"""
+        depth = 100_000
+        html = self.make_deep_tree(depth).to_html()
+        self.assertEqual(html, "<div>" * depth + "<p>Leaf</p>" + "</div>" * depth)
+
+    def test_deep_tree_eq(self):
+        depth = 100_000
+        node = self.make_deep_tree(depth)
+        self.assertEqual(node, self.make_deep_tree(depth))
+        self.assertNotEqual(node, self.make_deep_tree(depth, leaf_text="Other"))
+        self.assertNotEqual(node, self.make_deep_tree(depth - 1))
@@ -32,5 +32,8 @@ class TestTextNode(TestRunner):
         self.assertEqual(repr(node), "TextNode(Test, bold, None)")
         self.assertEqual(repr(node2), "TextNode(Test, bold, http://fake.png)")
 
+    def test_no_instance_dict(self):
+        self.assertFalse(hasattr(TextNode("Test", TextType.BOLD), "__dict__"))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,31 @@
+from test_utils import TestRunner
+from nodes.walk import walk
+from nodes.parentnode import ParentNode
+from nodes.leafnode import LeafNode
+from nodes.voidnode import VoidNode
+
+class TestWalk(TestRunner):
+    def test_order(self):
+        leaf_1 = LeafNode("b", "1")
+        void = VoidNode("br")
+        inner = ParentNode("p", [leaf_1, void])
+        leaf_2 = LeafNode("i", "2")
+        root = ParentNode("div", [inner, leaf_2])
+        expected = [
+            (root, True), (inner, True), (leaf_1, True), (leaf_1, False),
+            (void, True), (void, False), (inner, False), (leaf_2, True),
+            (leaf_2, False), (root, False),
+        ]
+        actual = list(walk(root))
+        self.assertEqual(len(actual), len(expected))
+        for (node, entering), (expected_node, expected_entering) in zip(actual, expected):
+            self.assertIs(node, expected_node)
+            self.assertEqual(entering, expected_entering)
+
+    def test_deep_tree(self):
+        depth = 100_000
+        node = LeafNode("p", "Leaf")
+        for _ in range(depth):
+            node = ParentNode("div", [node])
+        entering = [entering for _, entering in walk(node)]
+        self.assertEqual(entering, [True] * (depth + 1) + [False] * (depth + 1))
@@ -19,7 +19,11 @@ class TextNode:
 
     To convert a TextNode to a LeafNode (child of HTMLNode), use text_to_html,
     found in text_to_markup.py.
+
+    TextNode uses __slots__ to avoid a per-instance __dict__.
     """
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url = None):
         self.text = text
         self.text_type = text_type
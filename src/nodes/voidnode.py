@@ -6,6 +6,8 @@ class VoidNode(LeafNode):
 
     The tag parameter is required and can't be None and props are optional.
     """
+    __slots__ = ()
+
     def __init__(self, tag, props=None):
         if not tag:
             raise TypeError("A VoidNode must have a tag.")
@@ -17,5 +19,9 @@ class VoidNode(LeafNode):
     def is_void(self):
         return True
 
+    def _write_end(self, write):
+        """Void elements have no closing tag."""
+        pass
+
     def __repr__(self):
         return super().__repr__(self_closing=self.is_void())
\ No newline at end of file
@@ -0,0 +1,17 @@
+def walk(root):
+    """
+    walk yields (node, entering) tuples for a depth-first traversal of the tree rooted at root. Each node is yielded with entering=True before its children and with entering=False after them.
+
+    The traversal uses an explicit stack instead of recursion, so it works for
+    trees of any depth. Nodes without a children attribute, or with no
+    children, are treated as leaves.
+    """
+    stack = [(root, True)]
+    while stack:
+        node, entering = stack.pop()
+        yield node, entering
+        if entering:
+            stack.append((node, False))
+            children = getattr(node, "children", None)
+            if children:
+                stack.extend((child, True) for child in reversed(children))
@@ -0,0 +1,20 @@
+def update_basepath(base_path, html_doc):
+    """If base_path is not '/', all href and src attributes in the document will be updated to start with the supplied base path."""
+    if base_path != "/":
+        return html_doc.replace('href="/', f'href="{base_path}')\
+                    .replace('src="/', f'src="{base_path}')
+    else:
+        return html_doc
+
+def basepath_resolver(base_path):
+    """
+    basepath_resolver returns a resolve_url function for HTMLNode.render_to that makes root-relative URLs (those starting with '/') start with base_path instead. If base_path is '/', None is returned, since nothing needs to change.
+    """
+    if base_path == "/":
+        return None
+
+    def resolve_url(url):
+        if isinstance(url, str) and url.startswith("/"):
+            return base_path + url[1:]
+        return url
+    return resolve_url
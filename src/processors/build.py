@@ -0,0 +1,78 @@
+import os
+from processors.copy_tree import copy_file
+from processors.generate_page import find_pages, page_renderer
+from processors.walk_tree import walk_tree
+
+class MemorySink:
+    """
+    MemorySink collects the output of build_site in memory. Its files dict maps each output path, relative to the root of the site and with "/" separators, to the file's contents as bytes.
+    """
+    def __init__(self):
+        self.files = {}
+
+    def write(self, path, data):
+        """write stores data, a bytes object, as the file at path."""
+        self.files[path] = data
+
+    def copy(self, path, src_path):
+        """copy stores the contents of the file at src_path as the file at path."""
+        with open(src_path, 'rb') as f:
+            self.files[path] = f.read()
+
+class DirectorySink:
+    """
+    DirectorySink writes the output of build_site to the directory dirpath, creating it if needed. Static files are copied with copy_file, using the given strategy.
+    """
+    def __init__(self, dirpath, strategy="copy"):
+        self.dirpath = dirpath
+        self.strategy = strategy
+
+    def _dest_path(self, path):
+        dest_path = os.path.join(self.dirpath, *path.split("/"))
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        return dest_path
+
+    def write(self, path, data):
+        """write writes data, a bytes object, to the file at path in the directory. An existing file there is replaced, never written through, since copy may have linked it to a static file."""
+        dest_path = self._dest_path(path)
+        try:
+            os.unlink(dest_path)
+        except FileNotFoundError:
+            pass
+        with open(dest_path, 'wb') as f:
+            f.write(data)
+
+    def copy(self, path, src_path):
+        """copy copies the file at src_path to path in the directory."""
+        copy_file(src_path, self._dest_path(path), strategy=self.strategy)
+
+def build_site(content_dirpath, static_dirpath, template_path, sink=None, tag="article", base_path="/"):
+    """
+    build_site builds the site from the same inputs as main.py, writing nothing except through the sink: the files from static_dirpath and a page for each markdown file in content_dirpath are passed to the sink (see MemorySink and DirectorySink). Output paths are relative to the root of the site and use "/" separators.
+
+    If no sink is given, a MemorySink is used and its files dict, mapping each output path to bytes, is returned. Otherwise the sink is returned.
+
+    As in main.py, static files are written first, so pages take precedence over static files with the same path. Every page is built even if some fail, and then a RuntimeError is raised with the errors.
+    """
+    if sink is None:
+        return build_site(content_dirpath, static_dirpath, template_path, MemorySink(), tag, base_path).files
+
+    if os.path.isdir(static_dirpath):
+        for item in walk_tree(static_dirpath, "", follow_symlinks=False):
+            if not item.is_dir:
+                sink.copy(item.rel_path.replace(os.sep, "/"), item.src_path)
+
+    pages = find_pages(content_dirpath, "", tag)
+    errors = []
+    for src_path, dest_path, page_tag in pages:
+        try:
+            chunks = []
+            page_renderer(src_path, template_path, page_tag, base_path)(chunks.append)
+        except Exception as e:
+            errors.append(f"Failed to generate page from {src_path}: {type(e).__name__}: {e}")
+            continue
+        sink.write(dest_path.replace(os.sep, "/"), "".join(chunks).encode())
+
+    if errors:
+        raise RuntimeError("\n".join([f"{len(errors)} of {len(pages)} pages failed to generate."] + errors))
+    return sink
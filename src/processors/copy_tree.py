@@ -1,8 +1,165 @@
-import os, shutil, sys
+import errno, os, shutil, sys, time
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+from processors.manifest import file_hash, load_manifest, save_manifest
+from processors.walk_tree import walk_tree
 
-def copy_tree(src, dest, dest_must_exist=False, clear_dest_tree=False, dest_must_be_empty=False, create_full_dest_path=True):
+# Errors that mean a kernel copy function can't be used for this pair of
+# files, as opposed to the copy itself failing.
+KERNEL_COPY_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+# Errors that mean a file can't be linked or cloned to this destination, for
+# example because it is on another filesystem, so the next strategy is tried.
+LINK_UNSUPPORTED = KERNEL_COPY_UNSUPPORTED | {errno.EPERM, errno.EMLINK, errno.ENOTTY}
+
+# The FICLONE ioctl (linux/fs.h) makes dest share src's data blocks on
+# filesystems that support it, such as Btrfs and XFS.
+FICLONE = 0x40049409
+
+# Each copy strategy, followed by the strategies it falls back to.
+COPY_STRATEGIES = {
+    "copy": ["copy"],
+    "reflink": ["reflink", "copy"],
+    "hardlink": ["hardlink", "reflink", "copy"],
+    "symlink": ["symlink", "copy"],
+}
+
+class CopyStats:
+    """CopyStats records how many files and bytes a copy wrote and how long it took."""
+    __slots__ = ("files", "size", "seconds")
+
+    def __init__(self, files=0, size=0, seconds=0.0):
+        self.files = files
+        self.size = size
+        self.seconds = seconds
+
+    def files_per_second(self):
+        return self.files / self.seconds if self.seconds else 0.0
+
+    def megabytes_per_second(self):
+        return self.size / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return f"CopyStats({self.files}, {self.size}, {self.seconds})"
+
+    def __str__(self):
+        return (f"{self.files} files, {self.size / 1e6:.2f} MB in {self.seconds:.3f} s "
+                f"({self.files_per_second():.0f} files/s, {self.megabytes_per_second():.1f} MB/s)")
+
+def kernel_copy(src_fd, dest_fd, size):
+    """
+    kernel_copy copies size bytes from src_fd to dest_fd without passing them through Python, using os.copy_file_range (which lets the filesystem share or clone the data) or else os.sendfile. It returns the number of bytes copied, or None if neither function is available for these files.
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            offset = 0
+            while offset < size:
+                n = os.copy_file_range(src_fd, dest_fd, size - offset, offset, offset)
+                if n == 0:
+                    break
+                offset += n
+            return offset
+        except OSError as e:
+            if e.errno not in KERNEL_COPY_UNSUPPORTED or offset != 0:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            offset = 0
+            while offset < size:
+                n = os.sendfile(dest_fd, src_fd, offset, size - offset)
+                if n == 0:
+                    break
+                offset += n
+            return offset
+        except OSError as e:
+            if e.errno not in KERNEL_COPY_UNSUPPORTED or offset != 0:
+                raise
+    return None
+
+def copy_file(src_path, dest_path, preserve_mtime=False, strategy="copy"):
+    """
+    copy_file makes dest_path a copy of src_path and returns the size of the file. Any existing file at dest_path is replaced, never written through. With preserve_mtime=True, dest_path gets the access and modification times of src_path.
+
+    The strategy is one of:
+
+    - copy: the contents are copied (see write_copy)
+    - reflink: dest_path is a copy-on-write clone sharing src_path's data
+    - hardlink: dest_path is a hard link to src_path, so it shares its mtime and permissions
+    - symlink: dest_path is a symbolic link to the absolute path of src_path
+
+    If the strategy isn't supported for these paths, for example because dest_path is on another filesystem, copy_file falls back to the next strategy in COPY_STRATEGIES. A ValueError is raised for an unknown strategy.
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(f"Unknown copy strategy: {strategy}")
+    try:
+        os.unlink(dest_path)
+    except FileNotFoundError:
+        pass
+
+    for fallback in COPY_STRATEGIES[strategy]:
+        try:
+            if fallback == "hardlink":
+                os.link(src_path, dest_path)
+                return os.stat(dest_path).st_size
+            if fallback == "symlink":
+                os.symlink(os.path.abspath(src_path), dest_path)
+                return os.stat(dest_path).st_size
+            if fallback == "reflink":
+                return write_reflink(src_path, dest_path, preserve_mtime)
+            return write_copy(src_path, dest_path, preserve_mtime)
+        except OSError as e:
+            if fallback == "copy" or e.errno not in LINK_UNSUPPORTED:
+                raise
+
+def write_reflink(src_path, dest_path, preserve_mtime=False):
+    """
+    write_reflink clones src_path to dest_path with the FICLONE ioctl and returns the size of the file. An OSError with errno EOPNOTSUPP is raised where the ioctl isn't available, and the filesystem's error where it isn't supported.
     """
-    Recursively copy an entire directory tree rooted at src to a directory named dst and return the destination directory. This is my somewhat different partial implementation of shutil.copytree.
+    if fcntl is None or not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "Reflinks are not supported on this platform")
+    with open(src_path, "rb") as src_file, open(dest_path, "wb") as dest_file:
+        stat = os.fstat(src_file.fileno())
+        fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+    if preserve_mtime:
+        os.utime(dest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return stat.st_size
+
+def write_copy(src_path, dest_path, preserve_mtime=False):
+    """
+    write_copy copies the contents of src_path to dest_path and returns the number of bytes copied. The copy is done by the kernel where possible (see kernel_copy), falling back to shutil.copyfileobj. Permission bits are not copied.
+    """
+    with open(src_path, "rb") as src_file, open(dest_path, "wb") as dest_file:
+        stat = os.fstat(src_file.fileno())
+        size = kernel_copy(src_file.fileno(), dest_file.fileno(), stat.st_size)
+        if size is None:
+            shutil.copyfileobj(src_file, dest_file)
+            size = dest_file.tell()
+    if preserve_mtime:
+        os.utime(dest_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    return size
+
+def copy_files(pairs, workers=None, preserve_mtime=False, strategy="copy"):
+    """
+    copy_files copies each (src_path, dest_path) pair with copy_file using the given strategy, and returns a CopyStats. The copies run on a pool of workers threads (default: ThreadPoolExecutor's default width), or in the calling thread if workers is 1. The destination directories must already exist.
+    """
+    start = time.perf_counter()
+    copy = lambda pair: copy_file(*pair, preserve_mtime=preserve_mtime, strategy=strategy)
+    if workers == 1 or len(pairs) <= 1:
+        sizes = map(copy, pairs)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            sizes = list(executor.map(copy, pairs))
+    size = sum(sizes)
+    return CopyStats(len(pairs), size, time.perf_counter() - start)
+
+def copy_tree(src, dest, dest_must_exist=False, clear_dest_tree=False, dest_must_be_empty=False, create_full_dest_path=True, workers=None, strategy="copy"):
+    """
+    Recursively copy an entire directory tree rooted at src to a directory named dst and return a CopyStats for the files copied. This is my somewhat different partial implementation of shutil.copytree.
+
+    The directories are created first, then the files are copied in parallel by copy_files, using up to workers threads. Unlike shutil.copy, permission bits are not copied. Files can also be linked instead of copied, see copy_file for the strategies.
 
     Behavior can be configured with flags:
 
@@ -10,6 +167,8 @@ def copy_tree(src, dest, dest_must_exist=False, clear_dest_tree=False, dest_must
     - clear_dest_tree: if True, the destination's existing tree is cleared before copying (default: False)
     - dest_must_be_empty: if True, the destination directory must be empty if it exists (default: False)
     - create_full_dest_path: if True, missing parent directories in the destination path will be created (default: True)
+    - workers: the number of copy threads (default: ThreadPoolExecutor's default)
+    - strategy: "copy", "reflink", "hardlink" or "symlink" (default: "copy")
 
     OSErrors are raised if:
 
@@ -20,6 +179,9 @@ def copy_tree(src, dest, dest_must_exist=False, clear_dest_tree=False, dest_must
 
     Symlinks are not supported and will be ignored.
     """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(f"Unknown copy strategy: {strategy}")
+
     def make_directory(dirpath, create_full_path):
         try:
             if create_full_path:
@@ -64,16 +226,75 @@ def copy_tree(src, dest, dest_must_exist=False, clear_dest_tree=False, dest_must
         shutil.rmtree(dest)
         make_directory(dest, create_full_path=create_full_dest_path)
 
-    for f in source_tree:
-        src_filepath = os.path.join(src, f)
-        dest_filepath = os.path.join(dest, f)
-        if os.path.isfile(src_filepath):
-            shutil.copy(src_filepath, dest)
-        elif os.path.isdir(src_filepath):
-            if not os.path.exists(dest_filepath):
-                os.mkdir(dest_filepath)
-            copy_tree(src_filepath, 
-                      dest_filepath,
-                      clear_dest_tree=False, 
-                      dest_must_be_empty=False, 
-                      create_full_dest_path=False)
\ No newline at end of file
+    pairs = []
+    for item in walk_tree(src, dest, allow_empty=False):
+        if not item.is_dir:
+            pairs.append((item.src_path, item.dest_path))
+            continue
+        try:
+            os.mkdir(item.dest_path)
+        except FileExistsError:
+            if not os.path.isdir(item.dest_path):
+                raise OSError(f"Destination path must be a directory.")
+    return copy_files(pairs, workers, strategy=strategy)
+
+def files_match(src_path, dest_path, checksum=False):
+    """
+    files_match returns True if dest_path exists and has the same size and mtime as src_path. With checksum=True, the files' contents are compared by hash instead of their mtimes.
+    """
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src_path)
+    if src_stat.st_size != dest_stat.st_size:
+        return False
+    if checksum:
+        return file_hash(src_path) == file_hash(dest_path)
+    return src_stat.st_mtime_ns == dest_stat.st_mtime_ns
+
+def sync_tree(src, dest, manifest_path=None, checksum=False, workers=None, strategy="copy"):
+    """
+    sync_tree is a non-destructive alternative to copy_tree(clear_dest_tree=True). It makes the files from the tree rooted at src present and up to date in dest, and returns a CopyStats for the files it copied.
+
+    - Files are copied with their mtimes, and only if they don't match the file already in dest (see files_match). The copies run on up to workers threads and use the given strategy (see copy_files and copy_file).
+    - Files that only exist in dest, such as generated pages, are left alone.
+    - If manifest_path is given, it records which files came from src. Files from an earlier sync whose source has since been deleted are removed from dest.
+
+    As with copy_tree, an OSError is raised if src doesn't exist, isn't a directory or is empty. Symlinks are ignored.
+    """
+    if strategy not in COPY_STRATEGIES:
+        raise ValueError(f"Unknown copy strategy: {strategy}")
+    if not os.path.isdir(src):
+        raise OSError(f"Source path must exist and be a directory.")
+    if len(os.listdir(src)) == 0:
+        raise OSError(f"Source path must not be empty.")
+    if os.path.exists(dest) and not os.path.isdir(dest):
+        raise OSError(f"Destination path must be a directory.")
+
+    pairs = []
+    entries = {}
+    os.makedirs(dest, exist_ok=True)
+    for item in walk_tree(src, dest, follow_symlinks=False):
+        if item.is_dir:
+            os.makedirs(item.dest_path, exist_ok=True)
+            continue
+        if not files_match(item.src_path, item.dest_path, checksum):
+            pairs.append((item.src_path, item.dest_path))
+        entries[item.rel_path] = {}
+    stats = copy_files(pairs, workers, preserve_mtime=True, strategy=strategy)
+
+    if manifest_path:
+        # The entries only record which files came from src, so they are
+        # used even if the manifest is outdated.
+        manifest, _ = load_manifest(manifest_path, {"src": os.path.abspath(src)})
+        for rel_path in manifest["entries"]:
+            dest_filepath = os.path.join(dest, rel_path)
+            # A symlink whose source was deleted is dangling, so isfile is
+            # False for it.
+            if rel_path not in entries and (os.path.isfile(dest_filepath) or os.path.islink(dest_filepath)):
+                os.remove(dest_filepath)
+        if manifest["entries"] != entries:
+            manifest["entries"] = entries
+            save_manifest(manifest_path, manifest)
+    return stats
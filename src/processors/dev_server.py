@@ -0,0 +1,223 @@
+import errno, mimetypes, os, posixpath, threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from processors.generate_page import page_renderer
+from processors.watch import scan_files
+
+# Browsers listen on LIVE_RELOAD_PATH for server-sent events, and reload the
+# page when a source changes.
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = f'<script>new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();</script>'
+
+class SiteRenderer:
+    """
+    SiteRenderer answers requests for a site straight from its sources, without building it. Pages are rendered when they are first requested and kept in memory until their markdown file or the template changes (by mtime or size). Static files are read from static_dirpath as they are requested.
+
+    URLs map to sources the way a build maps sources to files: /about/ and /about/index.html are rendered from about/index.md in content_dirpath, and other paths are looked up in static_dirpath. Pages directly in content_dirpath use tag as their parent tag, and other pages use "div", as in generate_pages_recursively.
+    """
+    def __init__(self, content_dirpath, static_dirpath, template_path, tag="div", base_path="/", live_reload=True):
+        self.content_dirpath = content_dirpath
+        self.static_dirpath = static_dirpath
+        self.template_path = template_path
+        self.tag = tag
+        self.base_path = base_path
+        self.live_reload = live_reload
+        self.cache = {}
+        self.renders = 0
+        self.lock = threading.Lock()
+
+    def resolve(self, url_path):
+        """
+        resolve returns what to serve for a URL path, as a (kind, value) tuple:
+
+        - ("page", src_path): the page rendered from the markdown file src_path
+        - ("static", path): the static file at path
+        - ("redirect", location): a directory requested without its trailing slash
+        - (None, None): nothing, so a 404
+        """
+        path = posixpath.normpath(unquote(url_path))
+        if self.base_path != "/":
+            if not (path + "/").startswith(self.base_path):
+                return None, None
+            path = "/" + path[len(self.base_path):]
+        parts = [part for part in path.split("/") if part and part != ".."]
+        rel_path = os.path.join(*parts) if parts else ""
+
+        if url_path.endswith("/") or not parts:
+            file_rel_path = os.path.join(rel_path, "index.html")
+        else:
+            file_rel_path = rel_path
+        if file_rel_path.endswith(".html"):
+            src_path = os.path.join(self.content_dirpath, file_rel_path[:-len(".html")] + ".md")
+            if os.path.isfile(src_path):
+                return "page", src_path
+        static_path = os.path.join(self.static_dirpath, file_rel_path)
+        if os.path.isfile(static_path):
+            return "static", static_path
+        if file_rel_path == rel_path and \
+           (os.path.isdir(os.path.join(self.content_dirpath, rel_path)) or os.path.isdir(static_path)):
+            return "redirect", url_path + "/"
+        return None, None
+
+    def page(self, src_path):
+        """
+        page returns the rendered page for the markdown file src_path, as bytes. It is only rendered again if the file or the template changed since it was last rendered. Errors in the markdown are raised.
+        """
+        src_stat = os.stat(src_path)
+        template_stat = os.stat(self.template_path)
+        key = (src_stat.st_mtime_ns, src_stat.st_size, template_stat.st_mtime_ns, template_stat.st_size)
+        with self.lock:
+            cached = self.cache.get(src_path)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        is_top_level = os.path.dirname(os.path.relpath(src_path, self.content_dirpath)) == ""
+        chunks = []
+        page_renderer(src_path, self.template_path, self.tag if is_top_level else "div", self.base_path)(chunks.append)
+        html = "".join(chunks)
+        if self.live_reload:
+            html = inject_live_reload(html)
+        body = html.encode()
+        with self.lock:
+            self.cache[src_path] = (key, body)
+            self.renders += 1
+        return body
+
+def inject_live_reload(html):
+    """inject_live_reload adds LIVE_RELOAD_SCRIPT to the page, before its closing body tag if it has one."""
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + LIVE_RELOAD_SCRIPT
+    return html[:index] + LIVE_RELOAD_SCRIPT + html[index:]
+
+class LiveReload:
+    """
+    LiveReload tracks a version number that goes up each time check finds that a file in paths (files or directory trees) changed. Server-sent event streams wait for it to change.
+    """
+    def __init__(self, paths):
+        self.paths = paths
+        self.snapshot = scan_files(paths)
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def check(self):
+        """check scans the paths and bumps the version if anything changed since the last check."""
+        snapshot = scan_files(self.paths)
+        if snapshot != self.snapshot:
+            self.snapshot = snapshot
+            with self.condition:
+                self.version += 1
+                self.condition.notify_all()
+
+    def wait(self, version, timeout=None):
+        """wait returns the current version as soon as it differs from version, or after timeout seconds."""
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def run(self, stop, interval=0.2):
+        """run calls check every interval seconds until the stop event is set."""
+        while not stop.wait(interval):
+            self.check()
+
+def make_handler(renderer, live_reload=None, keepalive=15):
+    """make_handler returns a request handler class that serves the site of the given SiteRenderer, and live reload events if live_reload is given."""
+    class DevRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.respond(send_body=True)
+
+        def do_HEAD(self):
+            self.respond(send_body=False)
+
+        def respond(self, send_body):
+            url_path = urlsplit(self.path).path
+            if url_path == LIVE_RELOAD_PATH and live_reload:
+                return self.send_events()
+
+            kind, value = renderer.resolve(url_path)
+            if kind == "redirect":
+                self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+                self.send_header("Location", value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            if kind is None:
+                return self.send_body(HTTPStatus.NOT_FOUND, "text/plain; charset=utf-8", b"Not found", send_body)
+
+            try:
+                if kind == "page":
+                    body = renderer.page(value)
+                    content_type = "text/html; charset=utf-8"
+                else:
+                    with open(value, 'rb') as f:
+                        body = f.read()
+                    content_type = mimetypes.guess_type(value)[0] or "application/octet-stream"
+            except Exception as e:
+                message = f"Failed to render {value}: {type(e).__name__}: {e}"
+                return self.send_body(HTTPStatus.INTERNAL_SERVER_ERROR, "text/plain; charset=utf-8", message.encode(), send_body)
+            self.send_body(HTTPStatus.OK, content_type, body, send_body)
+
+        def send_body(self, status, content_type, body, send_body):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            if send_body:
+                self.wfile.write(body)
+
+        def send_events(self):
+            """send_events streams a reload event each time the live reload version changes, with comments in between to keep the connection open."""
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            version = live_reload.version
+            try:
+                while True:
+                    new_version = live_reload.wait(version, keepalive)
+                    if new_version != version:
+                        version = new_version
+                        self.wfile.write(b"data: reload\n\n")
+                    else:
+                        self.wfile.write(b": keepalive\n\n")
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return DevRequestHandler
+
+def bind_server(handler_class, host="localhost", port=8888, attempts=20):
+    """
+    bind_server returns a ThreadingHTTPServer bound to the first free port from port on, trying up to attempts ports. An OSError is raised if none of them is free.
+    """
+    for candidate in range(port, port + attempts):
+        try:
+            server = ThreadingHTTPServer((host, candidate), handler_class)
+        except OSError as e:
+            if e.errno != errno.EADDRINUSE:
+                raise
+            print(f"Port {candidate} is in use.")
+            continue
+        server.daemon_threads = True
+        return server
+    raise OSError(f"No free port between {port} and {port + attempts - 1}.")
+
+def serve(content_dirpath, static_dirpath, template_path, tag="div", base_path="/",
+          host="localhost", port=8888, interval=0.2):
+    """
+    serve runs a development server for the site until it is interrupted. Nothing is built up front: pages are rendered on request by a SiteRenderer, and open pages reload when a source changes.
+    """
+    renderer = SiteRenderer(content_dirpath, static_dirpath, template_path, tag, base_path)
+    live_reload = LiveReload([content_dirpath, static_dirpath, template_path])
+    server = bind_server(make_handler(renderer, live_reload), host, port)
+    stop = threading.Event()
+    threading.Thread(target=live_reload.run, args=(stop, interval), daemon=True).start()
+
+    print(f"Serving on http://{host}:{server.server_address[1]}{base_path}. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
@@ -0,0 +1,173 @@
+import hashlib, json, os, tarfile
+from concurrent.futures import ThreadPoolExecutor
+from json.encoder import encode_basestring_ascii
+from processors.manifest import RENDERER_VERSION, file_hash
+
+# The default size limit of a FragmentCache, in bytes.
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# The content of an entry is encoded and written this many chunks at a time,
+# which is much cheaper than one chunk at a time.
+WRITE_BATCH_CHUNKS = 256
+
+class FragmentCache:
+    """
+    FragmentCache is a content-addressed directory of rendered page fragments. Each entry holds a page's title and the HTML of its {{ Content }}, keyed by a hash of the markdown source, the renderer version, the page's tag and the base path (see key). A page whose entry exists doesn't need to be parsed, only spliced into the template, so a new template, or a fresh checkout with an imported cache, reuses the work of earlier builds.
+
+    Entries are JSON files in dirpath, in subdirectories named after the first
+    two hex digits of their key. Reading an entry updates its mtime, so the
+    least recently used entries are the oldest ones, and prune removes those
+    until the entries take up at most max_bytes.
+
+    Entries are written to a temporary file and renamed into place, so several
+    processes can share a cache directory. Creating a file costs about as much
+    as rendering a small page, so put_later leaves it to a background thread,
+    and flush waits for it.
+
+    hits and misses count the calls to get that found an entry and that didn't.
+    """
+    def __init__(self, dirpath, max_bytes=DEFAULT_MAX_BYTES):
+        self.dirpath = dirpath
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._writer = None
+        self._writer_pid = None
+
+    def __getstate__(self):
+        # The writer thread belongs to the process that started it.
+        state = self.__dict__.copy()
+        state["_writer"] = state["_writer_pid"] = None
+        return state
+
+    def key(self, src_path, parent_tag="div", base_path="/", source_hash=None):
+        """key returns the key of the page rendered from the markdown at src_path with the given tag and base path. source_hash is the file_hash of the source, if it is known already (from a manifest entry, for example), so the source isn't read to hash it again."""
+        if source_hash is None:
+            source_hash = file_hash(src_path)
+        inputs = [RENDERER_VERSION, parent_tag, base_path, source_hash]
+        return hashlib.sha256(json.dumps(inputs).encode()).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.dirpath, key[:2], key[2:] + ".json")
+
+    def get(self, key):
+        """get returns the (title, content) tuple cached under key, or None if there is none or it can't be read."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r') as file:
+                title, content = json.loads(file.read())
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return title, content
+
+    def put(self, key, title, content):
+        """put caches a page's title and content under key."""
+        self._write(key, title, [content])
+
+    def put_later(self, key, title, chunks):
+        """
+        put_later caches a page's title and content, given as a list of strings, under key, from this process's background thread. The chunks are encoded and written in batches, so the content is never joined into one string. If the entry can't be written, it is left out, just as get treats an entry it can't read as missing.
+
+        Call flush to wait for the entry. The thread also finishes writing its entries before the process exits.
+        """
+        if self._writer is None or self._writer_pid != os.getpid():
+            self._writer = ThreadPoolExecutor(max_workers=1)
+            self._writer_pid = os.getpid()
+        self._writer.submit(self._write_quietly, key, title, chunks)
+
+    def flush(self):
+        """flush waits until the entries passed to put_later in this process are written, and stops its background thread."""
+        if self._writer is not None and self._writer_pid == os.getpid():
+            self._writer.shutdown()
+        self._writer = self._writer_pid = None
+
+    def _write_quietly(self, key, title, chunks):
+        try:
+            self._write(key, title, chunks)
+        except OSError:
+            pass
+
+    def _write(self, key, title, chunks):
+        path = self._entry_path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            file = open(tmp_path, 'w')
+        except FileNotFoundError:
+            # Most subdirectories exist after a few pages, so they are only
+            # created when the write fails.
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            file = open(tmp_path, 'w')
+        try:
+            with file:
+                # The same JSON as json.dumps([title, content]).
+                file.write(f"[{json.dumps(title)}, \"")
+                for start in range(0, len(chunks), WRITE_BATCH_CHUNKS):
+                    file.write(encode_basestring_ascii("".join(chunks[start:start + WRITE_BATCH_CHUNKS]))[1:-1])
+                file.write("\"]")
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, path)
+
+    def entries(self):
+        """entries returns a list of (mtime_ns, size, path) tuples, one for each entry in the cache."""
+        entries = []
+        if not os.path.isdir(self.dirpath):
+            return entries
+        with os.scandir(self.dirpath) as subdirs:
+            for subdir in subdirs:
+                if not subdir.is_dir(follow_symlinks=False):
+                    continue
+                with os.scandir(subdir.path) as files:
+                    for entry in files:
+                        if entry.name.endswith(".json") and entry.is_file(follow_symlinks=False):
+                            stat = entry.stat(follow_symlinks=False)
+                            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def prune(self):
+        """prune removes the least recently used entries until the entries take up at most max_bytes, and returns the number of entries removed."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+    def export_archive(self, archive_path):
+        """export_archive writes the entries of the cache to a gzipped tarball at archive_path, for example to carry the cache from one CI run to the next. It returns the number of entries written."""
+        entries = self.entries()
+        with tarfile.open(archive_path, "w:gz") as archive:
+            for _, _, path in entries:
+                archive.add(path, arcname=os.path.relpath(path, self.dirpath))
+        return len(entries)
+
+    def import_archive(self, archive_path):
+        """
+        import_archive adds the entries in the tarball at archive_path, written by export_archive, to the cache, and then prunes it. It returns the number of entries imported.
+
+        Only regular files named like entries are extracted, and tarfile's "data" filter is applied, so an archive can't write outside the cache.
+        """
+        with tarfile.open(archive_path, "r:*") as archive:
+            members = [member for member in archive.getmembers() if member.isfile() and is_entry_name(member.name)]
+            archive.extractall(self.dirpath, members=members, filter="data")
+        self.prune()
+        return len(members)
+
+def is_entry_name(name):
+    """is_entry_name reports whether name, a path relative to the cache directory, is the path of an entry."""
+    parts = name.split("/")
+    if len(parts) != 2 or not parts[1].endswith(".json"):
+        return False
+    key = parts[0] + parts[1][:-len(".json")]
+    return len(key) == 64 and all(c in "0123456789abcdef" for c in key)
@@ -1,62 +1,293 @@
 import os, re
-from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from concurrent.futures import ProcessPoolExecutor
+from markdown_to_html_nodes.block_cache import BlockCache
+from markdown_to_html_nodes.markdown_to_html_node import DocumentMetadata, markdown_lines_to_html_node
+from processors.template import load_template
+from processors.basepath import basepath_resolver
+from processors.manifest import file_hash, source_entry, load_manifest, save_manifest
+from processors.walk_tree import walk_tree
+from processors import profiler
 
-def extract_title(markdown):
+def generate_page(from_path, template_path, dest_path, parent_tag="div", base_path="/"):
     """
-    Extracts the text of the top-level heading of the markdown (i.e., the block starting with a single #). Leading and trailing whitespace is stripped.
-    
-    If there is no h1, an exception is raised.
+    Takes a file of markdown (at from_path), converts it to HTML using markdown_lines_to_html_node, takes the title from the first h1 found while parsing, inserts the result into the template at template_path, and writes the completed HTML to a file at dest_path.
+
+    The template is compiled once and cached by load_template. The page is
+    streamed to the file: the template's segments and the rendered nodes are
+    written in turn, so the completed HTML is never held in memory.
+
+    The base path is applied to the template's attributes when it is compiled
+    and to href and src props as the nodes are rendered, so text that only
+    looks like an attribute (in a code block, for example) is left alone.
     """
-    blocks = markdown.split("\n\n")
-    for block in blocks:
-        if block.startswith("# "):
-            return block.split(" ", maxsplit=1)[1].strip()
-    raise ValueError("Expected markdown to contain one h1.")
+    print(f"Generating page from {from_path} to {dest_path} using {template_path}.")
+    write_page(from_path, template_path, dest_path, parent_tag, base_path)
 
-def update_basepath(base_path, html_doc):
-    """If base_path is not '/', all href and src attributes in the document will be updated to start with the supplied base path."""
-    if base_path != "/":
-        return html_doc.replace('href="/', f'href="{base_path}')\
-                    .replace('src="/', f'src="{base_path}')
-    else:
-        return html_doc
+def write_page(from_path, template_path, dest_path, parent_tag="div", base_path="/", source_hash=None, cache=None, fragments=None):
+    """write_page does the work of generate_page without printing a message. The source hash and the caches are passed to page_renderer. Any existing file at dest_path is replaced, never written through, since it may be a link to a static file (see copy_file)."""
+    render = page_renderer(from_path, template_path, parent_tag, base_path, cache, fragments, source_hash)
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+    try:
+        os.unlink(dest_path)
+    except FileNotFoundError:
+        pass
+    with open(dest_path, 'w') as f:
+        render(page_writer(f))
 
-def generate_page(from_path, template_path, dest_path, parent_tag="div", base_path="/"):
+def page_writer(file):
+    """page_writer returns the write function write_page renders a page to, the file's own write method. It is a seam for the profiler, which times the writes."""
+    return file.write
+
+def page_renderer(from_path, template_path, parent_tag="div", base_path="/", cache=None, fragments=None, source_hash=None):
     """
-    Takes a file of markdown (at from_path), converts it to HTML using markdown_to_html_node, extracts the title with extract_title, inserts the result into the template at template_path, and writes the completed HTML to a file at dest_path.
+    page_renderer reads and parses the markdown at from_path and returns a function that renders the page by passing its HTML, in chunks, to a write function. Errors in the markdown are raised here, before anything is rendered.
+
+    If a BlockCache is given, blocks are parsed through it (see parse_block).
+
+    If a FragmentCache is given as fragments, the page's title and content are
+    taken from it when the same source was rendered before with the same tag
+    and base path, and the markdown isn't parsed at all. Otherwise the content
+    is added to the cache as the page is rendered (see caching_renderer).
+    source_hash, the file_hash of the source if it is known, saves reading the
+    source to compute the cache key.
     """
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}.")
-    
+    template = load_template(template_path, base_path)
+    if fragments is not None:
+        key = fragments.key(from_path, parent_tag, base_path, source_hash)
+        fragment = fragments.get(key)
+        if fragment is not None:
+            title, content = fragment
+            return lambda write: template.render_to(write, {"Title": title, "Content": content})
+
+    title, html = parse_page(from_path, parent_tag, cache)
+
+    resolve_url = basepath_resolver(base_path)
+    render_content = lambda write: html.render_to(write, resolve_url=resolve_url)
+    if fragments is not None:
+        render_content = caching_renderer(render_content, fragments, key, title)
+    return lambda write: template.render_to(write, {"Title": title, "Content": render_content})
+
+def caching_renderer(render_content, fragments, key, title):
+    """
+    caching_renderer returns a function that renders a page's content with render_content, passes it to its write function and adds it to the entry for key in the FragmentCache fragments. The content is rendered once, and the entry is only added if it renders without errors.
+
+    The content is rendered to a list of chunks, which is much faster than
+    passing each chunk to two functions, and the list is handed to the cache
+    as it is (see FragmentCache.put_later), so the page doesn't wait for the
+    entry to be written.
+    """
+    def render(write):
+        chunks = []
+        render_content(chunks.append)
+        for chunk in chunks:
+            write(chunk)
+        fragments.put_later(key, title, chunks)
+    return render
+
+def parse_page(from_path, parent_tag="div", cache=None):
+    """
+    parse_page reads the markdown at from_path and returns its title and its HTML node, from markdown_lines_to_html_node. The file is read line by line and each block is parsed as soon as it is complete, so the whole source is never held in memory as a string. The title is the text of the first h1, which is recorded in a DocumentMetadata as the blocks are parsed, so the markdown is only split once. If there is no h1, a ValueError is raised.
+
+    If a BlockCache is given, blocks are parsed through it.
+    """
+    metadata = DocumentMetadata()
     with open(from_path, 'r') as file:
-        markdown = file.read()
+        html = markdown_lines_to_html_node(markdown_lines(file), parent_tag, metadata=metadata, cache=cache)
 
-    with open(template_path, 'r') as file:
-        template = file.read()
+    if metadata.title is None:
+        raise ValueError("Expected markdown to contain one h1.")
+    return metadata.title, html
 
-    title = extract_title(markdown)
-    html = markdown_to_html_node(markdown, parent_tag)
+def markdown_lines(file):
+    """markdown_lines returns the lines parse_page parses from an open markdown file, which is the file itself. It is a seam for the profiler, which times reading each line."""
+    return file
 
-    with_title = template.replace("{{ Title }}", title)
-    with_content = with_title.replace("{{ Content }}", repr(html))
+def find_pages(src_dirpath, dest_dirpath, tag="div", allow_empty=False):
+    """
+    find_pages returns a list of (src_path, dest_path, tag) tuples for the files in the tree rooted at src_dirpath, sorted by path. In the destination paths, a .md extension is replaced with .html.
 
-    with_basepath = update_basepath(base_path, with_content)
+    The given tag is used for the files directly in src_dirpath. Files in
+    subdirectories use "div", as they always have.
 
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, 'w') as f:
-        f.write(with_basepath)
+    The tree is read in a single walk with walk_tree. If a directory in the
+    tree is empty, an OSError is raised, unless allow_empty is True.
+    """
+    rename = lambda name: re.sub(r'.md$', ".html", name)
+    pages = []
+    for item in walk_tree(src_dirpath, dest_dirpath, rename=rename, allow_empty=allow_empty):
+        if not item.is_dir:
+            pages.append((item.src_path, item.dest_path, tag if item.depth == 0 else "div"))
+    return pages
+
+# The caches generate_page_task uses in this process, if any. They are set
+# by use_caches.
+block_cache = None
+fragment_cache = None
+
+def use_caches(block_cache_size=0, fragments=None):
+    """
+    use_caches sets the caches generate_page_task uses in this process: a BlockCache of block_cache_size blocks, or none if it's 0, and fragments, a FragmentCache or None. A block cache of the same size is kept, with its blocks.
+    """
+    global block_cache, fragment_cache
+    if not block_cache_size:
+        block_cache = None
+    elif block_cache is None or block_cache.maxsize != block_cache_size:
+        block_cache = BlockCache(block_cache_size)
+    fragment_cache = fragments
+
+def init_worker(block_cache_size=0, fragments=None, profiling=False):
+    """init_worker sets up a process that generates pages: it sets its caches with use_caches, and starts profiling if profiling is True."""
+    use_caches(block_cache_size, fragments)
+    if profiling:
+        profiler.start_profiling()
+
+def generate_page_task(task):
+    """
+    generate_page_task calls write_page with the arguments in the task tuple, from the source path to the source hash, using the process's caches (see use_caches). It returns an (error, cache_stats, page_profile) tuple. error is None if the page was written, or an error message if it wasn't. cache_stats maps the name of each cache in use, "Block" or "Fragment", to its (hits, misses) for this page. page_profile is None, unless the process is profiling, in which case it holds the page's stage times (see Profiler.end_page). It runs in worker processes, so it doesn't print anything.
+    """
+    caches = {name: cache for name, cache in [("Block", block_cache), ("Fragment", fragment_cache)] if cache is not None}
+    before = {name: (cache.hits, cache.misses) for name, cache in caches.items()}
+    active = profiler.active
+    if active is not None:
+        active.start_page()
+    error = None
+    try:
+        write_page(*task, cache=block_cache, fragments=fragment_cache)
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    page_profile = active.end_page() if active is not None else None
+    return error, {name: (cache.hits - before[name][0], cache.misses - before[name][1]) for name, cache in caches.items()}, page_profile
+
+def map_page_tasks(tasks, jobs, block_cache_size=0, fragments=None):
+    """
+    map_page_tasks yields the result of generate_page_task for each task, in order. If jobs is more than 1, the tasks are shared between that many worker processes.
+
+    Each process parses blocks through a BlockCache of block_cache_size blocks, if it's more than 0, and renders pages through fragments, if it's a FragmentCache (see use_caches). The fragments of every page are written once the generator is exhausted or closed: this process flushes the cache, and the workers write theirs before they exit, which is waited for. If this process is profiling, so are the workers.
+    """
+    if jobs == 1 or len(tasks) < 2:
+        use_caches(block_cache_size, fragments)
+        try:
+            yield from map(generate_page_task, tasks)
+        finally:
+            if fragments is not None:
+                fragments.flush()
+        return
+
+    workers = min(jobs, len(tasks))
+    initargs = (block_cache_size, fragments, profiler.active is not None)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as executor:
+        chunksize = max(1, len(tasks) // (workers * 4))
+        yield from executor.map(generate_page_task, tasks, chunksize=chunksize)
+
+def format_cache_stats(name, hits, misses):
+    """format_cache_stats returns a line for the build summary with the named cache's hits and misses."""
+    lookups = hits + misses
+    rate = hits / lookups if lookups else 0
+    return f"{name} cache: {hits} hits, {misses} misses ({rate:.0%} hit rate)."
+
+def remove_deleted_pages(old_entries, src_paths):
+    """remove_deleted_pages deletes the output of every page in old_entries (a manifest's entries) whose source is not in src_paths anymore."""
+    for src_path, entry in old_entries.items():
+        if src_path not in src_paths and os.path.isfile(entry["dest"]):
+            print(f"Removing {entry['dest']}, its source {src_path} was deleted.")
+            os.remove(entry["dest"])
 
 def generate_pages_recursively(
-        src_dirpath, template_path, dest_dirpath, tag="div", base_path="/"):
-
-    source_tree = os.listdir(src_dirpath)
-    if len(source_tree) == 0:
-        raise OSError(f"Source path must not be empty.")
-
-    for f in source_tree:
-        src_path = os.path.join(src_dirpath, f)
-        dest_file = re.sub(r'.md$', ".html", f)
-        dest_path = os.path.join(dest_dirpath, dest_file)
-        if os.path.isfile(src_path):
-            generate_page(src_path, template_path, dest_path, tag, base_path=base_path)
-        elif os.path.isdir(src_path):
-            generate_pages_recursively(src_path, template_path, dest_path, base_path=base_path)
+        src_dirpath, template_path, dest_dirpath, tag="div", base_path="/", jobs=None, manifest_path=None,
+        block_cache_size=0, fragments=None):
+    """
+    generate_pages_recursively generates a page with generate_page for each file in the tree rooted at src_dirpath (see find_pages), mirroring the tree under dest_dirpath.
+
+    Pages are shared between jobs worker processes. If jobs is None, one
+    process per CPU core is used, and if jobs is 1 the pages are generated in
+    this process. Messages are printed in page order however many jobs there
+    are.
+
+    If manifest_path is given, the build is incremental. The manifest there
+    records a content hash for each source, along with the template's hash,
+    the base path and the renderer version. Only pages whose inputs changed,
+    or whose output is missing, are generated, and the output of pages whose
+    source was deleted is removed. The manifest is updated afterwards.
+
+    If block_cache_size is more than 0, each process keeps a BlockCache of
+    that many parsed blocks, so blocks repeated across pages are parsed once
+    per process. If fragments, a FragmentCache, is given, pages are rendered
+    through it (see page_renderer), and it is pruned at the end. With a
+    manifest, the source hashes in its entries are reused for the cache keys.
+    The caches' hits and misses are printed at the end.
+
+    If profiling is on (see start_profiling), the stage times of each page are
+    added to the active Profiler.
+
+    If a page fails, its error is printed and the other pages are still
+    generated. A RuntimeError is raised at the end if any page failed.
+    """
+    if block_cache_size < 0:
+        raise ValueError("The block cache size can't be negative.")
+    pages = find_pages(src_dirpath, dest_dirpath, tag)
+
+    # Compile the template before any workers are forked, so they share it.
+    load_template(template_path, base_path)
+
+    manifest = None
+    if manifest_path:
+        build_inputs = {"template": file_hash(template_path), "base_path": base_path}
+        manifest, up_to_date = load_manifest(manifest_path, build_inputs)
+        old_entries, manifest["entries"] = manifest["entries"], {}
+        remove_deleted_pages(old_entries, {src_path for src_path, _, _ in pages})
+        # If the template, base path or renderer changed, the old entries
+        # only served to remove deleted pages, and every page is generated.
+        reusable_entries = old_entries if up_to_date else {}
+
+    tasks = []
+    entries = []
+    for src_path, dest_path, page_tag in pages:
+        if manifest is not None:
+            previous = reusable_entries.get(src_path)
+            # The hash is reused if the source's mtime and size haven't
+            # changed, even if the rest of the inputs have, so the fragment
+            # cache can be searched without reading the source.
+            entry = source_entry(src_path, old_entries.get(src_path))
+            source_hash = entry["hash"]
+            entry.update(dest=dest_path, tag=page_tag)
+            if previous and os.path.isfile(dest_path) and \
+               all(previous.get(key) == entry[key] for key in ["hash", "dest", "tag"]):
+                manifest["entries"][src_path] = entry
+                continue
+            entries.append(entry)
+        else:
+            source_hash = None
+        tasks.append((src_path, template_path, dest_path, page_tag, base_path, source_hash))
+
+    failures = 0
+    cache_stats = {}
+    results = map_page_tasks(tasks, jobs or os.cpu_count() or 1, block_cache_size, fragments)
+    # strict makes zip run map_page_tasks to its end, so the fragments of
+    # every page are written before the cache is pruned.
+    for i, ((src_path, _, dest_path, _, _, _), (error, page_cache_stats, page_profile)) in enumerate(zip(tasks, results, strict=True)):
+        print(f"Generating page from {src_path} to {dest_path} using {template_path}.")
+        if page_profile is not None and profiler.active is not None:
+            profiler.active.add_page(src_path, page_profile)
+        for name, (hits, misses) in page_cache_stats.items():
+            total_hits, total_misses = cache_stats.get(name, (0, 0))
+            cache_stats[name] = (total_hits + hits, total_misses + misses)
+        if error:
+            print(f"Failed to generate page from {src_path}: {error}")
+            failures += 1
+        elif manifest is not None:
+            manifest["entries"][src_path] = entries[i]
+
+    if manifest is not None:
+        skipped = len(pages) - len(tasks)
+        if skipped:
+            print(f"Skipped {skipped} unchanged pages.")
+        if not up_to_date or manifest["entries"] != old_entries:
+            save_manifest(manifest_path, manifest)
+
+    for name, (hits, misses) in cache_stats.items():
+        print(format_cache_stats(name, hits, misses))
+    if fragments is not None:
+        fragments.prune()
+
+    if failures:
+        raise RuntimeError(f"{failures} of {len(tasks)} pages failed to generate.")
@@ -0,0 +1,62 @@
+import hashlib, json, os
+
+# Bump RENDERER_VERSION whenever a change to the parser or renderer changes
+# the generated HTML, so that incremental builds re-render every page.
+RENDERER_VERSION = 2
+
+def manifest_path_for(cache_dirpath, dest_dirpath, name="pages"):
+    """manifest_path_for returns the path of the named build manifest for the output directory dest_dirpath, inside cache_dirpath. Each output directory gets its own manifests."""
+    digest = hashlib.sha256(os.path.abspath(dest_dirpath).encode()).hexdigest()[:16]
+    return os.path.join(cache_dirpath, "manifests", f"{digest}-{name}.json")
+
+def file_hash(path):
+    """file_hash returns the SHA-256 hex digest of the file's contents."""
+    with open(path, 'rb') as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
+
+def source_entry(path, previous=None):
+    """
+    source_entry returns the manifest entry for a source file: its mtime, size and content hash. If the mtime and size match the previous entry, its hash is reused instead of reading the file again.
+    """
+    stat = os.stat(path)
+    if previous and previous["mtime_ns"] == stat.st_mtime_ns and previous["size"] == stat.st_size:
+        digest = previous["hash"]
+    else:
+        digest = file_hash(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "hash": digest}
+
+def new_manifest(build_inputs):
+    """
+    new_manifest returns an empty manifest for the given build inputs, a dict of everything besides the sources that affects every output. Callers store one entry per source in the manifest's "entries" dict.
+    """
+    return {"renderer_version": RENDERER_VERSION, "inputs": build_inputs, "entries": {}}
+
+def load_manifest(manifest_path, build_inputs):
+    """
+    load_manifest returns a (manifest, up_to_date) tuple for the manifest saved at manifest_path. If there is none or it can't be read, an empty manifest is returned.
+
+    If it was made with a different renderer version or different build
+    inputs, up_to_date is False and its version and inputs are replaced with
+    the current ones. Its entries can't be reused then, so every output must
+    be rebuilt, but they still record what the last build wrote, so that the
+    outputs of sources deleted since can be removed.
+    """
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return new_manifest(build_inputs), True
+    if manifest.get("renderer_version") != RENDERER_VERSION or manifest.get("inputs") != build_inputs:
+        outdated = new_manifest(build_inputs)
+        outdated["entries"] = manifest.get("entries", {})
+        return outdated, False
+    return manifest, True
+
+def save_manifest(manifest_path, manifest):
+    """save_manifest writes the manifest to manifest_path, replacing the old one in a single step so that an interrupted build can't leave it half written."""
+    os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, 'w') as file:
+        # json.dumps uses the C encoder, json.dump doesn't.
+        file.write(json.dumps(manifest))
+    os.replace(tmp_path, manifest_path)
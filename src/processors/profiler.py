@@ -0,0 +1,209 @@
+import contextlib, functools, importlib, time
+
+# The order stages are reported in, which is roughly the order of a build.
+STAGES = ["copy", "read", "split", "classify", "tokenize", "parse", "render", "template", "basepath", "write", "page"]
+
+# The Profiler of this process while profiling is on (see start_profiling).
+active = None
+
+class Profiler:
+    """
+    Profiler adds up the wall time and number of calls of each stage of a build. A stage is timed from enter to exit, and stages can nest: while a stage runs, the time of the stage around it is paused, so each stage's time is its own and the times add up to the time profiled.
+
+    Between start_page and end_page, the times are recorded for that page
+    only, and end_page returns them, so that pages built in worker processes
+    can be sent back and merged with add_page.
+
+    It is meant for a single thread. Functions are timed by replacing them
+    with wrappers (see instrument), so nothing is timed, and nothing is
+    slowed down, unless profiling is started.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.pages = []
+        self._stack = []
+        self._page = None
+
+    def _add(self, stage, seconds, calls):
+        stages = self._page if self._page is not None else self.stages
+        entry = stages.get(stage)
+        if entry is None:
+            stages[stage] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def enter(self, stage):
+        """enter starts timing stage, pausing the stage that was running."""
+        now = time.perf_counter()
+        if self._stack:
+            outer = self._stack[-1]
+            self._add(outer[0], now - outer[1], 0)
+        self._stack.append([stage, now])
+
+    def exit(self):
+        """exit stops timing the current stage, counting one call, and resumes the stage around it."""
+        now = time.perf_counter()
+        stage, started = self._stack.pop()
+        self._add(stage, now - started, 1)
+        if self._stack:
+            self._stack[-1][1] = now
+
+    @contextlib.contextmanager
+    def stage(self, stage):
+        """stage times the body of a with statement as stage."""
+        self.enter(stage)
+        try:
+            yield
+        finally:
+            self.exit()
+
+    def timed(self, stage, func):
+        """timed returns a wrapper of func that times each call as stage."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            self.enter(stage)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.exit()
+        return wrapper
+
+    def timed_iterator(self, stage, func):
+        """timed_iterator returns a wrapper of func, which returns an iterator, that times each step of the iterator as stage."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            iterator = iter(func(*args, **kwargs))
+            while True:
+                self.enter(stage)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    self.exit()
+                yield item
+        return wrapper
+
+    def start_page(self):
+        """start_page starts recording the stages of a page separately."""
+        self._page = {}
+
+    def end_page(self):
+        """end_page stops recording the stages of a page and returns them, as a dict mapping each stage to a [seconds, calls] list."""
+        page, self._page = self._page, None
+        return page
+
+    def add_page(self, name, page_stages):
+        """add_page adds the stages of the page called name, returned by end_page, to the totals."""
+        for stage, (seconds, calls) in page_stages.items():
+            self._add(stage, seconds, calls)
+        self.pages.append((name, sum(seconds for seconds, _ in page_stages.values()), page_stages))
+
+    def report(self, top=10):
+        """report returns the stages table and the table of the top slowest pages, as text."""
+        total = sum(seconds for seconds, _ in self.stages.values())
+        order = sorted(self.stages, key=lambda stage: STAGES.index(stage) if stage in STAGES else len(STAGES))
+        rows = []
+        for stage in order:
+            seconds, calls = self.stages[stage]
+            per_call = format_seconds(seconds / calls) if calls else ""
+            rows.append([stage, calls, format_seconds(seconds), per_call, f"{seconds / total:.1%}" if total else ""])
+        rows.append(["total", "", format_seconds(total), "", ""])
+        lines = format_table(["stage", "calls", "time", "per call", "share"], rows)
+
+        slowest = sorted(self.pages, key=lambda page: page[1], reverse=True)[:top]
+        if slowest:
+            rows = []
+            for name, seconds, page_stages in slowest:
+                largest = sorted(page_stages.items(), key=lambda item: item[1][0], reverse=True)[:3]
+                rows.append([name, format_seconds(seconds), ", ".join(f"{stage} {stage_seconds / seconds:.0%}" for stage, (stage_seconds, _) in largest)])
+            lines += ["", f"Slowest {len(slowest)} of {len(self.pages)} pages:"]
+            lines += format_table(["page", "time", "largest stages"], rows)
+        return "\n".join(lines)
+
+def format_seconds(seconds):
+    """format_seconds returns a short human readable duration."""
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds:.2f} s"
+
+def format_table(headers, rows):
+    """format_table returns the lines of rows (lists of values) as a left-aligned plain text table."""
+    rows = [[str(value) for value in row] for row in rows]
+    widths = [max(len(row[i]) for row in [headers] + rows) for i in range(len(headers))]
+    return ["  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip()
+            for row in [headers, ["-" * width for width in widths]] + rows]
+
+def instrument(profiler):
+    """
+    instrument replaces the functions of each build stage, where they are looked up when they are called, with wrappers that time them with profiler. It returns a function that puts the originals back.
+
+    - read: reading each line of a source (see markdown_lines)
+    - split: the rest of each step of the block string generators
+    - classify: block_to_block_type
+    - tokenize: text_to_textnodes
+    - parse: the rest of parse_page, which builds the nodes
+    - render: HTMLNode.render_to, the page's content
+    - template: Template.render_to, the rest of the page
+    - basepath: update_basepath when a template is compiled, and the resolve_url functions of basepath_resolver
+    - write: the file writes of write_page (see page_writer)
+    - page: the rest of write_page, such as opening files and loading the template
+    """
+    generate_page = importlib.import_module("processors.generate_page")
+    markdown_to_html_node = importlib.import_module("markdown_to_html_nodes.markdown_to_html_node")
+    template = importlib.import_module("processors.template")
+    htmlnode = importlib.import_module("nodes.htmlnode")
+
+    basepath_resolver = generate_page.basepath_resolver
+    def timed_basepath_resolver(base_path):
+        resolve_url = basepath_resolver(base_path)
+        return resolve_url and profiler.timed("basepath", resolve_url)
+
+    page_writer = generate_page.page_writer
+    def timed_page_writer(file):
+        return profiler.timed("write", page_writer(file))
+
+    hooks = [
+        (generate_page, "markdown_lines", profiler.timed_iterator("read", generate_page.markdown_lines)),
+        (markdown_to_html_node, "iter_text_block_strings", profiler.timed_iterator("split", markdown_to_html_node.iter_text_block_strings)),
+        (markdown_to_html_node, "iter_block_strings", profiler.timed_iterator("split", markdown_to_html_node.iter_block_strings)),
+        (markdown_to_html_node, "block_to_block_type", profiler.timed("classify", markdown_to_html_node.block_to_block_type)),
+        (markdown_to_html_node, "text_to_textnodes", profiler.timed("tokenize", markdown_to_html_node.text_to_textnodes)),
+        (generate_page, "parse_page", profiler.timed("parse", generate_page.parse_page)),
+        (htmlnode.HTMLNode, "render_to", profiler.timed("render", htmlnode.HTMLNode.render_to)),
+        (template.Template, "render_to", profiler.timed("template", template.Template.render_to)),
+        (template, "update_basepath", profiler.timed("basepath", template.update_basepath)),
+        (generate_page, "basepath_resolver", timed_basepath_resolver),
+        (generate_page, "page_writer", timed_page_writer),
+        (generate_page, "write_page", profiler.timed("page", generate_page.write_page)),
+    ]
+    originals = [(owner, name, getattr(owner, name)) for owner, name, _ in hooks]
+    for owner, name, wrapper in hooks:
+        setattr(owner, name, wrapper)
+
+    def restore():
+        for owner, name, original in originals:
+            setattr(owner, name, original)
+    return restore
+
+_restore = None
+
+def start_profiling():
+    """start_profiling instruments the build stages with a new Profiler, makes it the active one and returns it. If profiling was already on, the active Profiler is returned."""
+    global active, _restore
+    if active is None:
+        active = Profiler()
+        _restore = instrument(active)
+    return active
+
+def stop_profiling():
+    """stop_profiling removes the instrumentation of start_profiling and returns the Profiler that was active, or None."""
+    global active, _restore
+    profiler = active
+    if _restore is not None:
+        _restore()
+    active = _restore = None
+    return profiler
@@ -0,0 +1,63 @@
+import os, re
+from processors.basepath import update_basepath
+
+placeholder_rx = re.compile(r'\{\{ (\w+) \}\}')
+
+# Compiled templates, keyed by path and base path, along with the mtime and
+# size they were compiled from.
+_template_cache = {}
+
+class Template:
+    """
+    Template is a page template compiled into a list of segments. Literal text is stored as a string and each {{ Name }} placeholder as a Placeholder holding its name.
+
+    The base path is applied to the href and src attributes of the literal
+    text with update_basepath when the template is compiled.
+
+    Templates are usually created with load_template, which caches them.
+    """
+    def __init__(self, source, base_path="/"):
+        self.segments = []
+        pos = 0
+        for match in placeholder_rx.finditer(source):
+            if match.start() > pos:
+                self.segments.append(update_basepath(base_path, source[pos:match.start()]))
+            self.segments.append(Placeholder(match.group(1), match.group(0)))
+            pos = match.end()
+        if pos < len(source):
+            self.segments.append(update_basepath(base_path, source[pos:]))
+
+    def render_to(self, write, values):
+        """
+        render_to passes the template to write, filling in placeholders from the values dict. A value can be a string or a function that is called with write, such as a node's render_to method. Placeholders without a value are written unchanged.
+        """
+        for segment in self.segments:
+            if not isinstance(segment, Placeholder):
+                write(segment)
+            elif segment.name not in values:
+                write(segment.text)
+            elif callable(value := values[segment.name]):
+                value(write)
+            else:
+                write(value)
+
+class Placeholder:
+    """Placeholder is a {{ Name }} slot in a Template. text is the placeholder as written in the template."""
+    def __init__(self, name, text):
+        self.name = name
+        self.text = text
+
+def load_template(template_path, base_path="/"):
+    """
+    load_template returns the compiled Template for the file at template_path and the given base path. The template is read and compiled once and then reused until the file's mtime or size changes.
+    """
+    stat = os.stat(template_path)
+    key = (template_path, base_path)
+    cached = _template_cache.get(key)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+
+    with open(template_path, 'r') as file:
+        template = Template(file.read(), base_path)
+    _template_cache[key] = ((stat.st_mtime_ns, stat.st_size), template)
+    return template
@@ -0,0 +1,26 @@
+from test_utils import TestRunner
+from processors.basepath import update_basepath, basepath_resolver
+
+class TestBasepathResolver(TestRunner):
+    cases = [
+        {"name": "root relative", "url": "/blog/tom", "expected": "/repo/blog/tom"},
+        {"name": "root", "url": "/", "expected": "/repo/"},
+        {"name": "absolute", "url": "https://example.com/a", "expected": "https://example.com/a"},
+        {"name": "relative", "url": "images/a.png", "expected": "images/a.png"},
+        {"name": "None", "url": None, "expected": None},
+    ]
+
+    def test_cases(self):
+        resolve_url = basepath_resolver("/repo/")
+        def test_func(case):
+            self.assertEqual(resolve_url(case["url"]), case["expected"])
+        self.run_tests(self.cases, test_func)
+
+    def test_default_base_path(self):
+        self.assertIsNone(basepath_resolver("/"))
+
+    def test_matches_update_basepath(self):
+        resolve_url = basepath_resolver("/repo/")
+        for url in ["/blog/tom", "/", "https://example.com/a"]:
+            with self.subTest(url):
+                self.assertEqual(f'href="{resolve_url(url)}"', update_basepath("/repo/", f'href="{url}"'))
@@ -0,0 +1,58 @@
+import contextlib, io, os
+from processors.build import DirectorySink, build_site
+from processors.copy_tree import sync_tree
+from processors.generate_page import generate_pages_recursively
+from processors.test_generate_page import GeneratePagesTestCase
+
+class TestBuildSite(GeneratePagesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static_dir = os.path.join(self.test_dir, 'static')
+        self._write(os.path.join(self.static_dir, 'index.css'), "body {}")
+        self._write(os.path.join(self.static_dir, 'images', 'logo.svg'), "<svg/>")
+
+    def _disk_build(self, dest_dir, base_path="/"):
+        """_disk_build builds the site the way main.py does and returns its files, keyed like build_site's."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync_tree(self.static_dir, dest_dir)
+            generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", base_path=base_path, jobs=1)
+        return {path.replace(os.sep, "/"): text.encode() for path, text in self._read_tree(dest_dir).items()}
+
+    def test_matches_disk_build(self):
+        for base_path in ["/", "/repo/"]:
+            with self.subTest(base_path):
+                files = build_site(self.content_dir, self.static_dir, self.template_path, base_path=base_path)
+                self.assertEqual(files, self._disk_build(os.path.join(self.test_dir, 'public'), base_path))
+        self.assertIn("images/logo.svg", files)
+        self.assertIn("blog/a/index.html", files)
+
+    def test_directory_sink(self):
+        dest_dir = os.path.join(self.test_dir, 'sink')
+        sink = build_site(self.content_dir, self.static_dir, self.template_path, DirectorySink(dest_dir))
+        self.assertEqual(sink.dirpath, dest_dir)
+        files = build_site(self.content_dir, self.static_dir, self.template_path)
+        self.assertEqual({path.replace(os.sep, "/"): text.encode() for path, text in self._read_tree(dest_dir).items()}, files)
+
+    def test_pages_replace_static_files(self):
+        self._write(os.path.join(self.static_dir, 'index.html'), "static")
+        files = build_site(self.content_dir, self.static_dir, self.template_path)
+        self.assertTrue(files["index.html"].startswith(b"<title>Home</title>"))
+
+    def test_pages_replace_linked_static_files(self):
+        static_path = os.path.join(self.static_dir, 'index.html')
+        self._write(static_path, "static")
+        for strategy in ["hardlink", "symlink"]:
+            with self.subTest(strategy):
+                dest_dir = os.path.join(self.test_dir, f'sink-{strategy}')
+                build_site(self.content_dir, self.static_dir, self.template_path, DirectorySink(dest_dir, strategy))
+                with open(static_path) as f:
+                    self.assertEqual(f.read(), "static")
+                self.assertTrue(self._read_tree(dest_dir)['index.html'].startswith("<title>Home</title>"))
+
+    def test_failed_page(self):
+        self._write(os.path.join(self.content_dir, 'blog', 'a', 'index.md'), "No title")
+        self.assert_raises_exception(
+            RuntimeError,
+            "1 of 4 pages failed to generate.\nFailed to generate page from",
+            build_site,
+            self.content_dir, self.static_dir, self.template_path)
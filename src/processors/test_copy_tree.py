@@ -1,8 +1,10 @@
-import os, shutil
+import errno, os, shutil
+from unittest import mock
 from test_utils import TestRunner
-from processors.copy_tree import copy_tree
+from processors.copy_tree import copy_tree, sync_tree, copy_file, copy_files
 
-class TestCopyTree(TestRunner):
+class CopyTreeTestCase(TestRunner):
+    """CopyTreeTestCase sets up source and destination trees for the tests of copy_tree and sync_tree."""
     def setUp(self):
         super().setUp()
         self.test_dir = '/tmp/test_copy_tree'
@@ -65,6 +67,7 @@ class TestCopyTree(TestRunner):
         with open(os.path.join(dest_dir, 'dest-file.txt'), 'r') as f:
             assert f.read() == 'This file is unique to dest'
 
+class TestCopyTree(CopyTreeTestCase):
     def test_with_success_with_defaults(self):
         self.setup_src_and_dest()
         copy_tree(self.src_dir, self.dest_dir)
@@ -108,4 +111,198 @@ class TestCopyTree(TestRunner):
         self._setup_full_src()
         with self.assertRaises(OSError) as context:
             copy_tree(self.src_dir, "/tmp/foo/bar/baz", create_full_dest_path=False)
-        self.assertTrue("Parent directory does not exist for path: /tmp/foo/bar/baz" in str(context.exception))
\ No newline at end of file
+        self.assertTrue("Parent directory does not exist for path: /tmp/foo/bar/baz" in str(context.exception))
+
+    def test_empty_subdirectory(self):
+        self._setup_full_src()
+        os.makedirs(os.path.join(self.src_dir, 'empty'))
+        self.assert_raises_exception(OSError, "Source path must not be empty.", copy_tree, self.src_dir, self.dest_dir)
+
+    def test_workers(self):
+        self._setup_full_src()
+        for i in range(200):
+            with open(os.path.join(self.src_dir, 'subdir', f'many-{i}.txt'), 'w') as f:
+                f.write(f'This is file {i}' * i)
+        for workers in [1, 2, 8]:
+            with self.subTest(workers):
+                dest_dir = os.path.join(self.test_dir, f'dest-{workers}')
+                stats = copy_tree(self.src_dir, dest_dir, workers=workers)
+                self.assertEqual(stats.files, 203)
+                for i in [0, 1, 199]:
+                    with open(os.path.join(dest_dir, 'subdir', f'many-{i}.txt'), 'r') as f:
+                        self.assertEqual(f.read(), f'This is file {i}' * i)
+
+class TestCopyFile(CopyTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        self._setup_empty_src()
+        os.makedirs(self.dest_dir)
+        self.src_file = os.path.join(self.src_dir, 'large.bin')
+        self.dest_file = os.path.join(self.dest_dir, 'large.bin')
+        # Larger than a single sendfile or copy_file_range call may copy.
+        self.content = os.urandom(1 << 16) * 64
+        with open(self.src_file, 'wb') as f:
+            f.write(self.content)
+
+    def _test_copy(self, **kwargs):
+        self.assertEqual(copy_file(self.src_file, self.dest_file, **kwargs), len(self.content))
+        with open(self.dest_file, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_copy(self):
+        self._test_copy()
+
+    def test_overwrites_longer_file(self):
+        with open(self.dest_file, 'wb') as f:
+            f.write(self.content * 2)
+        self._test_copy()
+
+    def test_empty_file(self):
+        open(self.src_file, 'w').close()
+        self.content = b''
+        self._test_copy()
+
+    def test_fallbacks(self):
+        def unsupported(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        cases = [
+            {"name": "copy_file_range unsupported", "patches": ["copy_file_range"]},
+            {"name": "no kernel copy", "patches": ["copy_file_range", "sendfile"]},
+        ]
+        def test_func(case):
+            with mock.patch.multiple(os, **{name: unsupported for name in case["patches"]}):
+                self._test_copy()
+        self.run_tests(cases, test_func)
+
+    def test_other_errors_are_raised(self):
+        def failing(*args):
+            raise OSError(errno.EIO, "Input/output error")
+        with mock.patch.object(os, "copy_file_range", failing):
+            self.assert_raises_exception(OSError, "Input/output error", copy_file, self.src_file, self.dest_file)
+
+    def test_preserve_mtime(self):
+        os.utime(self.src_file, ns=(1_000_000_000, 2_000_000_000))
+        self._test_copy(preserve_mtime=True)
+        self.assertEqual(os.stat(self.dest_file).st_mtime_ns, 2_000_000_000)
+
+    def test_permission_bits_are_not_copied(self):
+        os.chmod(self.src_file, 0o600)
+        self._test_copy()
+        self.assertNotEqual(os.stat(self.dest_file).st_mode & 0o777, 0o600)
+
+    def test_strategies(self):
+        cases = [
+            {"name": "copy", "same_inode": False, "is_link": False},
+            {"name": "reflink", "same_inode": False, "is_link": False},
+            {"name": "hardlink", "same_inode": True, "is_link": False},
+            {"name": "symlink", "same_inode": True, "is_link": True},
+        ]
+        def test_func(case):
+            self._test_copy(strategy=case["name"])
+            same_inode = os.stat(self.src_file).st_ino == os.stat(self.dest_file).st_ino
+            self.assertEqual(same_inode, case["same_inode"])
+            self.assertEqual(os.path.islink(self.dest_file), case["is_link"])
+        self.run_tests(cases, test_func)
+
+    def test_strategy_fallback(self):
+        def cross_device(*args):
+            raise OSError(errno.EXDEV, "Invalid cross-device link")
+        for strategy in ["hardlink", "symlink"]:
+            with self.subTest(strategy), mock.patch.multiple(os, link=cross_device, symlink=cross_device):
+                self._test_copy(strategy=strategy)
+                self.assertNotEqual(os.stat(self.src_file).st_ino, os.stat(self.dest_file).st_ino)
+
+    def test_copy_replaces_link(self):
+        # Copying over a hard link must not write through it into the source.
+        copy_file(self.src_file, self.dest_file, strategy="hardlink")
+        other_file = os.path.join(self.src_dir, 'other.txt')
+        with open(other_file, 'w') as f:
+            f.write('other')
+        copy_file(other_file, self.dest_file)
+        with open(self.src_file, 'rb') as f:
+            self.assertEqual(f.read(), self.content)
+
+    def test_unknown_strategy(self):
+        self.assert_raises_exception(ValueError, "Unknown copy strategy: move", copy_file, self.src_file, self.dest_file, strategy="move")
+
+    def test_copy_files_stats(self):
+        pairs = [(self.src_file, os.path.join(self.dest_dir, f'{i}.bin')) for i in range(4)]
+        stats = copy_files(pairs, workers=2)
+        self.assertEqual((stats.files, stats.size), (4, 4 * len(self.content)))
+        self.assertIn("4 files", str(stats))
+
+class TestSyncTree(CopyTreeTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest_path = os.path.join(self.test_dir, 'cache', 'static.json')
+
+    def _read(self, *path):
+        with open(os.path.join(self.dest_dir, *path), 'r') as f:
+            return f.read()
+
+    def test_with_success_with_defaults(self):
+        self.setup_src_and_dest()
+        sync_tree(self.src_dir, self.dest_dir)
+        self._test_success()
+
+    def test_empty_src(self):
+        self._setup_empty_src()
+        self.assert_raises_exception(OSError, "Source path must not be empty.", sync_tree, self.src_dir, self.dest_dir)
+
+    def test_unchanged_files_are_not_copied(self):
+        self._setup_full_src()
+        self.assertEqual(sync_tree(self.src_dir, self.dest_dir).files, 3)
+        self.assertEqual(sync_tree(self.src_dir, self.dest_dir).files, 0)
+
+    def test_changed_file_is_copied(self):
+        self._setup_full_src()
+        sync_tree(self.src_dir, self.dest_dir)
+        with open(os.path.join(self.src_dir, 'file2.txt'), 'w') as f:
+            f.write('This is file 2, changed')
+        self.assertEqual(sync_tree(self.src_dir, self.dest_dir).files, 1)
+        self.assertEqual(self._read('file2.txt'), 'This is file 2, changed')
+
+    def test_checksum(self):
+        self._setup_full_src()
+        sync_tree(self.src_dir, self.dest_dir)
+        # Same size and mtime, different content: only a checksum notices.
+        dest_file = os.path.join(self.dest_dir, 'file1.txt')
+        stat = os.stat(dest_file)
+        with open(dest_file, 'w') as f:
+            f.write('This is file X')
+        os.utime(dest_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(sync_tree(self.src_dir, self.dest_dir).files, 0)
+        self.assertEqual(sync_tree(self.src_dir, self.dest_dir, checksum=True).files, 1)
+        self.assertEqual(self._read('file1.txt'), 'This is file 1')
+
+    def test_link_strategies(self):
+        self._setup_full_src()
+        for strategy in ["hardlink", "symlink"]:
+            with self.subTest(strategy):
+                sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path, strategy=strategy)
+                self.assertEqual(sync_tree(self.src_dir, self.dest_dir, strategy=strategy).files, 0)
+                self.assertEqual(self._read('subdir', 'file3.txt'), 'This is file 3')
+
+    def test_deleted_symlinked_source_is_removed(self):
+        self._setup_full_src()
+        sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path, strategy="symlink")
+        os.remove(os.path.join(self.src_dir, 'file2.txt'))
+        sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path, strategy="symlink")
+        self.assertFalse(os.path.lexists(os.path.join(self.dest_dir, 'file2.txt')))
+
+    def test_deleted_source_is_removed(self):
+        self.setup_src_and_dest()
+        sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path)
+        os.remove(os.path.join(self.src_dir, 'subdir', 'file3.txt'))
+        sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path)
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, 'subdir', 'file3.txt')))
+        # Files that didn't come from src are left alone.
+        self.assertEqual(self._read('dest-file.txt'), 'This file is unique to dest')
+
+    def test_deleted_source_is_removed_after_renderer_change(self):
+        self.setup_src_and_dest()
+        sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path)
+        os.remove(os.path.join(self.src_dir, 'subdir', 'file3.txt'))
+        with mock.patch('processors.manifest.RENDERER_VERSION', -1):
+            sync_tree(self.src_dir, self.dest_dir, manifest_path=self.manifest_path)
+        self.assertFalse(os.path.exists(os.path.join(self.dest_dir, 'subdir', 'file3.txt')))
@@ -0,0 +1,123 @@
+import os, threading, urllib.error, urllib.request
+from test_utils import TestRunner
+from processors.build import build_site
+from processors.generate_page import find_pages
+from processors.dev_server import LIVE_RELOAD_SCRIPT, LiveReload, SiteRenderer, bind_server, inject_live_reload, make_handler
+from processors.test_generate_page import GeneratePagesTestCase
+
+class TestInjectLiveReload(TestRunner):
+    def test_inject_live_reload(self):
+        cases = [
+            {"name": "body", "html": "<body><p>Hi</p></body></html>", "expected": f"<body><p>Hi</p>{LIVE_RELOAD_SCRIPT}</body></html>"},
+            {"name": "no body", "html": "<p>Hi</p>", "expected": f"<p>Hi</p>{LIVE_RELOAD_SCRIPT}"},
+        ]
+        def test_func(case):
+            self.assertEqual(inject_live_reload(case["html"]), case["expected"])
+        self.run_tests(cases, test_func)
+
+class DevServerTestCase(GeneratePagesTestCase):
+    """DevServerTestCase adds a static directory and a SiteRenderer to the content tree of GeneratePagesTestCase."""
+    def setUp(self):
+        super().setUp()
+        self.static_dir = os.path.join(self.test_dir, 'static')
+        self._write(os.path.join(self.static_dir, 'index.css'), "body {}")
+        self._write(os.path.join(self.static_dir, 'images', 'logo.svg'), "<svg/>")
+        self.renderer = SiteRenderer(self.content_dir, self.static_dir, self.template_path, "article", live_reload=False)
+
+class TestSiteRenderer(DevServerTestCase):
+    def test_resolve(self):
+        page = lambda *path: ("page", os.path.join(self.content_dir, *path))
+        static = lambda *path: ("static", os.path.join(self.static_dir, *path))
+        cases = [
+            {"name": "root", "url_path": "/", "expected": page('index.md')},
+            {"name": "index.html", "url_path": "/index.html", "expected": page('index.md')},
+            {"name": "nested page", "url_path": "/blog/a/", "expected": page('blog', 'a', 'index.md')},
+            {"name": "nested index.html", "url_path": "/blog/a/index.html", "expected": page('blog', 'a', 'index.md')},
+            {"name": "missing slash", "url_path": "/blog/a", "expected": ("redirect", "/blog/a/")},
+            {"name": "static file", "url_path": "/index.css", "expected": static('index.css')},
+            {"name": "nested static file", "url_path": "/images/logo.svg", "expected": static('images', 'logo.svg')},
+            {"name": "quoted", "url_path": "/images/%6Cogo.svg", "expected": static('images', 'logo.svg')},
+            {"name": "static directory", "url_path": "/images", "expected": ("redirect", "/images/")},
+            {"name": "missing", "url_path": "/missing.html", "expected": (None, None)},
+            {"name": "traversal", "url_path": "/../template.html", "expected": (None, None)},
+        ]
+        def test_func(case):
+            self.assertEqual(self.renderer.resolve(case["url_path"]), case["expected"])
+        self.run_tests(cases, test_func)
+
+    def test_resolve_with_base_path(self):
+        self.renderer.base_path = "/repo/"
+        self.assertEqual(self.renderer.resolve("/repo/"), ("page", os.path.join(self.content_dir, 'index.md')))
+        self.assertEqual(self.renderer.resolve("/repo/index.css"), ("static", os.path.join(self.static_dir, 'index.css')))
+        self.assertEqual(self.renderer.resolve("/index.css"), (None, None))
+
+    def test_page_matches_build(self):
+        files = build_site(self.content_dir, self.static_dir, self.template_path)
+        for src_path, dest_path, _ in find_pages(self.content_dir, ""):
+            with self.subTest(src_path):
+                self.assertEqual(self.renderer.page(src_path), files[dest_path.replace(os.sep, "/")])
+
+    def test_page_cache(self):
+        src_path = os.path.join(self.content_dir, 'index.md')
+        self.renderer.page(src_path)
+        self.renderer.page(src_path)
+        self.assertEqual(self.renderer.renders, 1)
+        self._write(src_path, "# Home\n\nChanged")
+        self.assertIn(b"Changed", self.renderer.page(src_path))
+        self._write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertTrue(self.renderer.page(src_path).startswith(b"<h1>Home</h1>"))
+        self.assertEqual(self.renderer.renders, 3)
+
+class TestLiveReload(DevServerTestCase):
+    def test_version_changes(self):
+        live_reload = LiveReload([self.content_dir, self.static_dir, self.template_path])
+        live_reload.check()
+        self.assertEqual(live_reload.version, 0)
+        self.assertEqual(live_reload.wait(0, timeout=0.01), 0)
+        self._write(os.path.join(self.static_dir, 'index.css'), "body { color: red; }")
+        threading.Timer(0.05, live_reload.check).start()
+        self.assertEqual(live_reload.wait(0, timeout=5), 1)
+
+class TestDevServer(DevServerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.live_reload = LiveReload([self.content_dir, self.static_dir, self.template_path])
+        self.server = bind_server(make_handler(self.renderer, self.live_reload, keepalive=0.05), port=0)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://localhost:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        return super().tearDown()
+
+    def _get(self, path):
+        with urllib.request.urlopen(self.url + path, timeout=5) as response:
+            return response.status, response.headers["Content-Type"], response.read()
+
+    def test_pages_and_static_files(self):
+        self.assertEqual(self._get("/"), (200, "text/html; charset=utf-8", b"<title>Home</title><article><h1>Home</h1><p>Hello</p></article>"))
+        self.assertEqual(self._get("/index.css"), (200, "text/css", b"body {}"))
+        # urllib follows the redirect to /blog/b/.
+        self.assertEqual(self._get("/blog/b")[2], b"<title>B</title><div><h1>B</h1><p>Post <b>b</b></p></div>")
+
+    def test_errors(self):
+        cases = [
+            {"name": "not found", "path": "/missing.html", "status": 404},
+            {"name": "bad page", "path": "/contact/", "status": 500},
+        ]
+        self._write(os.path.join(self.content_dir, 'contact', 'index.md'), "No title")
+        def test_func(case):
+            with self.assertRaises(urllib.error.HTTPError) as context:
+                self._get(case["path"])
+            self.assertEqual(context.exception.code, case["status"])
+        self.run_tests(cases, test_func)
+
+    def test_live_reload_events(self):
+        with urllib.request.urlopen(self.url + "/__livereload", timeout=5) as response:
+            self.assertEqual(response.headers["Content-Type"], "text/event-stream")
+            self.assertEqual(response.readline(), b": keepalive\n")
+            self._write(os.path.join(self.content_dir, 'index.md'), "# Home\n\nChanged")
+            self.live_reload.check()
+            lines = [response.readline() for _ in range(4)]
+            self.assertIn(b"data: reload\n", lines)
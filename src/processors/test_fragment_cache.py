@@ -0,0 +1,174 @@
+import contextlib, io, os, shutil, tarfile
+from unittest import mock
+from processors.fragment_cache import FragmentCache, WRITE_BATCH_CHUNKS, is_entry_name
+from processors.generate_page import generate_pages_recursively, page_renderer
+from processors.manifest import file_hash
+from processors.test_generate_page import GeneratePagesTestCase
+
+class FragmentCacheTestCase(GeneratePagesTestCase):
+    """FragmentCacheTestCase adds a FragmentCache in the test directory to the content tree of GeneratePagesTestCase."""
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.test_dir, 'cache', 'fragments')
+        self.fragments = FragmentCache(self.cache_dir)
+        self.index_path = os.path.join(self.content_dir, 'index.md')
+
+    def _render(self, fragments=None):
+        chunks = []
+        page_renderer(self.index_path, self.template_path, "article", "/repo/", fragments=fragments)(chunks.append)
+        if fragments is not None:
+            fragments.flush()
+        return "".join(chunks)
+
+class TestFragmentCache(FragmentCacheTestCase):
+    def test_key(self):
+        key = self.fragments.key(self.index_path, "article", "/")
+        self.assertEqual(len(key), 64)
+        self.assertEqual(self.fragments.key(self.index_path, "article", "/"), key)
+        self.assertNotEqual(self.fragments.key(self.index_path, "div", "/"), key)
+        self.assertNotEqual(self.fragments.key(self.index_path, "article", "/repo/"), key)
+        with mock.patch('processors.fragment_cache.RENDERER_VERSION', -1):
+            self.assertNotEqual(self.fragments.key(self.index_path, "article", "/"), key)
+        self._write(self.index_path, "# Home\n\nChanged")
+        self.assertNotEqual(self.fragments.key(self.index_path, "article", "/"), key)
+
+    def test_key_with_source_hash(self):
+        source_hash = file_hash(self.index_path)
+        key = self.fragments.key(self.index_path, "article", "/")
+        with mock.patch('processors.fragment_cache.file_hash', side_effect=AssertionError("hashed")):
+            self.assertEqual(self.fragments.key(self.index_path, "article", "/", source_hash), key)
+
+    def test_get_and_put(self):
+        key = "ab" * 32
+        self.assertIsNone(self.fragments.get(key))
+        self.fragments.put(key, "Title", "<p>Content</p>")
+        self.assertEqual(self.fragments.get(key), ("Title", "<p>Content</p>"))
+        self.assertEqual((self.fragments.hits, self.fragments.misses), (1, 1))
+        self.assertEqual(len(self.fragments.entries()), 1)
+
+    def test_put_later(self):
+        key = "ab" * 32
+        chunks = ['<p class="x">', 'Caf\u00e9\n', '\\</p>'] * WRITE_BATCH_CHUNKS
+        self.fragments.put_later(key, "Title", chunks)
+        self.fragments.flush()
+        self.assertEqual(self.fragments.get(key), ("Title", "".join(chunks)))
+        # The entry is the same as one written by put.
+        with open(self.fragments._entry_path(key)) as f:
+            entry = f.read()
+        self.fragments.put(key, "Title", "".join(chunks))
+        with open(self.fragments._entry_path(key)) as f:
+            self.assertEqual(f.read(), entry)
+
+    def test_put_later_error(self):
+        # A file where the cache directory should be makes every write fail.
+        self._write(self.cache_dir, "")
+        self.fragments.put_later("ab" * 32, "Title", ["<p>"])
+        self.fragments.flush()
+        self.assertIsNone(self.fragments.get("ab" * 32))
+
+    def test_prune_removes_least_recently_used(self):
+        keys = [f"{i:02x}" * 32 for i in range(4)]
+        for i, key in enumerate(keys):
+            self.fragments.put(key, "T", "x" * 100)
+            path = self.fragments._entry_path(key)
+            os.utime(path, ns=(i * 10**9, i * 10**9))
+        # Reading an entry makes it the most recently used.
+        self.fragments.get(keys[0])
+        size = self.fragments.entries()[0][1]
+        self.fragments.max_bytes = 2 * size
+        self.assertEqual(self.fragments.prune(), 2)
+        self.assertIsNotNone(self.fragments.get(keys[0]))
+        self.assertIsNotNone(self.fragments.get(keys[3]))
+        self.assertIsNone(self.fragments.get(keys[1]))
+
+    def test_export_and_import(self):
+        keys = ["ab" * 32, "cd" * 32]
+        for key in keys:
+            self.fragments.put(key, key, "<p>x</p>")
+        archive_path = os.path.join(self.test_dir, 'fragments.tar.gz')
+        self.assertEqual(self.fragments.export_archive(archive_path), 2)
+
+        imported = FragmentCache(os.path.join(self.test_dir, 'other'))
+        self.assertEqual(imported.import_archive(archive_path), 2)
+        for key in keys:
+            self.assertEqual(imported.get(key), (key, "<p>x</p>"))
+
+    def test_import_skips_other_files(self):
+        archive_path = os.path.join(self.test_dir, 'bad.tar')
+        with tarfile.open(archive_path, "w") as archive:
+            for name in ["../outside.json", "ab/not-a-key.json", "ab/" + "c" * 62 + ".json"]:
+                data = b'["T", "C"]'
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                archive.addfile(info, io.BytesIO(data))
+        self.assertEqual(self.fragments.import_archive(archive_path), 1)
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir, 'cache', 'outside.json')))
+        self.assertEqual(self.fragments.get("ab" + "c" * 62), ("T", "C"))
+
+    def test_is_entry_name(self):
+        cases = [
+            {"name": "entry", "path": "ab/" + "0" * 62 + ".json", "expected": True},
+            {"name": "short key", "path": "ab/0.json", "expected": False},
+            {"name": "not hex", "path": "ab/" + "g" * 62 + ".json", "expected": False},
+            {"name": "temporary file", "path": "ab/" + "0" * 62 + ".json.1.tmp", "expected": False},
+            {"name": "nested", "path": "x/ab/" + "0" * 62 + ".json", "expected": False},
+        ]
+        def test_func(case):
+            self.assertEqual(is_entry_name(case["path"]), case["expected"])
+        self.run_tests(cases, test_func)
+
+class TestRenderWithFragments(FragmentCacheTestCase):
+    def test_same_page(self):
+        expected = self._render()
+        self.assertEqual(self._render(self.fragments), expected)
+        self.assertEqual(self._render(self.fragments), expected)
+        self.assertEqual((self.fragments.hits, self.fragments.misses), (1, 1))
+
+    def test_hit_skips_parse(self):
+        self._render(self.fragments)
+        self._write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        with mock.patch('processors.generate_page.parse_page', side_effect=AssertionError("parsed")):
+            self.assertEqual(self._render(self.fragments), "<h1>Home</h1><article><h1>Home</h1><p>Hello</p></article>")
+
+    def test_build_summary(self):
+        dest_dir = os.path.join(self.test_dir, 'public')
+        for expected in ["0 hits, 4 misses", "4 hits, 0 misses"]:
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=1, fragments=self.fragments)
+            self.assertIn(f"Fragment cache: {expected}", output.getvalue())
+
+    def test_build_with_workers(self):
+        dest_dir = os.path.join(self.test_dir, 'public')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=2, fragments=self.fragments)
+        # The workers write their entries before they exit.
+        self.assertEqual(len(self.fragments.entries()), len(self.pages))
+
+    def test_build_stays_within_max_bytes(self):
+        for jobs in [1, 2]:
+            with self.subTest(jobs):
+                shutil.rmtree(self.cache_dir, ignore_errors=True)
+                fragments = FragmentCache(self.cache_dir, max_bytes=100)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_pages_recursively(self.content_dir, self.template_path, os.path.join(self.test_dir, f'public-{jobs}'), "article", jobs=jobs, fragments=fragments)
+                # Every entry was written before the prune, which kept the ones that fit.
+                sizes = [size for _, size, _ in fragments.entries()]
+                self.assertLessEqual(sum(sizes), 100)
+                self.assertGreater(len(sizes), 0)
+
+    def test_build_with_manifest(self):
+        dest_dir = os.path.join(self.test_dir, 'public')
+        manifest_path = os.path.join(self.test_dir, 'cache', 'manifest.json')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=1, manifest_path=manifest_path, fragments=self.fragments)
+        self._write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        output = io.StringIO()
+        # The keys are made from the hashes in the manifest, so the sources
+        # are neither hashed nor parsed again.
+        with mock.patch('processors.fragment_cache.file_hash', side_effect=AssertionError("hashed")), \
+             mock.patch('processors.generate_page.parse_page', side_effect=AssertionError("parsed")), \
+             contextlib.redirect_stdout(output):
+            generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=1, manifest_path=manifest_path, fragments=self.fragments)
+        self.assertIn("Fragment cache: 4 hits, 0 misses", output.getvalue())
+        self.assertEqual(self._read_tree(dest_dir)['index.html'], "<h1>Home</h1><article><h1>Home</h1><p>Hello</p></article>")
@@ -1,55 +1,301 @@
+import contextlib, io, os, re, shutil
+from unittest import mock
 from test_utils import TestRunner
-from processors.generate_page import extract_title
-
-class TestExtractTitleFromMarkdown(TestRunner):
-    cases = [
-        {
-            "name": "one line",
-            "markdown": "# Title",
-            "expected_raise": False,
-            "expected": "Title"
-        },
-        {
-            "name": "title first",
-            "markdown": "# Title\n\n more stuff",
-            "expected_raise": False,
-            "expected": "Title"
-        },
-        {
-            "name": "title not first",
-            "markdown": "stuff\n\n# Title",
-            "expected_raise": False,
-            "expected": "Title"
-        },
-        {
-            "name": "whitespace stripped",
-            "markdown": "#  stripped title  \n\nstuff",
-            "expected_raise": False,
-            "expected": "stripped title"
-        },
-
-        {
-            "name": "only h2",
-            "markdown": "## Not h1\n\nstuff",
-            "expected_raise": True
-        },
-        {
-            "name": "no heading",
-            "markdown": "Not heading\n\nstuff",
-            "expected_raise": True
-        },
-    ]
-
-    def test_cases(self):
+from markdown_to_html_nodes.markdown_to_html_node import markdown_to_html_node
+from processors.copy_tree import copy_file
+from processors.generate_page import generate_page, generate_pages_recursively, find_pages, parse_page, use_caches
+
+class TestGeneratePage(TestRunner):
+    def setUp(self):
+        super().setUp()
+        self.test_dir = '/tmp/test_generate_page'
+        self.markdown_path = os.path.join(self.test_dir, 'content', 'index.md')
+        self.template_path = os.path.join(self.test_dir, 'template.html')
+        self.dest_path = os.path.join(self.test_dir, 'public', 'index.html')
+        os.makedirs(os.path.dirname(self.markdown_path), exist_ok=True)
+        with open(self.markdown_path, 'w') as f:
+            f.write("# Title\n\nA [link](/about) and ![image](/images/a.png)")
+        with open(self.template_path, 'w') as f:
+            f.write('<title>{{ Title }}</title><link href="/index.css"><body>{{ Content }}</body>')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def test_parse_page_title(self):
+        cases = [
+            {
+                "name": "one line",
+                "markdown": "# Title",
+                "expected_raise": False,
+                "expected": "Title"
+            },
+            {
+                "name": "title first",
+                "markdown": "# Title\n\n more stuff",
+                "expected_raise": False,
+                "expected": "Title"
+            },
+            {
+                "name": "title not first",
+                "markdown": "stuff\n\n# Title",
+                "expected_raise": False,
+                "expected": "Title"
+            },
+            {
+                "name": "whitespace stripped",
+                "markdown": "#  stripped title  \n\nstuff",
+                "expected_raise": False,
+                "expected": "stripped title"
+            },
+
+            {
+                "name": "only h2",
+                "markdown": "## Not h1\n\nstuff",
+                "expected_raise": True
+            },
+            {
+                "name": "no heading",
+                "markdown": "Not heading\n\nstuff",
+                "expected_raise": True
+            },
+        ]
         def test_func(case):
+            with open(self.markdown_path, 'w') as f:
+                f.write(case["markdown"])
             if not case["expected_raise"]:
-                actual = extract_title(case["markdown"])
-                self.assertEqual(actual, case["expected"])
+                title, _ = parse_page(self.markdown_path)
+                self.assertEqual(title, case["expected"])
             else:
                 self.assert_raises_exception(
-                    ValueError, 
-                    "Expected markdown to contain one h1.", 
-                    extract_title, 
-                    case["markdown"]
+                    ValueError,
+                    "Expected markdown to contain one h1.",
+                    parse_page,
+                    self.markdown_path
                 )
-        self.run_tests(self.cases, test_func)
\ No newline at end of file
+        self.run_tests(cases, test_func)
+
+    def read_dest(self):
+        with open(self.dest_path, 'r') as f:
+            return f.read()
+
+    def test_writes_page(self):
+        generate_page(self.markdown_path, self.template_path, self.dest_path)
+        self.assertEqual(self.read_dest(), '<title>Title</title><link href="/index.css"><body><div><h1>Title</h1><p>A <a href="/about">link</a> and <img src="/images/a.png" alt="image"></p></div></body>')
+
+    def test_writes_page_with_base_path(self):
+        generate_page(self.markdown_path, self.template_path, self.dest_path, base_path="/repo/")
+        self.assertEqual(self.read_dest(), '<title>Title</title><link href="/repo/index.css"><body><div><h1>Title</h1><p>A <a href="/repo/about">link</a> and <img src="/repo/images/a.png" alt="image"></p></div></body>')
+
+    def test_base_path_leaves_code_alone(self):
+        with open(self.markdown_path, 'w') as f:
+            f.write('# Title\n\n`<a href="/about">`')
+        generate_page(self.markdown_path, self.template_path, self.dest_path, base_path="/repo/")
+        self.assertIn('<code><a href="/about"></code>', self.read_dest())
+
+    def test_title_from_parse(self):
+        cases = [
+            {"name": "first h1", "markdown": "Intro\n\n## Sub\n\n#  First  \n\n# Second", "expected": "First"},
+            {"name": "after extra newlines", "markdown": "Intro\n\n\n# Title", "expected": "Title"},
+            {"name": "indented", "markdown": "Intro\n\n  # Title", "expected": "Title"},
+        ]
+        def test_func(case):
+            with open(self.markdown_path, 'w') as f:
+                f.write(case["markdown"])
+            self.assertEqual(parse_page(self.markdown_path)[0], case["expected"])
+        self.run_tests(cases, test_func)
+
+    def test_no_title(self):
+        with open(self.markdown_path, 'w') as f:
+            f.write("## Not h1\n\n```\n# code\n```")
+        self.assert_raises_exception(ValueError, "Expected markdown to contain one h1.", parse_page, self.markdown_path)
+
+    def test_parses_lines_of_the_file(self):
+        cases = [
+            {"name": "plain", "markdown": "\n\nIntro é\n\n\n\n# Title\n\n* a\n* b\n\n\n\n```\ncode\n```\n"},
+            {"name": "carriage returns", "markdown": "Intro\r\n\r\n# Title\r\n\r\nText\r\n"},
+            {"name": "no final newline", "markdown": "# Title\n\nText"},
+        ]
+        def test_func(case):
+            with open(self.markdown_path, 'w', newline="") as f:
+                f.write(case["markdown"])
+            lines = []
+            def markdown_lines(file):
+                for line in file:
+                    lines.append(line)
+                    yield line
+            with mock.patch('processors.generate_page.markdown_lines', markdown_lines):
+                title, html = parse_page(self.markdown_path)
+            self.assertEqual(title, "Title")
+            self.assertEqual(html, markdown_to_html_node(case["markdown"].replace("\r\n", "\n")))
+            self.assertEqual("".join(lines), case["markdown"].replace("\r\n", "\n"))
+        self.run_tests(cases, test_func)
+
+class GeneratePagesTestCase(TestRunner):
+    """GeneratePagesTestCase sets up a small content tree and template for the tests of generate_pages_recursively."""
+    def setUp(self):
+        super().setUp()
+        self.test_dir = '/tmp/test_generate_pages_recursively'
+        self.content_dir = os.path.join(self.test_dir, 'content')
+        self.template_path = os.path.join(self.test_dir, 'template.html')
+        self.pages = {
+            'index.md': "# Home\n\nHello",
+            os.path.join('blog', 'a', 'index.md'): "# A\n\nPost *a*",
+            os.path.join('blog', 'b', 'index.md'): "# B\n\nPost **b**",
+            os.path.join('contact', 'index.md'): "# Contact\n\n[Mail](/mail)",
+        }
+        for path, markdown in self.pages.items():
+            self._write(os.path.join(self.content_dir, path), markdown)
+        self._write(self.template_path, "<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def _write(self, path, text):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+
+    def _read_tree(self, dirpath):
+        tree = {}
+        for root, _, files in os.walk(dirpath):
+            for name in files:
+                path = os.path.join(root, name)
+                with open(path) as f:
+                    tree[os.path.relpath(path, dirpath)] = f.read()
+        return tree
+
+class TestGeneratePagesRecursively(GeneratePagesTestCase):
+    def test_find_pages(self):
+        dest_dir = os.path.join(self.test_dir, 'public')
+        expected = [
+            (os.path.join(self.content_dir, 'blog', 'a', 'index.md'), os.path.join(dest_dir, 'blog', 'a', 'index.html'), "div"),
+            (os.path.join(self.content_dir, 'blog', 'b', 'index.md'), os.path.join(dest_dir, 'blog', 'b', 'index.html'), "div"),
+            (os.path.join(self.content_dir, 'contact', 'index.md'), os.path.join(dest_dir, 'contact', 'index.html'), "div"),
+            (os.path.join(self.content_dir, 'index.md'), os.path.join(dest_dir, 'index.html'), "article"),
+        ]
+        self.assertEqual(find_pages(self.content_dir, dest_dir, "article"), expected)
+
+    def test_jobs_produce_same_tree(self):
+        trees = []
+        for jobs in [1, 2, 4]:
+            with self.subTest(jobs):
+                dest_dir = os.path.join(self.test_dir, f'public-{jobs}')
+                generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=jobs)
+                trees.append(self._read_tree(dest_dir))
+                self.assertEqual(len(trees[-1]), len(self.pages))
+        self.assertEqual(trees[0], trees[1])
+        self.assertEqual(trees[0], trees[2])
+
+    def test_block_cache(self):
+        footer = "\n\nLicensed under [MIT](/license)."
+        for path, markdown in self.pages.items():
+            self._write(os.path.join(self.content_dir, path), markdown + footer)
+        expected_dir = os.path.join(self.test_dir, 'public')
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_pages_recursively(self.content_dir, self.template_path, expected_dir, "article", jobs=1)
+        for jobs in [1, 2]:
+            with self.subTest(jobs):
+                # Start from an empty cache, which forked workers would inherit.
+                use_caches()
+                dest_dir = os.path.join(self.test_dir, f'public-{jobs}')
+                output = io.StringIO()
+                with contextlib.redirect_stdout(output):
+                    generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=jobs, block_cache_size=16)
+                self.assertEqual(self._read_tree(dest_dir), self._read_tree(expected_dir))
+                hits, misses = map(int, re.search(r"Block cache: (\d+) hits, (\d+) misses", output.getvalue()).groups())
+                self.assertEqual(hits + misses, 12)
+                # Each process that generates a page misses the footer once.
+                if jobs == 1:
+                    self.assertEqual(hits, 3)
+
+    def test_page_replaces_linked_static_file(self):
+        static_path = os.path.join(self.test_dir, 'static', 'index.html')
+        self._write(static_path, "<p>Static</p>")
+        for strategy in ["hardlink", "symlink"]:
+            with self.subTest(strategy):
+                dest_dir = os.path.join(self.test_dir, f'public-{strategy}')
+                dest_path = os.path.join(dest_dir, 'index.html')
+                os.makedirs(dest_dir)
+                copy_file(static_path, dest_path, strategy=strategy)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    generate_pages_recursively(self.content_dir, self.template_path, dest_dir, "article", jobs=1)
+                with open(static_path) as f:
+                    self.assertEqual(f.read(), "<p>Static</p>")
+                self.assertFalse(os.path.islink(dest_path))
+                self.assertEqual(self._read_tree(dest_dir)['index.html'], "<title>Home</title><article><h1>Home</h1><p>Hello</p></article>")
+
+    def test_failed_page(self):
+        self._write(os.path.join(self.content_dir, 'blog', 'a', 'index.md'), "No title")
+        dest_dir = os.path.join(self.test_dir, 'public')
+        self.assert_raises_exception(
+            RuntimeError,
+            "1 of 4 pages failed to generate.",
+            generate_pages_recursively,
+            self.content_dir, self.template_path, dest_dir, jobs=2)
+        # The other pages are still generated.
+        self.assertEqual(len(self._read_tree(dest_dir)), 3)
+
+class TestIncrementalBuild(GeneratePagesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.dest_dir = os.path.join(self.test_dir, 'public')
+        self.manifest_path = os.path.join(self.test_dir, 'cache', 'manifest.json')
+
+    def _build(self):
+        """_build runs an incremental build and returns the source paths of the pages it generated."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            generate_pages_recursively(self.content_dir, self.template_path, self.dest_dir, jobs=1, manifest_path=self.manifest_path)
+        generated = []
+        for line in output.getvalue().splitlines():
+            if line.startswith("Generating page from "):
+                generated.append(os.path.relpath(line.split(" ")[3], self.content_dir))
+        return generated
+
+    def test_no_op_rebuild(self):
+        self.assertEqual(len(self._build()), len(self.pages))
+        self.assertEqual(self._build(), [])
+
+    def test_changed_page(self):
+        self._build()
+        self._write(os.path.join(self.content_dir, 'contact', 'index.md'), "# Contact\n\nChanged")
+        self.assertEqual(self._build(), [os.path.join('contact', 'index.md')])
+        self.assertIn("Changed", self._read_tree(self.dest_dir)[os.path.join('contact', 'index.html')])
+
+    def test_touched_page_is_not_rebuilt(self):
+        self._build()
+        os.utime(os.path.join(self.content_dir, 'index.md'), ns=(1, 1))
+        self.assertEqual(self._build(), [])
+
+    def test_template_change_rebuilds_all(self):
+        self._build()
+        self._write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(len(self._build()), len(self.pages))
+
+    def test_missing_output_is_rebuilt(self):
+        self._build()
+        os.remove(os.path.join(self.dest_dir, 'index.html'))
+        self.assertEqual(self._build(), ['index.md'])
+
+    def test_deleted_source_removes_output(self):
+        self._build()
+        shutil.rmtree(os.path.join(self.content_dir, 'blog', 'b'))
+        self.assertEqual(self._build(), [])
+        self.assertNotIn(os.path.join('blog', 'b', 'index.html'), self._read_tree(self.dest_dir))
+
+    def test_deleted_source_removes_output_when_template_changes(self):
+        self._build()
+        shutil.rmtree(os.path.join(self.content_dir, 'contact'))
+        self._write(self.template_path, "<!-- changed -->{{ Content }}")
+        self.assertEqual(len(self._build()), len(self.pages) - 1)
+        self.assertNotIn(os.path.join('contact', 'index.html'), self._read_tree(self.dest_dir))
+        self.assertEqual(self._build(), [])
+
+    def test_deleted_source_removes_output_when_renderer_changes(self):
+        self._build()
+        shutil.rmtree(os.path.join(self.content_dir, 'blog', 'b'))
+        with mock.patch('processors.manifest.RENDERER_VERSION', -1):
+            self.assertEqual(len(self._build()), len(self.pages) - 1)
+        self.assertNotIn(os.path.join('blog', 'b', 'index.html'), self._read_tree(self.dest_dir))
@@ -0,0 +1,116 @@
+import contextlib, io, os
+from unittest import mock
+from markdown_to_html_nodes import markdown_to_html_node
+from nodes.htmlnode import HTMLNode
+from processors import generate_page, profiler
+from processors.profiler import Profiler, start_profiling, stop_profiling, format_seconds
+from processors.test_generate_page import GeneratePagesTestCase
+from test_utils import TestRunner
+
+class TestProfiler(TestRunner):
+    def _fake_clock(self):
+        """_fake_clock patches perf_counter to return 0, 1, 2 and so on, so each stage takes one second per call to it."""
+        ticks = iter(range(1000))
+        return mock.patch('processors.profiler.time.perf_counter', side_effect=lambda: next(ticks))
+
+    def test_nested_stages_are_exclusive(self):
+        p = Profiler()
+        with self._fake_clock():
+            p.enter("page")        # 0
+            p.enter("parse")       # 1
+            p.enter("tokenize")    # 2
+            p.exit()               # 3
+            p.exit()               # 4
+            p.exit()               # 5
+        self.assertEqual(p.stages, {"page": [2, 1], "parse": [2, 1], "tokenize": [1, 1]})
+
+    def test_timed(self):
+        p = Profiler()
+        double = p.timed("double", lambda x: 2 * x)
+        self.assertEqual([double(1), double(2)], [2, 4])
+        self.assertEqual(p.stages["double"][1], 2)
+        self.assertRaises(ZeroDivisionError, p.timed("fail", lambda: 1 / 0))
+        self.assertEqual(p.stages["fail"][1], 1)
+        self.assertEqual(p._stack, [])
+
+    def test_timed_iterator(self):
+        p = Profiler()
+        items = p.timed_iterator("split", lambda n: iter(range(n)))
+        self.assertEqual(list(items(3)), [0, 1, 2])
+        # Three items and the step that ends the iterator.
+        self.assertEqual(p.stages["split"][1], 4)
+
+    def test_pages(self):
+        p = Profiler()
+        with self._fake_clock():
+            with p.stage("copy"):
+                pass
+            p.start_page()
+            with p.stage("read"):
+                pass
+            page = p.end_page()
+        self.assertEqual(page, {"read": [1, 1]})
+        self.assertEqual(p.stages, {"copy": [1, 1]})
+        p.add_page("a.md", page)
+        p.add_page("b.md", {"read": [3, 1], "write": [2, 4]})
+        self.assertEqual(p.stages, {"copy": [1, 1], "read": [4, 2], "write": [2, 4]})
+        self.assertEqual(p.pages[1], ("b.md", 5, {"read": [3, 1], "write": [2, 4]}))
+
+    def test_report(self):
+        p = Profiler()
+        p.stages["copy"] = [0.5, 1]
+        for i in range(5):
+            p.add_page(f"page-{i}.md", {"read": [i / 100, 1], "render": [0.01, 2]})
+        report = p.report(top=2)
+        self.assertIn("copy", report)
+        self.assertIn("Slowest 2 of 5 pages:", report)
+        self.assertIn("page-4.md", report)
+        self.assertIn("page-3.md", report)
+        self.assertNotIn("page-2.md", report)
+        self.assertLess(report.index("read"), report.index("render"))
+
+    def test_format_seconds(self):
+        cases = [
+            {"name": "microseconds", "seconds": 2.5e-6, "expected": "2.5 us"},
+            {"name": "milliseconds", "seconds": 0.0125, "expected": "12.50 ms"},
+            {"name": "seconds", "seconds": 3, "expected": "3.00 s"},
+        ]
+        def test_func(case):
+            self.assertEqual(format_seconds(case["seconds"]), case["expected"])
+        self.run_tests(cases, test_func)
+
+class TestStartProfiling(GeneratePagesTestCase):
+    def tearDown(self):
+        stop_profiling()
+        return super().tearDown()
+
+    def _originals(self):
+        return [generate_page.markdown_lines, generate_page.parse_page, generate_page.write_page,
+                markdown_to_html_node.text_to_textnodes, markdown_to_html_node.block_to_block_type, HTMLNode.render_to]
+
+    def test_start_and_stop(self):
+        originals = self._originals()
+        p = start_profiling()
+        self.assertIs(profiler.active, p)
+        self.assertIs(start_profiling(), p)
+        for original, hooked in zip(originals, self._originals()):
+            self.assertIsNot(original, hooked)
+        self.assertIs(stop_profiling(), p)
+        self.assertIsNone(profiler.active)
+        # Once profiling stops, the original functions run, untimed.
+        for original, restored in zip(originals, self._originals()):
+            self.assertIs(original, restored)
+
+    def test_build(self):
+        dest_dirs = [os.path.join(self.test_dir, name) for name in ['public', 'profiled']]
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_page.generate_pages_recursively(self.content_dir, self.template_path, dest_dirs[0], "article", "/repo/", jobs=1)
+            for jobs in [1, 2]:
+                p = start_profiling()
+                generate_page.generate_pages_recursively(self.content_dir, self.template_path, dest_dirs[1], "article", "/repo/", jobs=jobs)
+                stop_profiling()
+                self.assertEqual(self._read_tree(dest_dirs[1]), self._read_tree(dest_dirs[0]))
+                self.assertEqual(sorted(name for name, _, _ in p.pages), sorted(os.path.join(self.content_dir, path) for path in self.pages))
+                for stage in ["read", "split", "classify", "tokenize", "parse", "render", "template", "write", "page"]:
+                    self.assertIn(stage, p.stages)
+                self.assertEqual(p.stages["page"][1], len(self.pages))
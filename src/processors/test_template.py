@@ -0,0 +1,84 @@
+import os, shutil
+from test_utils import TestRunner
+from processors.template import Template, load_template
+
+class TestTemplate(TestRunner):
+    cases = [
+        {
+            "name": "title and content",
+            "source": "<title>{{ Title }}</title><body>{{ Content }}</body>",
+            "expected": "<title>A title</title><body><p>content</p></body>",
+        },
+        {
+            "name": "placeholders only",
+            "source": "{{ Title }}{{ Content }}",
+            "expected": "A title<p>content</p>",
+        },
+        {
+            "name": "repeated placeholder",
+            "source": "{{ Title }} - {{ Title }}",
+            "expected": "A title - A title",
+        },
+        {
+            "name": "unknown placeholder is kept",
+            "source": "{{ Unknown }} {{Title}}",
+            "expected": "{{ Unknown }} {{Title}}",
+        },
+        {
+            "name": "no placeholders",
+            "source": "<html></html>",
+            "expected": "<html></html>",
+        },
+    ]
+
+    def test_render_to(self):
+        def test_func(case):
+            chunks = []
+            values = {"Title": "A title", "Content": lambda write: write("<p>content</p>")}
+            Template(case["source"]).render_to(chunks.append, values)
+            self.assertEqual("".join(chunks), case["expected"])
+        self.run_tests(self.cases, test_func)
+
+    def test_base_path(self):
+        chunks = []
+        template = Template('<link href="/index.css"><img src="/a.png">{{ Content }}<a href="https://example.com">', base_path="/repo/")
+        template.render_to(chunks.append, {"Content": '<a href="/about">'})
+        self.assertEqual("".join(chunks), '<link href="/repo/index.css"><img src="/repo/a.png"><a href="/about"><a href="https://example.com">')
+
+class TestLoadTemplate(TestRunner):
+    def setUp(self):
+        super().setUp()
+        self.test_dir = '/tmp/test_load_template'
+        self.template_path = os.path.join(self.test_dir, 'template.html')
+        os.makedirs(self.test_dir, exist_ok=True)
+        self._write_template("<p>{{ Content }}</p>")
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def _write_template(self, source, mtime_ns=1_000_000_000):
+        with open(self.template_path, 'w') as f:
+            f.write(source)
+        os.utime(self.template_path, ns=(mtime_ns, mtime_ns))
+
+    def _render(self, template):
+        chunks = []
+        template.render_to(chunks.append, {"Content": "text"})
+        return "".join(chunks)
+
+    def test_cached(self):
+        template = load_template(self.template_path)
+        self.assertIs(load_template(self.template_path), template)
+
+    def test_reloaded_after_edit(self):
+        template = load_template(self.template_path)
+        self._write_template("<div>{{ Content }}</div>", mtime_ns=2_000_000_000)
+        reloaded = load_template(self.template_path)
+        self.assertIsNot(reloaded, template)
+        self.assertEqual(self._render(reloaded), "<div>text</div>")
+
+    def test_cached_per_base_path(self):
+        template = load_template(self.template_path)
+        self.assertIsNot(load_template(self.template_path, "/repo/"), template)
+        self.assertIs(load_template(self.template_path), template)
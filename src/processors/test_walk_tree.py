@@ -0,0 +1,84 @@
+import os, shutil
+from test_utils import TestRunner
+from processors.walk_tree import TreeItem, walk_tree
+
+class TestWalkTree(TestRunner):
+    def setUp(self):
+        super().setUp()
+        self.test_dir = '/tmp/test_walk_tree'
+        self.src_dir = os.path.join(self.test_dir, 'src')
+        self.dest_dir = os.path.join(self.test_dir, 'dest')
+        for path in ['b.md', os.path.join('a', 'x.md'), os.path.join('a', 'sub', 'y.txt'), 'c.txt']:
+            self._write(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        return super().tearDown()
+
+    def _write(self, rel_path):
+        path = os.path.join(self.src_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(rel_path)
+
+    def _item(self, rel_path, is_dir, depth, dest_rel_path=None):
+        return TreeItem(os.path.join(self.src_dir, rel_path),
+                        os.path.join(self.dest_dir, dest_rel_path or rel_path),
+                        rel_path,
+                        is_dir,
+                        depth)
+
+    def test_walk_tree(self):
+        expected = [
+            self._item('a', True, 0),
+            self._item(os.path.join('a', 'sub'), True, 1),
+            self._item(os.path.join('a', 'sub', 'y.txt'), False, 2),
+            self._item(os.path.join('a', 'x.md'), False, 1),
+            self._item('b.md', False, 0),
+            self._item('c.txt', False, 0),
+        ]
+        self.assertEqual(list(walk_tree(self.src_dir, self.dest_dir)), expected)
+
+    def test_rename(self):
+        rename = lambda name: name.replace('.md', '.html')
+        dest_paths = [item.dest_path for item in walk_tree(self.src_dir, self.dest_dir, rename=rename)]
+        self.assertIn(os.path.join(self.dest_dir, 'a', 'x.html'), dest_paths)
+        self.assertIn(os.path.join(self.dest_dir, 'b.html'), dest_paths)
+
+    def test_symlinks(self):
+        os.symlink(os.path.join(self.src_dir, 'c.txt'), os.path.join(self.src_dir, 'link.txt'))
+        os.symlink(os.path.join(self.src_dir, 'a'), os.path.join(self.src_dir, 'link-dir'))
+        os.symlink(os.path.join(self.src_dir, 'missing'), os.path.join(self.src_dir, 'broken'))
+        links = {'link-dir', os.path.join('link-dir', 'sub', 'y.txt'), 'link.txt', 'broken'}
+        cases = [
+            {"name": "followed", "follow_symlinks": True, "expected": links - {'broken'}},
+            {"name": "skipped", "follow_symlinks": False, "expected": set()},
+        ]
+        def test_func(case):
+            rel_paths = {item.rel_path for item in walk_tree(self.src_dir, self.dest_dir, follow_symlinks=case["follow_symlinks"])}
+            self.assertEqual(rel_paths & links, case["expected"])
+        self.run_tests(cases, test_func)
+
+    def test_empty_directories(self):
+        os.makedirs(os.path.join(self.src_dir, 'a', 'empty'))
+        rel_paths = [item.rel_path for item in walk_tree(self.src_dir, self.dest_dir)]
+        self.assertIn(os.path.join('a', 'empty'), rel_paths)
+        self.assert_raises_exception(OSError, "Source path must not be empty.",
+                                     list, walk_tree(self.src_dir, self.dest_dir, allow_empty=False))
+
+    def test_deep_tree(self):
+        # Deeper than Python's default recursion limit. os.makedirs and
+        # shutil.rmtree recurse, so the tree is built and removed by hand.
+        dirpaths = [os.path.join(self.src_dir, *['d'] * depth) for depth in range(1, 1101)]
+        for dirpath in dirpaths:
+            os.mkdir(dirpath)
+        rel_path = os.path.join(*['d'] * 1100, 'leaf.txt')
+        self._write(rel_path)
+        try:
+            items = list(walk_tree(self.src_dir, self.dest_dir))
+            self.assertEqual(items[-1].rel_path, rel_path)
+            self.assertEqual(items[-1].depth, 1100)
+        finally:
+            os.remove(os.path.join(self.src_dir, rel_path))
+            for dirpath in reversed(dirpaths):
+                os.rmdir(dirpath)
@@ -0,0 +1,130 @@
+import contextlib, io, os, shutil
+from unittest import mock
+from test_utils import TestRunner
+from processors.copy_tree import copy_file, sync_tree
+from processors.generate_page import generate_pages_recursively
+from processors.test_generate_page import GeneratePagesTestCase
+from processors.watch import DependencyGraph, SiteWatcher, changed_files, scan_files
+
+class TestChangedFiles(TestRunner):
+    def test_changed_files(self):
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(changed_files(old, new), (["b"], ["d"], ["c"]))
+
+    def test_scan_skips_removed_directory(self):
+        # The directory is listed, but gone by the time it is scanned.
+        with mock.patch('processors.watch.os.path.isdir', return_value=True):
+            self.assertEqual(scan_files(['/tmp/test_scan_files/missing']), {})
+
+    def test_dependency_graph(self):
+        graph = DependencyGraph()
+        graph.add("page-1", ["a.md", "template.html"])
+        graph.add("page-2", ["b.md", "template.html"])
+        graph.add("static", ["c.png"])
+        self.assertEqual(graph.outputs_for(["b.md"]), ["page-2"])
+        self.assertEqual(graph.outputs_for(["c.png", "template.html", "a.md"]), ["page-1", "page-2", "static"])
+        self.assertEqual(graph.outputs_for(["missing"]), [])
+        self.assertIn("static", graph)
+
+class TestSiteWatcher(GeneratePagesTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static_dir = os.path.join(self.test_dir, 'static')
+        self.dest_dir = os.path.join(self.test_dir, 'public')
+        self._write(os.path.join(self.static_dir, 'index.css'), "body {}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            sync_tree(self.static_dir, self.dest_dir)
+            generate_pages_recursively(self.content_dir, self.template_path, self.dest_dir, "article", jobs=1)
+        self.watcher = SiteWatcher(self.content_dir, self.static_dir, self.template_path, self.dest_dir, "article", jobs=1)
+
+    def _poll(self):
+        """_poll polls the watcher and returns the changed paths, relative to the test directory, and its messages."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            changed = self.watcher.poll()
+        return [os.path.relpath(path, self.test_dir) for path in changed], output.getvalue()
+
+    def test_no_changes(self):
+        self.assertEqual(self._poll(), ([], ""))
+
+    def test_changed_page(self):
+        self._write(os.path.join(self.content_dir, 'contact', 'index.md'), "# Contact\n\nChanged")
+        changed, output = self._poll()
+        self.assertEqual(changed, [os.path.join('content', 'contact', 'index.md')])
+        self.assertEqual(output.count("Generating page"), 1)
+        self.assertIn("Changed", self._read_tree(self.dest_dir)[os.path.join('contact', 'index.html')])
+
+    def test_changed_template(self):
+        self._write(self.template_path, "<h1>{{ Title }}</h1>{{ Content }}")
+        changed, output = self._poll()
+        self.assertEqual(changed, ['template.html'])
+        self.assertEqual(output.count("Generating page"), len(self.pages))
+        self.assertTrue(self._read_tree(self.dest_dir)['index.html'].startswith("<h1>Home</h1>"))
+
+    def test_changed_static_file(self):
+        self._write(os.path.join(self.static_dir, 'index.css'), "body { color: red; }")
+        changed, output = self._poll()
+        self.assertEqual(changed, [os.path.join('static', 'index.css')])
+        self.assertNotIn("Generating page", output)
+        self.assertEqual(self._read_tree(self.dest_dir)['index.css'], "body { color: red; }")
+
+    def test_added_and_removed_files(self):
+        self._write(os.path.join(self.content_dir, 'blog', 'c', 'index.md'), "# C\n\nNew")
+        self._write(os.path.join(self.static_dir, 'images', 'new.svg'), "<svg/>")
+        shutil.rmtree(os.path.join(self.content_dir, 'blog', 'b'))
+        changed, output = self._poll()
+        self.assertEqual(len(changed), 3)
+        tree = self._read_tree(self.dest_dir)
+        self.assertIn("New", tree[os.path.join('blog', 'c', 'index.html')])
+        self.assertEqual(tree[os.path.join('images', 'new.svg')], "<svg/>")
+        self.assertNotIn(os.path.join('blog', 'b', 'index.html'), tree)
+        self.assertEqual(output.count("Generating page"), 1)
+
+    def test_static_file_and_page_with_the_same_path(self):
+        static_path = os.path.join(self.static_dir, 'contact', 'index.html')
+        page_dest = os.path.join('contact', 'index.html')
+        self._write(static_path, "static")
+        self._poll()
+        self.assertIn("<title>Contact</title>", self._read_tree(self.dest_dir)[page_dest])
+
+        os.remove(static_path)
+        _, output = self._poll()
+        self.assertNotIn("Removing", output)
+        self.assertIn("<title>Contact</title>", self._read_tree(self.dest_dir)[page_dest])
+
+        self._write(static_path, "static")
+        self._poll()
+        shutil.rmtree(os.path.join(self.content_dir, 'contact'))
+        _, output = self._poll()
+        self.assertNotIn("Removing", output)
+        self.assertEqual(self._read_tree(self.dest_dir)[page_dest], "static")
+
+    def test_page_replaces_linked_static_file(self):
+        static_path = os.path.join(self.static_dir, 'contact', 'index.html')
+        self._write(static_path, "static")
+        for strategy in ["hardlink", "symlink"]:
+            with self.subTest(strategy):
+                # The first build linked the static file where the page goes.
+                copy_file(static_path, os.path.join(self.dest_dir, 'contact', 'index.html'), strategy=strategy)
+                self.watcher = SiteWatcher(self.content_dir, self.static_dir, self.template_path, self.dest_dir, "article", jobs=1, strategy=strategy)
+                self._write(os.path.join(self.content_dir, 'contact', 'index.md'), f"# Contact\n\n{strategy}")
+                self._poll()
+                with open(static_path) as f:
+                    self.assertEqual(f.read(), "static")
+                self.assertIn(strategy, self._read_tree(self.dest_dir)[os.path.join('contact', 'index.html')])
+
+    def test_failed_page(self):
+        self._write(os.path.join(self.content_dir, 'index.md'), "No title")
+        _, output = self._poll()
+        self.assertIn("Failed to generate page from", output)
+        self._write(os.path.join(self.content_dir, 'index.md'), "# Fixed title")
+        _, output = self._poll()
+        self.assertNotIn("Failed", output)
+        self.assertIn("Fixed title", self._read_tree(self.dest_dir)['index.html'])
+
+    def test_removed_template(self):
+        os.remove(self.template_path)
+        _, output = self._poll()
+        self.assertNotIn("Generating page", output)
+        self.assertEqual(len(self._read_tree(self.dest_dir)), len(self.pages) + 1)
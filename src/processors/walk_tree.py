@@ -0,0 +1,73 @@
+import os
+
+class TreeItem:
+    """
+    TreeItem is a file or directory found by walk_tree.
+
+    - src_path: the path of the file or directory in the source tree
+    - dest_path: the matching path in the destination tree
+    - rel_path: src_path relative to the root of the source tree
+    - is_dir: True for directories, False for files
+    - depth: 0 for items directly in the root, 1 for items in its subdirectories, and so on
+    """
+    __slots__ = ("src_path", "dest_path", "rel_path", "is_dir", "depth")
+
+    def __init__(self, src_path, dest_path, rel_path, is_dir, depth):
+        self.src_path = src_path
+        self.dest_path = dest_path
+        self.rel_path = rel_path
+        self.is_dir = is_dir
+        self.depth = depth
+
+    def __eq__(self, other):
+        return isinstance(other, TreeItem) and \
+            (self.src_path, self.dest_path, self.rel_path, self.is_dir, self.depth) == \
+            (other.src_path, other.dest_path, other.rel_path, other.is_dir, other.depth)
+
+    def __repr__(self):
+        return f"TreeItem({self.src_path!r}, {self.dest_path!r}, {self.rel_path!r}, {self.is_dir}, {self.depth})"
+
+def walk_tree(src_root, dest_root, rename=None, follow_symlinks=True, allow_empty=True):
+    """
+    walk_tree yields a TreeItem for each file and directory in the tree rooted at src_root, depth first and sorted by name, with each directory before its contents. The destination paths mirror the tree under dest_root, with each name passed through rename if it is given.
+
+    The tree is read with os.scandir, whose entries know their own type, so there is no stat call per file, and the walk uses an explicit stack instead of recursion.
+
+    - follow_symlinks: if False, symbolic links are skipped. Otherwise they are treated as the file or directory they point to. (Default: True)
+    - allow_empty: if False, an OSError is raised when src_root or one of its subdirectories is empty. (Default: True)
+
+    Entries that are neither files nor directories, such as sockets or broken links, are skipped.
+    """
+    stack = [iter(list_directory(src_root, dest_root, "", 0, rename, follow_symlinks, allow_empty))]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+            continue
+        yield item
+        if item.is_dir:
+            stack.append(iter(list_directory(item.src_path, item.dest_path, item.rel_path, item.depth + 1,
+                                             rename, follow_symlinks, allow_empty)))
+
+def list_directory(src_dirpath, dest_dirpath, rel_dirpath, depth, rename, follow_symlinks, allow_empty):
+    """list_directory returns the TreeItems for the files and directories directly in src_dirpath, sorted by name. See walk_tree for the arguments."""
+    with os.scandir(src_dirpath) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    if not entries and not allow_empty:
+        raise OSError(f"Source path must not be empty.")
+
+    items = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=follow_symlinks):
+            is_dir = True
+        elif entry.is_file(follow_symlinks=follow_symlinks):
+            is_dir = False
+        else:
+            continue
+        dest_name = rename(entry.name) if rename else entry.name
+        items.append(TreeItem(entry.path,
+                              os.path.join(dest_dirpath, dest_name),
+                              os.path.join(rel_dirpath, entry.name),
+                              is_dir,
+                              depth))
+    return items
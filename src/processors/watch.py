@@ -0,0 +1,195 @@
+import os, time
+from processors.copy_tree import copy_file
+from processors.generate_page import find_pages, map_page_tasks
+from processors.walk_tree import walk_tree
+
+def scan_files(paths):
+    """
+    scan_files returns a dict mapping each file in paths to its (mtime_ns, size). A path can be a file, or a directory whose whole tree is scanned. Paths that don't exist are skipped.
+
+    The scan runs on every poll, so unlike walk_tree it doesn't sort or build
+    TreeItems: it is one os.scandir per directory and one stat per file.
+    """
+    snapshot = {}
+    stack = []
+    for path in paths:
+        if os.path.isdir(path):
+            stack.append(path)
+        elif os.path.isfile(path):
+            stat = os.stat(path)
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except (FileNotFoundError, NotADirectoryError):
+            # The directory was removed, or replaced, since it was listed.
+            continue
+        with it:
+            for entry in it:
+                try:
+                    if entry.is_dir():
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                except FileNotFoundError:
+                    continue
+    return snapshot
+
+def changed_files(old_snapshot, new_snapshot):
+    """changed_files compares two snapshots from scan_files and returns the lists of changed, added and removed paths."""
+    changed = [path for path, stat in new_snapshot.items() if path in old_snapshot and old_snapshot[path] != stat]
+    added = [path for path in new_snapshot if path not in old_snapshot]
+    removed = [path for path in old_snapshot if path not in new_snapshot]
+    return changed, added, removed
+
+class DependencyGraph:
+    """
+    DependencyGraph maps each input file of a build to the outputs that depend on it. An output is a tuple saying how it is made:
+
+    - ("page", task): a page, where task is the tuple of arguments for write_page
+    - ("static", src_path, dest_path): a static file copied from src_path
+    """
+    __slots__ = ("dependents", "order")
+
+    def __init__(self):
+        self.dependents = {}
+        self.order = {}
+
+    def add(self, output, inputs):
+        """add records that output depends on each of the input paths."""
+        self.order.setdefault(output, len(self.order))
+        for path in inputs:
+            self.dependents.setdefault(path, []).append(output)
+
+    def outputs_for(self, paths):
+        """outputs_for returns the outputs that depend on any of the paths, each once, in the order they were added."""
+        outputs = {output for path in paths for output in self.dependents.get(path, [])}
+        return sorted(outputs, key=self.order.get)
+
+    def __contains__(self, output):
+        return output in self.order
+
+def site_graph(content_dirpath, static_dirpath, template_path, dest_dirpath, tag="div", base_path="/"):
+    """
+    site_graph returns the DependencyGraph of a site: each page depends on its markdown file and on the template, and each static file is copied from its source. The pages and files are found as they are by generate_pages_recursively and sync_tree.
+    """
+    graph = DependencyGraph()
+    for src_path, dest_path, page_tag in find_pages(content_dirpath, dest_dirpath, tag, allow_empty=True):
+        graph.add(("page", (src_path, template_path, dest_path, page_tag, base_path)), [src_path, template_path])
+    if os.path.isdir(static_dirpath):
+        for item in walk_tree(static_dirpath, dest_dirpath, follow_symlinks=False):
+            if not item.is_dir:
+                graph.add(("static", item.src_path, item.dest_path), [item.src_path])
+    return graph
+
+def output_dest_path(output):
+    """output_dest_path returns the path an output of a DependencyGraph is written to."""
+    return output[1][2] if output[0] == "page" else output[2]
+
+class SiteWatcher:
+    """
+    SiteWatcher keeps a site's output up to date with its sources. Each call to poll scans the content and static directories and the template, and rebuilds only what depends on the files that changed since the last poll:
+
+    - a changed template re-renders every page
+    - a changed or new markdown file renders its page
+    - a changed or new static file is copied with the given strategy (see copy_file)
+    - the output of a deleted markdown or static file is removed, unless another output has the same path, which is written again instead
+
+    As in a build, a page wins over a static file with the same path.
+
+    The scan only stats files, so no file watching library is needed. It assumes the site was built once already, for example by main.py before it starts watching.
+
+    If block_cache_size is more than 0, pages are parsed through a block cache of that many blocks, and if fragments is a FragmentCache, pages are rendered through it (see map_page_tasks).
+    """
+    def __init__(self, content_dirpath, static_dirpath, template_path, dest_dirpath,
+                 tag="div", base_path="/", jobs=None, strategy="copy", block_cache_size=0,
+                 fragments=None):
+        self.content_dirpath = content_dirpath
+        self.static_dirpath = static_dirpath
+        self.template_path = template_path
+        self.dest_dirpath = dest_dirpath
+        self.tag = tag
+        self.base_path = base_path
+        self.jobs = jobs
+        self.strategy = strategy
+        self.block_cache_size = block_cache_size
+        self.fragments = fragments
+        self.snapshot = self.scan()
+        self.graph = self.build_graph()
+
+    def scan(self):
+        return scan_files([self.content_dirpath, self.static_dirpath, self.template_path])
+
+    def build_graph(self):
+        return site_graph(self.content_dirpath, self.static_dirpath, self.template_path,
+                          self.dest_dirpath, self.tag, self.base_path)
+
+    def poll(self):
+        """
+        poll rebuilds the outputs that depend on files changed since the last poll and returns the sorted list of changed, added and removed paths. Errors are printed rather than raised, so that a page with a mistake in it doesn't stop the watcher.
+        """
+        snapshot = self.scan()
+        changed, added, removed = changed_files(self.snapshot, snapshot)
+        self.snapshot = snapshot
+        if not (changed or added or removed):
+            return []
+
+        # Files were added or removed, so the pages and static files are
+        # found again.
+        old_graph = self.graph
+        if added or removed:
+            self.graph = self.build_graph()
+        # A page and a static file can have the same path. As in a build, the
+        # page wins: the graph lists pages first, so the first output for each
+        # path is the one written there.
+        writers = {}
+        for output in self.graph.order:
+            writers.setdefault(output_dest_path(output), output)
+
+        # The output of a deleted source is only removed if nothing else
+        # writes to its path. Otherwise the output that does is written again.
+        rewritten = []
+        for output in old_graph.outputs_for(removed):
+            dest_path = output_dest_path(output)
+            if output in self.graph:
+                continue
+            if dest_path in writers:
+                rewritten.append(writers[dest_path])
+            elif os.path.isfile(dest_path):
+                print(f"Removing {dest_path}, its source was deleted.")
+                os.remove(dest_path)
+
+        outputs = [output for output in self.graph.outputs_for(changed + added) if writers[output_dest_path(output)] == output]
+        outputs += [output for output in dict.fromkeys(rewritten) if output not in outputs]
+        self.rebuild(outputs)
+        return sorted(changed + added + removed)
+
+    def rebuild(self, outputs):
+        """rebuild writes the given outputs of the dependency graph again, printing a message for each."""
+        tasks = [output[1] for output in outputs if output[0] == "page"]
+        results = map_page_tasks(tasks, self.jobs or os.cpu_count() or 1, self.block_cache_size, self.fragments)
+        # strict makes zip run map_page_tasks to its end, which flushes the
+        # fragment cache and stops the workers.
+        for (src_path, template_path, dest_path, _, _), (error, _, _) in zip(tasks, results, strict=True):
+            print(f"Generating page from {src_path} to {dest_path} using {template_path}.")
+            if error:
+                print(f"Failed to generate page from {src_path}: {error}")
+
+        for output in outputs:
+            if output[0] != "static":
+                continue
+            _, src_path, dest_path = output
+            print(f"Copying {src_path} to {dest_path}.")
+            try:
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_file(src_path, dest_path, preserve_mtime=True, strategy=self.strategy)
+            except OSError as e:
+                print(f"Failed to copy {src_path}: {e}")
+
+def watch(watcher, interval=0.05):
+    """watch calls watcher.poll every interval seconds until it is interrupted."""
+    while True:
+        start = time.perf_counter()
+        watcher.poll()
+        time.sleep(max(0, interval - (time.perf_counter() - start)))
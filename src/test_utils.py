@@ -1,4 +1,4 @@
-import unittest
+import time, unittest
 
 class TestRunner(unittest.TestCase):
     def assert_raises_exception(self, exception, expected, cb, *cb_args, **cb_kwargs):
@@ -9,4 +9,12 @@ class TestRunner(unittest.TestCase):
     def run_tests(self, cases, test_func):
         for case in cases:
             with self.subTest(case["name"]):
-                test_func(case)
\ No newline at end of file
+                test_func(case)
+
+    def assert_runs_within(self, seconds, cb, *cb_args, **cb_kwargs):
+        """Call cb, fail if it takes longer than the given number of seconds, and return its result."""
+        start = time.perf_counter()
+        result = cb(*cb_args, **cb_kwargs)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, seconds, f"took {elapsed:.2f}s, expected under {seconds}s")
+        return result
\ No newline at end of file